@@ -1,10 +1,17 @@
+import os
 from flask import Flask
 from .config import Config
-from .extensions import db
+from .extensions import db, migrate, pdf_renderer, pdf_cache, estatisticas_cache, usuarios_cache, tokens_cache, metricas
+from .utils.usuario_helpers import verificador_senhas
+from .utils.executor_helpers import registrar_tratadores
+from .utils import replica_helpers
 from flask_cors import CORS
 from flask.json.provider import DefaultJSONProvider
 from datetime import date, datetime
 
+# Origens do frontend autorizadas a fazer requisições com cookies
+ORIGENS_CORS = ["http://localhost:5173"]
+
 class CustomJSONProvider(DefaultJSONProvider):
     def default(self, o):
         if isinstance(o, (datetime, date)):
@@ -18,11 +25,37 @@ def create_app(config_class=Config):
     app.json_provider_class = CustomJSONProvider
     app.json = app.json_provider_class(app)
     
-    CORS(app, supports_credentials=True, origins=["http://localhost:5173"])
+    CORS(app, supports_credentials=True, origins=ORIGENS_CORS)
     app.config.from_object(config_class)
 
-    # Inicializa o banco de dados
+    # Inicializa o banco de dados e as migrações do esquema (pasta "migrations", ao lado da pasta "app")
     db.init_app(app)
+    migrate.init_app(app, db, directory=os.path.join(os.path.dirname(app.root_path), "migrations"))
+
+    # Envia as leituras das requisições GET às réplicas, se houver
+    replica_helpers.init_app(app)
+
+    # Registra o número de consultas SQL e o tempo no banco de cada requisição (Server-Timing e /metrics)
+    metricas.init_app(app)
+
+    # Inicializa o pool de renderização e o cache de PDFs
+    pdf_renderer.init_app(app)
+    pdf_cache.init_app(app)
+
+    # Inicializa o cache das estatísticas de notas
+    estatisticas_cache.configurar(capacidade=app.config["ESTATISTICAS_CACHE_MAX_ITENS"], ttl=app.config["ESTATISTICAS_CACHE_TTL"])
+
+    # Inicializa o cache dos usuários autenticados
+    usuarios_cache.configurar(capacidade=app.config["USUARIO_CACHE_MAX_ITENS"], ttl=app.config["USUARIO_CACHE_TTL"])
+
+    # Inicializa o cache dos tokens JWT já verificados (cada token expira junto com o "exp")
+    tokens_cache.configurar(capacidade=app.config["TOKEN_CACHE_MAX_ITENS"])
+
+    # Inicializa o Bcrypt e o pool de threads das verificações de senha
+    verificador_senhas.init_app(app)
+
+    # Responde com 503 e 504 quando os pools de senhas ou de PDFs estão ocupados ou demoram demais, em qualquer rota
+    registrar_tratadores(app)
 
     # Importar modelos
     from .models import Usuario, Turma, Sala, professor_disciplina, Disciplina, Cargo, Calendario, Boletim, Aula, Aluno, aluno_turma
@@ -39,6 +72,8 @@ def create_app(config_class=Config):
     from .routes.notas_routes import notas_bp
     from .routes.ausencias_routes import ausencias_bp
     from .routes.boletim_routes import boletim_bp
+    from .routes.saude_routes import saude_bp
+    from .routes.metricas_routes import metricas_bp
     app.register_blueprint(sala_bp, url_prefix="/sala")
     app.register_blueprint(calendario_bp, url_prefix="/calendario")
     app.register_blueprint(usuario_bp, url_prefix="/usuario")
@@ -50,5 +85,11 @@ def create_app(config_class=Config):
     app.register_blueprint(notas_bp, url_prefix="/notas")
     app.register_blueprint(ausencias_bp, url_prefix="/ausencias")
     app.register_blueprint(boletim_bp, url_prefix="/boletim")
+    app.register_blueprint(saude_bp, url_prefix="/saude")
+    app.register_blueprint(metricas_bp, url_prefix="/metrics")
+
+    # Registra os comandos de linha de comando
+    from .commands import registrar_comandos
+    registrar_comandos(app)
     
     return app
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""
+Módulo do modo ASGI da aplicação.
+
+No modo ASGI (`uvicorn asgi:app`), as leituras mais frequentes de boletins, notas e ausências (`routes/async_routes.py`)
+são atendidas de forma assíncrona, com sessões assíncronas do SQLAlchemy: enquanto uma consulta aguarda o banco, o
+mesmo processo atende outras requisições, e o número de consultas simultâneas é limitado pelo pool de conexões. As
+demais rotas continuam sendo atendidas pela aplicação Flask, em um pool de threads com uma thread por conexão do pool
+síncrono.
+"""
+
+from contextlib import asynccontextmanager
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.routing import Mount
+from . import create_app, ORIGENS_CORS
+from .config import Config
+from .extensions import banco_assincrono
+from .routes.async_routes import rotas_assincronas
+
+
+def create_asgi_app(config_class=Config) -> Starlette:
+    """Cria a aplicação ASGI, com as rotas assíncronas e a aplicação Flask para as demais rotas.
+
+    Args:
+        config_class (Config): A classe de configuração da aplicação.
+
+    Returns:
+        Starlette: A aplicação ASGI.
+    """
+    flask_app = create_app(config_class)
+    banco_assincrono.init_app(flask_app)
+
+    opcoes_pool = flask_app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+    threads = flask_app.config["ASGI_THREADS_WSGI"] or opcoes_pool.get("pool_size", 5) + opcoes_pool.get("max_overflow", 10)
+
+    @asynccontextmanager
+    async def ciclo_de_vida(app):
+        yield
+        await banco_assincrono.fechar()
+
+    app = Starlette(
+        routes=[*rotas_assincronas, Mount("/", app=WSGIMiddleware(flask_app, workers=threads))],
+        middleware=[Middleware(CORSMiddleware, allow_origins=ORIGENS_CORS, allow_credentials=True, allow_methods=["*"], allow_headers=["*"])],
+        lifespan=ciclo_de_vida
+    )
+    app.state.flask_app = flask_app
+
+    return app
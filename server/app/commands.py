@@ -0,0 +1,81 @@
+"""
+Módulo de comandos de linha de comando da aplicação.
+
+Este módulo registra comandos do `flask` usados na manutenção do banco de dados, executados com `flask --app run <comando>`.
+"""
+
+import click
+from flask import current_app
+from sqlalchemy import text
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from app.extensions import db
+from app.utils.pool_helpers import PREFIXO_APLICACAO
+
+
+@click.command("migracoes-pendentes")
+def migracoes_pendentes():
+    """Lista as migrações do esquema que ainda não foram aplicadas ao banco, na ordem em que serão aplicadas.
+
+    Termina com o código de saída 1 quando há migrações pendentes, para que possa ser usado em scripts de implantação.
+    Para aplicá-las, execute `flask --app run db upgrade`.
+    """
+    configuracao = current_app.extensions["migrate"].migrate.get_config()
+    scripts = ScriptDirectory.from_config(configuracao)
+
+    with db.engine.connect() as conexao:
+        aplicadas = MigrationContext.configure(conexao).get_current_heads()
+
+    pendentes = list(reversed(list(scripts.iterate_revisions("heads", aplicadas or "base"))))
+    if not pendentes:
+        click.echo("Nenhuma migração pendente.")
+        return
+
+    for revisao in pendentes:
+        click.echo(f"{revisao.revision}  {revisao.doc}")
+    raise SystemExit(1)
+
+
+@click.command("estado-pool")
+def estado_pool():
+    """Mostra a configuração do pool de conexões e as conexões abertas por cada worker do servidor.
+
+    Cada processo tem o seu próprio pool, então as conexões de todos os workers são lidas do `pg_stat_activity`, onde
+    cada uma é identificada pelo PID do worker que a abriu. Para os tempos de espera de um worker, use a rota `/saude/pool`.
+    """
+    opcoes = current_app.config["SQLALCHEMY_ENGINE_OPTIONS"]
+    click.echo(
+        f"Pool por worker: tamanho {opcoes['pool_size']}, overflow {opcoes['max_overflow']}, "
+        f"timeout {opcoes['pool_timeout']}s, reciclagem {opcoes['pool_recycle']}s, pre-ping {'sim' if opcoes['pool_pre_ping'] else 'não'}"
+    )
+
+    workers = db.session.execute(text(
+        """SELECT split_part(application_name, ':', 2) AS pid,
+                  count(*) AS total,
+                  count(*) FILTER (WHERE state = 'active') AS ativas,
+                  count(*) FILTER (WHERE state = 'idle') AS ociosas,
+                  count(*) FILTER (WHERE state LIKE 'idle in transaction%') AS em_transacao,
+                  coalesce(round(max(extract(epoch FROM now() - state_change)) FILTER (WHERE state = 'idle in transaction')), 0) AS maior_transacao_ociosa
+           FROM pg_stat_activity
+           WHERE application_name LIKE :prefixo AND pid <> pg_backend_pid()
+           GROUP BY 1
+           ORDER BY 1"""
+    ), {"prefixo": f"{PREFIXO_APLICACAO}:%"}).all()
+
+    if not workers:
+        click.echo("Nenhuma conexão aberta por workers do servidor.")
+        return
+
+    click.echo(f"{'worker':>8} {'total':>6} {'ativas':>7} {'ociosas':>8} {'em transação':>13} {'maior transação ociosa (s)':>27}")
+    for worker in workers:
+        click.echo(f"{worker.pid:>8} {worker.total:>6} {worker.ativas:>7} {worker.ociosas:>8} {worker.em_transacao:>13} {worker.maior_transacao_ociosa:>27}")
+
+
+def registrar_comandos(app):
+    """Registra os comandos de linha de comando na aplicação.
+
+    Args:
+        app (Flask): A aplicação Flask.
+    """
+    app.cli.add_command(migracoes_pendentes)
+    app.cli.add_command(estado_pool)
@@ -1,5 +1,6 @@
 import os
 from dotenv import load_dotenv
+from app.utils.pool_helpers import montar_opcoes_engine, ler_booleano
 
 load_dotenv()
 
@@ -12,6 +13,66 @@ class Config:
     )
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Tempo limite dos comandos SQL, usado pelo engine síncrono e pelo pool do asyncpg do modo ASGI (0 desativa)
+    DB_STATEMENT_TIMEOUT_MS = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', 0))
+
+    # Configuração do pool de conexões (por worker do servidor). Com o PgBouncer, o pre-ping descarta as conexões
+    # derrubadas por um reinício, e a reciclagem evita conexões mais antigas que o tempo limite do lado do servidor.
+    SQLALCHEMY_ENGINE_OPTIONS = montar_opcoes_engine(
+        tamanho=int(os.getenv('DB_POOL_TAMANHO', 5)),
+        overflow=int(os.getenv('DB_POOL_OVERFLOW', 10)),
+        timeout=float(os.getenv('DB_POOL_TIMEOUT', 30)),
+        reciclagem=int(os.getenv('DB_POOL_RECICLAGEM', 1800)),
+        pre_ping=ler_booleano(os.getenv('DB_POOL_PRE_PING'), True),
+        statement_timeout=DB_STATEMENT_TIMEOUT_MS
+    )
+
+    # Réplicas de leitura (URIs separadas por vírgula em DB_REPLICAS). As requisições GET leem de uma delas, exceto
+    # nos REPLICA_JANELA_CONSISTENCIA segundos seguintes a uma escrita do mesmo cliente, que leem do primário.
+    SQLALCHEMY_BINDS = {
+        f"replica_{indice}": uri.strip()
+        for indice, uri in enumerate(os.getenv('DB_REPLICAS', '').split(','))
+        if uri.strip()
+    }
+    REPLICA_JANELA_CONSISTENCIA = float(os.getenv('REPLICA_JANELA_CONSISTENCIA', 5))
+
+    # Requisições mais lentas que LOG_REQUISICOES_LENTAS_MS são registradas no log com os comandos SQL e os seus
+    # parâmetros (0 desativa; os parâmetros podem conter dados pessoais)
+    LOG_REQUISICOES_LENTAS_MS = float(os.getenv('LOG_REQUISICOES_LENTAS_MS', 0))
+
+    # Configuração do modo ASGI (asgi.py): as leituras assíncronas usam um pool do asyncpg com o mesmo tamanho do pool
+    # acima, e as demais rotas rodam em um pool de threads (por padrão, uma thread por conexão do pool síncrono)
+    ASGI_THREADS_WSGI = int(os.getenv('ASGI_THREADS_WSGI', 0)) or None
+
+    # Configuração do pool de renderização de PDFs (boletins e históricos)
+    PDF_RENDER_TRABALHADORES = int(os.getenv('PDF_RENDER_TRABALHADORES', os.cpu_count() or 1))
+    PDF_RENDER_FILA_MAXIMA = int(os.getenv('PDF_RENDER_FILA_MAXIMA', 32))
+    PDF_RENDER_TIMEOUT = float(os.getenv('PDF_RENDER_TIMEOUT', 30))
+
+    # Configuração do cache de PDFs gerados (PDF_CACHE_DIR vazio desativa o cache em disco)
+    PDF_CACHE_MAX_ITENS = int(os.getenv('PDF_CACHE_MAX_ITENS', 256))
+    PDF_CACHE_DIR = os.getenv('PDF_CACHE_DIR') or None
+    PDF_CACHE_DISCO_MAX_ITENS = int(os.getenv('PDF_CACHE_DISCO_MAX_ITENS', 5000))
+
+    # Configuração das estatísticas de notas (o cache de cada worker é refeito depois de um cadastro ou alteração de notas
+    # em qualquer worker, pela versão das notas das aulas)
+    NOTA_MINIMA_APROVACAO = float(os.getenv('NOTA_MINIMA_APROVACAO', 6.0))
+    ESTATISTICAS_CACHE_MAX_ITENS = int(os.getenv('ESTATISTICAS_CACHE_MAX_ITENS', 512))
+    ESTATISTICAS_CACHE_TTL = float(os.getenv('ESTATISTICAS_CACHE_TTL', 600))
+
+    # Configuração do cache dos usuários autenticados (por processo, descartado ao alterar ou remover o usuário)
+    USUARIO_CACHE_MAX_ITENS = int(os.getenv('USUARIO_CACHE_MAX_ITENS', 1024))
+    USUARIO_CACHE_TTL = float(os.getenv('USUARIO_CACHE_TTL', 30))
+
+    # Configuração do cache dos tokens JWT já verificados
+    TOKEN_CACHE_MAX_ITENS = int(os.getenv('TOKEN_CACHE_MAX_ITENS', 4096))
+
+    # Configuração do Bcrypt: custo dos hashes (as senhas são refeitas no login quando o custo muda) e pool de threads
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    SENHA_HASH_TRABALHADORES = int(os.getenv('SENHA_HASH_TRABALHADORES', os.cpu_count() or 1))
+    SENHA_HASH_FILA_MAXIMA = int(os.getenv('SENHA_HASH_FILA_MAXIMA', 64))
+    SENHA_HASH_TIMEOUT = float(os.getenv('SENHA_HASH_TIMEOUT', 10))
+
 
 
 class TestConfig(Config):
@@ -19,4 +80,10 @@ class TestConfig(Config):
         f"postgresql://{os.getenv('TEST_DB_USER')}:{os.getenv('TEST_DB_PASSWORD')}@"
         f"{os.getenv('TEST_DB_HOST')}:{os.getenv('TEST_DB_PORT')}/{os.getenv('TEST_DB_NAME')}"
     )
-    TESTING = True
\ No newline at end of file
+    TESTING = True
+
+    # Nos testes, os PDFs são renderizados na própria thread da requisição
+    PDF_RENDER_TRABALHADORES = 0
+
+    # Nos testes, os hashes de senha usam o custo mínimo do Bcrypt
+    BCRYPT_LOG_ROUNDS = 4
@@ -6,10 +6,75 @@ Ele interage com o modelo `Aluno` para realizar operações CRUD e valida os dad
 """
 
 from flask import request, jsonify
+from sqlalchemy import select, func
+from sqlalchemy.exc import IntegrityError, DataError
 from app.extensions import db
-from ..models import Aluno, Turma, Boletim
+from ..models import Aluno, Turma, Boletim, aluno_turma, matricula_seq
 from app.utils.validators import validar_aluno
 from app.utils.date_helpers import string_para_data
+from app.utils.boletim_helpers import criar_boletins
+from app.utils.importacao_helpers import ler_linhas_importacao, ler_inteiro_csv, erro_na_linha, ordenar_erros_por_linha, copiar_linhas
+from app.utils.paginacao_helpers import ler_paginacao, ler_campos, definir_cursor
+from app.utils.stream_helpers import pediu_ndjson, consultar_em_lotes, transmitir_ndjson
+
+
+CAMPOS_LISTAGEM = ["matricula", "nome", "email", "telefone", "endereco", "data_de_nascimento", "turma_id"]
+CAMPOS_IMPORTACAO = ["nome", "email", "telefone", "endereco", "data_de_nascimento", "turma_id"]
+VIOLACAO_DE_UNICIDADE = "23505"
+SEQUENCIA_ESGOTADA = "2200H"
+# nomes que o PostgreSQL dá às restrições de unicidade da tabela `aluno`
+RESTRICAO_EMAIL = "aluno_email_key"
+RESTRICAO_MATRICULA = "aluno_pkey"
+
+
+def reservar_matriculas(anos_letivos: list) -> list | None:
+    """Reserva, em uma única consulta à sequência `aluno_matricula_seq`, uma matrícula para cada aluno.
+
+    A matrícula tem o formato `<ano letivo>000<número com 5 dígitos>`. A sequência é a mesma para todos os anos
+    letivos e vai até 99999, o maior número com 5 dígitos: esse é o limite de alunos cadastrados no sistema, e não por
+    ano. Ao alcançá-lo, a transação é desfeita e nenhuma matrícula é reservada, em vez de gerar uma matrícula maior, que
+    seria recusada pela validação. Como a sequência não participa da transação, os números reservados por um cadastro
+    desfeito não são reaproveitados.
+
+    Args:
+        anos_letivos (list): O ano letivo da turma de cada aluno.
+
+    Returns:
+        list | None: As matrículas, na ordem dos anos letivos informados, ou None se a sequência se esgotou.
+    """
+    try:
+        numeros = db.session.scalars(select(matricula_seq.next_value()).select_from(func.generate_series(1, len(anos_letivos)))).all()
+    except DataError as erro:
+        if getattr(erro.orig, "pgcode", None) != SEQUENCIA_ESGOTADA:
+            raise
+        db.session.rollback()
+        return None
+
+    return [f"{ano_letivo}000{numero:05d}" for ano_letivo, numero in zip(anos_letivos, numeros)]
+
+
+def responder_violacao_de_unicidade(erro: IntegrityError):
+    """Desfaz a transação e responde à violação de uma restrição de unicidade da tabela `aluno` detectada pelo banco.
+
+    Args:
+        erro (IntegrityError): O erro do banco de dados.
+
+    Returns:
+        jsonify: Resposta JSON com a mensagem de erro da restrição violada.
+
+    Raises:
+        IntegrityError: Se o erro não for a violação do e-mail ou da matrícula de um aluno.
+    """
+    db.session.rollback()
+    restricao = getattr(getattr(erro.orig, "diag", None), "constraint_name", None)
+    if getattr(erro.orig, "pgcode", None) != VIOLACAO_DE_UNICIDADE or restricao not in (RESTRICAO_EMAIL, RESTRICAO_MATRICULA):
+        raise erro
+
+    if restricao == RESTRICAO_EMAIL:
+        # outro aluno com o mesmo e-mail foi cadastrado ao mesmo tempo, depois da verificação
+        return jsonify({"erro": ["E-mail já existe"]}), 400
+    # a matrícula reservada já pertence a um aluno cadastrado fora da sequência
+    return jsonify({"erro": ["A matrícula reservada já pertence a outro aluno, tente novamente"]}), 400
 
 
 def cadastrar_aluno(current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -36,10 +101,6 @@ def cadastrar_aluno(current_user_cpf: str, current_user_role: str) -> jsonify:
     if turma_existente is None:
         return jsonify({"erro": ["Turma não existe"]}), 400
     
-    # criar lógica para matrícula
-    id = db.session.query(Aluno).count() + 1
-    matricula = f"{turma_existente.calendario_ano_letivo}000{id:05d}"
-
     # verificando se e-mail é único
     email_existente = db.session.query(Aluno).filter_by(email= data['email']).first()
     if email_existente:
@@ -48,21 +109,112 @@ def cadastrar_aluno(current_user_cpf: str, current_user_role: str) -> jsonify:
     # Verifica se a turma está aberta
     if turma_existente.status != "A":
         return jsonify({"erro": ["A turma está fechada, portanto, não é possível cadastrar mais alunos"]}), 400
-    
+
+    matriculas = reservar_matriculas([turma_existente.calendario_ano_letivo])
+    if matriculas is None:
+        return jsonify({"erro": ["Não há mais números de matrícula disponíveis"]}), 400
+    [matricula] = matriculas
+
     # criando aluno
     novo_aluno = Aluno(matricula=matricula, nome=data['nome'], email=data['email'], telefone=data['telefone'], endereco=data['endereco'], data_de_nascimento=data['data_de_nascimento'], turmas=[turma_existente])
     db.session.add(novo_aluno)
 
-    # criando boletim para todas as aulas da turma que o aluno foi cadastrado
-    for aula in turma_existente.aulas:
-        boletim = Boletim(aluno_matricula=matricula, aula_id=aula.id, notas=[], ausencias=0)
-        db.session.add(boletim)
-    
-    db.session.commit()
+    try:
+        db.session.flush()
+        # criando boletim para todas as aulas da turma que o aluno foi cadastrado
+        criar_boletins(aluno_turma.c.aluno_matricula == matricula)
+        db.session.commit()
+    except IntegrityError as erro:
+        return responder_violacao_de_unicidade(erro)
 
     return jsonify({"mensagem": "Aluno criado com sucesso!", "data": {"matricula": novo_aluno.matricula, "nome": novo_aluno.nome, "email": novo_aluno.email, "telefone": novo_aluno.telefone, "endereco": novo_aluno.endereco, "data_de_nascimento": novo_aluno.data_de_nascimento, "turma_id": turma_existente.id}}), 201
 
 
+def importar_alunos(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Cadastra e matricula os alunos de uma lista de uma só vez (ex: as matrículas do início do ano letivo).
+
+    Os alunos são recebidos como uma lista JSON ou como CSV (com as colunas `nome`, `email`, `telefone`, `endereco`,
+    `data_de_nascimento` e `turma_id`). Todas as linhas são validadas antes de qualquer cadastro, com os e-mails já
+    cadastrados e as turmas buscados em uma consulta cada. Se alguma linha for recusada, nenhum aluno é cadastrado e
+    os erros de todas as linhas são retornados.
+
+    As matrículas são reservadas na sequência `aluno_matricula_seq`, os alunos e as suas turmas são gravados com `COPY`
+    e os boletins das aulas das turmas são criados com um único `INSERT ... SELECT`.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo uma mensagem de sucesso, as matrículas dos alunos cadastrados e o número de boletins criados, ou os erros de cada linha.
+    """
+    linhas, erros = ler_linhas_importacao(CAMPOS_IMPORTACAO)
+    if not linhas:
+        return jsonify({"erro": erros}), 400
+
+    validas = []
+    emails_da_importacao = {}
+    for numero, linha in enumerate(linhas, start=1):
+        if any(campo not in linha for campo in CAMPOS_IMPORTACAO):
+            # os campos ausentes já estão nos erros
+            continue
+
+        aluno = {campo: linha[campo] for campo in CAMPOS_IMPORTACAO}
+        aluno["turma_id"] = ler_inteiro_csv(aluno["turma_id"])
+
+        erros_da_linha = validar_aluno(nome=aluno["nome"], email=aluno["email"], telefone=aluno["telefone"], endereco=aluno["endereco"], data_de_nascimento=aluno["data_de_nascimento"])
+        if not isinstance(aluno["turma_id"], int) or aluno["turma_id"] <= 0:
+            erros_da_linha.append("O campo 'turma_id' é obrigatório e deve ser um número inteiro positivo")
+        if isinstance(aluno["email"], str) and emails_da_importacao.setdefault(aluno["email"], numero) != numero:
+            erros_da_linha.append(f"E-mail repetido na linha {emails_da_importacao[aluno['email']]}")
+
+        if erros_da_linha:
+            erros.extend(erro_na_linha(numero, erro) for erro in erros_da_linha)
+        else:
+            validas.append((numero, aluno))
+
+    # uma consulta para os e-mails e outra para as turmas de todas as linhas
+    emails_existentes = set(db.session.scalars(select(Aluno.email).where(Aluno.email.in_({aluno["email"] for _, aluno in validas}))))
+    turmas = {
+        turma.id: turma
+        for turma in db.session.execute(select(Turma.id, Turma.status, Turma.calendario_ano_letivo).where(Turma.id.in_({aluno["turma_id"] for _, aluno in validas})))
+    }
+
+    novos_alunos = []
+    for numero, aluno in validas:
+        turma = turmas.get(aluno["turma_id"])
+        if aluno["email"] in emails_existentes:
+            erros.append(erro_na_linha(numero, "E-mail já existe"))
+        if turma is None:
+            erros.append(erro_na_linha(numero, "Turma não existe"))
+        elif turma.status != "A":
+            erros.append(erro_na_linha(numero, "A turma está fechada, portanto, não é possível cadastrar mais alunos"))
+        else:
+            novos_alunos.append((aluno, turma))
+
+    if erros:
+        return jsonify({"erro": ordenar_erros_por_linha(erros)}), 400
+
+    matriculas = reservar_matriculas([turma.calendario_ano_letivo for _, turma in novos_alunos])
+    if matriculas is None:
+        return jsonify({"erro": ["Não há mais números de matrícula disponíveis"]}), 400
+
+    try:
+        copiar_linhas(Aluno.__table__, ["matricula", "nome", "email", "telefone", "endereco", "data_de_nascimento"], [
+            (matricula, aluno["nome"], aluno["email"], aluno["telefone"], aluno["endereco"], aluno["data_de_nascimento"])
+            for matricula, (aluno, _) in zip(matriculas, novos_alunos)
+        ])
+        copiar_linhas(aluno_turma, ["aluno_matricula", "turma_id"], [(matricula, turma.id) for matricula, (_, turma) in zip(matriculas, novos_alunos)])
+
+        # os alunos novos só estão nas turmas da importação
+        boletins = criar_boletins(aluno_turma.c.aluno_matricula.in_(matriculas))
+        db.session.commit()
+    except IntegrityError as erro:
+        return responder_violacao_de_unicidade(erro)
+
+    return jsonify({"mensagem": "Alunos importados com sucesso!", "data": {"alunos": [{"matricula": matricula, "email": aluno["email"]} for matricula, (aluno, _) in zip(matriculas, novos_alunos)], "boletins": boletins}}), 201
+
+
 def matricular_aluno(current_user_cpf: str, current_user_role: str) -> jsonify:
     """Realiza a matrícula de um novo aluno no banco de dados.
 
@@ -119,7 +271,15 @@ def matricular_aluno(current_user_cpf: str, current_user_role: str) -> jsonify:
 
 
 def listar_alunos(current_user_cpf: str, current_user_role: str) -> jsonify:
-    """Lista todas os alunos cadastrados no banco de dados.
+    """Lista os alunos cadastrados no banco de dados, ordenados pela matrícula.
+
+    Parâmetros opcionais da requisição:
+        limite (int): Número máximo de alunos retornados. Quando informado, o cabeçalho `X-Proximo-Cursor` traz a
+            matrícula a ser usada em `apos` para buscar a próxima página.
+        apos (str): Lista apenas os alunos com matrícula posterior a esta.
+        fields (str): Campos retornados, separados por vírgula (ex: "matricula,nome,turma_id").
+        stream (str): Com `stream=1` (ou `Accept: application/x-ndjson`), a listagem é transmitida em NDJSON
+            (um objeto por linha), lendo o banco em lotes.
 
     Args:
         current_user_cpf (str): O cpf do usuário autenticado.
@@ -128,9 +288,43 @@ def listar_alunos(current_user_cpf: str, current_user_role: str) -> jsonify:
     Returns:
         jsonify: Resposta JSON contendo uma lista de alunos com seus respectivos dados.
     """
-    alunos = Aluno.query.all()
+    limite, apos, erros = ler_paginacao(request.args)
+    campos, erros_campos = ler_campos(request.args, CAMPOS_LISTAGEM)
+    erros += erros_campos
+    if erros:
+        return jsonify({"erro": erros}), 400
 
-    return jsonify([{"matricula": aluno.matricula, "nome": aluno.nome, "email": aluno.email, "telefone": aluno.telefone, "endereco": aluno.endereco, "data_de_nascimento": aluno.data_de_nascimento, "turma_id": max(aluno.turmas, key=lambda turma: turma.calendario_ano_letivo).id if aluno.turmas else None} for aluno in alunos]), 200
+    # página de alunos, sempre com a matrícula, que é o cursor
+    colunas = [getattr(Aluno, campo) for campo in campos if campo not in ("matricula", "turma_id")]
+    pagina = select(Aluno.matricula, *colunas).order_by(Aluno.matricula)
+    if apos:
+        pagina = pagina.where(Aluno.matricula > apos)
+    if limite:
+        pagina = pagina.limit(limite)
+    pagina = pagina.cte("pagina")
+
+    consulta = select(pagina)
+    if "turma_id" in campos:
+        # turma atual (a do ano letivo mais recente) de cada aluno da página, na mesma consulta
+        turma_atual = (
+            select(aluno_turma.c.aluno_matricula, aluno_turma.c.turma_id)
+            .join(Turma, Turma.id == aluno_turma.c.turma_id)
+            .where(aluno_turma.c.aluno_matricula.in_(select(pagina.c.matricula)))
+            .distinct(aluno_turma.c.aluno_matricula)
+            .order_by(aluno_turma.c.aluno_matricula, Turma.calendario_ano_letivo.desc(), Turma.id.desc())
+            .subquery("turma_atual")
+        )
+        consulta = select(pagina, turma_atual.c.turma_id).outerjoin(turma_atual, turma_atual.c.aluno_matricula == pagina.c.matricula)
+
+    consulta = consulta.order_by(pagina.c.matricula)
+
+    if pediu_ndjson():
+        return transmitir_ndjson(consultar_em_lotes(consulta).mappings(), lambda aluno: {campo: aluno[campo] for campo in campos})
+
+    alunos = db.session.execute(consulta).mappings().all()
+
+    response = jsonify([{campo: aluno[campo] for campo in campos} for aluno in alunos])
+    return definir_cursor(response, len(alunos), limite, alunos[-1]["matricula"] if alunos else None), 200
 
 
 def buscar_aluno(matricula: str, current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -6,10 +6,17 @@ Ele interage com o modelo `Aula` para realizar operações CRUD e valida os dado
 """
 
 from flask import request, jsonify
+from sqlalchemy import select, insert, func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import joinedload
 from app.extensions import db
-from ..models import Aula, Usuario, Disciplina, Turma, Boletim
+from ..models import Aula, Usuario, Disciplina, Turma, HorarioAula, professor_disciplina
 from app.utils.validators import validar_aula
 from app.utils.hour_helpers import hora_para_string
+from app.utils.agenda_helpers import AgendaDeAulas, montar_horarios, montar_periodos, eh_conflito_de_horario
+from app.utils.importacao_helpers import ler_linhas_importacao, ler_lista_csv, ler_inteiro_csv, erro_na_linha
+from app.utils.boletim_helpers import criar_boletins
+from app.utils.stream_helpers import pediu_ndjson, consultar_em_lotes, transmitir_ndjson
 
 
 def cadastrar_aula(current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -48,28 +55,31 @@ def cadastrar_aula(current_user_cpf: str, current_user_role: str) -> jsonify:
     elif usuario_existente.tipo != "p":
         return jsonify({"erro": ["O usuário não é do tipo 'professor'"]}), 400
     
-    aula_no_mesmo_horario = db.session.query(Aula).filter_by(
-        hora_inicio=data['hora_inicio'], 
-        hora_fim=data['hora_fim'], 
-        dias_da_semana=data['dias_da_semana'], 
-        turma_id=data['turma_id']
-    ).first()
+    # sobreposição com as outras aulas da turma, do professor e da sala no mesmo ano letivo
+    agenda = AgendaDeAulas.carregar(turma_existente.calendario_ano_letivo, turma_id=turma_existente.id, usuario_id=usuario_existente.id, sala_numero=turma_existente.sala_numero)
+    conflitos = agenda.conflitos(data['dias_da_semana'], data['hora_inicio'], data['hora_fim'], turma_existente.id, usuario_existente.id, turma_existente.sala_numero)
 
-    if aula_no_mesmo_horario is not None:
-        return jsonify({"erro": ["Já existe uma aula no mesmo horário, com o mesmo professor"]}), 400
+    if conflitos:
+        return jsonify({"erro": conflitos}), 400
 
     elif data['disciplina_codigo'] not in [disciplina.codigo for disciplina in usuario_existente.disciplinas]:
         return jsonify({"erro": ["O 'professor' não pode ensinar essa 'disciplina'"]}), 400
 
     nova_aula = Aula(hora_inicio=data['hora_inicio'], hora_fim=data['hora_fim'], dias_da_semana=data['dias_da_semana'], usuario_id=usuario_existente.id, disciplina_codigo=data['disciplina_codigo'], turma_id=data['turma_id'])
+    nova_aula.horarios = montar_horarios(data['dias_da_semana'], data['hora_inicio'], data['hora_fim'], turma_existente.calendario_ano_letivo, turma_existente.id, usuario_existente.id)
     db.session.add(nova_aula)
 
-    # Criar um boletim para cada aluno da turma
-    for aluno in turma_existente.alunos:
-        novo_boletim = Boletim(aluno_matricula=aluno.matricula, aula_id=nova_aula.id, notas=[], ausencias=0)
-        db.session.add(novo_boletim)
-
-    db.session.commit()
+    try:
+        db.session.flush()
+        # Criar um boletim para cada aluno da turma
+        criar_boletins(Aula.id == nova_aula.id)
+        db.session.commit()
+    except IntegrityError as erro:
+        # outra aula conflitante foi cadastrada ao mesmo tempo, depois da verificação da agenda
+        db.session.rollback()
+        if not eh_conflito_de_horario(erro):
+            raise
+        return jsonify({"erro": ["Já existe uma aula no mesmo horário"]}), 400
 
     # Usando a função hora_para_string para converter os objetos time para string
     hora_inicio_str = hora_para_string(nova_aula.hora_inicio)
@@ -78,9 +88,144 @@ def cadastrar_aula(current_user_cpf: str, current_user_role: str) -> jsonify:
     return jsonify({"mensagem": "Aula criada com sucesso!", "data": {"id": nova_aula.id, "hora_inicio": hora_inicio_str, "hora_fim": hora_fim_str, "dias_da_semana": nova_aula.dias_da_semana, "usuario_id": nova_aula.usuario_id, "disciplina_codigo": nova_aula.disciplina_codigo, "turma_id": nova_aula.turma_id}}), 201
 
 
+def importar_aulas(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Cadastra as aulas de uma grade horária inteira de uma só vez.
+
+    As aulas são recebidas como uma lista JSON ou como CSV (com as colunas `hora_inicio`, `hora_fim`, `dias_da_semana`,
+    `usuario_cpf`, `disciplina_codigo` e `turma_id`, e os dias da semana separados por `|`). Todas as linhas são
+    validadas antes de qualquer cadastro, com as disciplinas, os professores, as turmas e as aulas dos anos letivos
+    envolvidos carregados em poucas consultas, e os horários são verificados também contra as outras linhas da
+    importação. Se alguma linha for inválida, nenhuma aula é cadastrada e os erros de todas as linhas são retornados.
+
+    As aulas e os seus horários são inseridos em lote, e os boletins dos alunos das turmas são criados com um único
+    `INSERT ... SELECT` a partir de `aluno_turma`.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo uma mensagem de sucesso, os ids das aulas cadastradas e o número de boletins criados, ou os erros de cada linha.
+    """
+    campos = ["hora_inicio", "hora_fim", "dias_da_semana", "usuario_cpf", "disciplina_codigo", "turma_id"]
+    linhas, erros = ler_linhas_importacao(campos)
+    if not linhas:
+        return jsonify({"erro": erros}), 400
+
+    validas = []
+    for numero, linha in enumerate(linhas, start=1):
+        if any(campo not in linha for campo in campos):
+            # os campos ausentes já estão nos erros
+            continue
+
+        aula = {
+            "hora_inicio": linha["hora_inicio"],
+            "hora_fim": linha["hora_fim"],
+            "dias_da_semana": ler_lista_csv(linha["dias_da_semana"]),
+            "usuario_cpf": linha["usuario_cpf"],
+            "disciplina_codigo": linha["disciplina_codigo"],
+            "turma_id": ler_inteiro_csv(linha["turma_id"]),
+        }
+        erros_da_linha = validar_aula(**aula)
+        if erros_da_linha:
+            erros.extend(erro_na_linha(numero, erro) for erro in erros_da_linha)
+        else:
+            validas.append((numero, aula))
+
+    # uma consulta por entidade para todas as linhas, em vez de uma por linha
+    codigos = {aula["disciplina_codigo"] for _, aula in validas}
+    cpfs = {aula["usuario_cpf"] for _, aula in validas}
+    turma_ids = {aula["turma_id"] for _, aula in validas}
+
+    disciplinas = set(db.session.scalars(select(Disciplina.codigo).where(Disciplina.codigo.in_(codigos))))
+    professores = {
+        professor.cpf: professor
+        for professor in db.session.execute(
+            select(Usuario.id, Usuario.cpf, Usuario.tipo, func.array_remove(func.array_agg(professor_disciplina.c.disciplina_codigo), None).label("disciplinas"))
+            .outerjoin(professor_disciplina, professor_disciplina.c.usuario_id == Usuario.id)
+            .where(Usuario.cpf.in_(cpfs))
+            .group_by(Usuario.id)
+        )
+    }
+    turmas = {
+        turma.id: turma
+        for turma in db.session.execute(select(Turma.id, Turma.calendario_ano_letivo, Turma.sala_numero).where(Turma.id.in_(turma_ids)))
+    }
+    aulas_existentes = set(db.session.execute(
+        select(Aula.disciplina_codigo, Aula.turma_id).where(tuple_(Aula.disciplina_codigo, Aula.turma_id).in_({(aula["disciplina_codigo"], aula["turma_id"]) for _, aula in validas}))
+    ).tuples()) if validas else set()
+
+    agendas = {}
+    novas_aulas = []
+    for numero, aula in validas:
+        professor = professores.get(aula["usuario_cpf"])
+        turma = turmas.get(aula["turma_id"])
+        chave = (aula["disciplina_codigo"], aula["turma_id"])
+
+        erros_da_linha = []
+        if aula["disciplina_codigo"] not in disciplinas:
+            erros_da_linha.append("Disciplina não existe")
+        if turma is None:
+            erros_da_linha.append("Turma não existe")
+        if chave in aulas_existentes:
+            erros_da_linha.append("Aula já existe")
+        if professor is None:
+            erros_da_linha.append("Usuário não existe")
+        elif professor.tipo != "p":
+            erros_da_linha.append("O usuário não é do tipo 'professor'")
+        elif aula["disciplina_codigo"] not in professor.disciplinas:
+            erros_da_linha.append("O 'professor' não pode ensinar essa 'disciplina'")
+
+        if not erros_da_linha:
+            # as aulas do ano letivo são carregadas uma vez e as linhas aceitas entram na agenda, para que os conflitos
+            # entre as próprias linhas da importação também sejam encontrados
+            if turma.calendario_ano_letivo not in agendas:
+                agendas[turma.calendario_ano_letivo] = AgendaDeAulas.carregar(turma.calendario_ano_letivo)
+            agenda = agendas[turma.calendario_ano_letivo]
+
+            erros_da_linha = agenda.conflitos(aula["dias_da_semana"], aula["hora_inicio"], aula["hora_fim"], turma.id, professor.id, turma.sala_numero)
+            if not erros_da_linha:
+                agenda.adicionar(None, aula["dias_da_semana"], aula["hora_inicio"], aula["hora_fim"], turma.id, professor.id, turma.sala_numero)
+                aulas_existentes.add(chave)
+                novas_aulas.append((aula, professor, turma))
+
+        erros.extend(erro_na_linha(numero, erro) for erro in erros_da_linha)
+
+    if erros:
+        return jsonify({"erro": erros}), 400
+
+    try:
+        ids = db.session.scalars(
+            insert(Aula).returning(Aula.id, sort_by_parameter_order=True),
+            [
+                {"hora_inicio": aula["hora_inicio"], "hora_fim": aula["hora_fim"], "dias_da_semana": aula["dias_da_semana"], "usuario_id": professor.id, "disciplina_codigo": aula["disciplina_codigo"], "turma_id": turma.id}
+                for aula, professor, turma in novas_aulas
+            ],
+        ).all()
+
+        db.session.execute(insert(HorarioAula), [
+            {"aula_id": aula_id, "dia_da_semana": dia, "turma_id": turma.id, "usuario_id": professor.id, "periodo": periodo}
+            for aula_id, (aula, professor, turma) in zip(ids, novas_aulas)
+            for dia, periodo in montar_periodos(aula["dias_da_semana"], aula["hora_inicio"], aula["hora_fim"], turma.calendario_ano_letivo)
+        ])
+
+        boletins = criar_boletins(Aula.id.in_(ids))
+        db.session.commit()
+    except IntegrityError as erro:
+        db.session.rollback()
+        if not eh_conflito_de_horario(erro):
+            raise
+        return jsonify({"erro": ["Já existe uma aula no mesmo horário"]}), 400
+
+    return jsonify({"mensagem": "Aulas importadas com sucesso!", "data": {"aulas": ids, "boletins": boletins}}), 201
+
+
 def listar_aulas(current_user_cpf: str, current_user_role: str) -> jsonify:
     """Lista todas as aulas cadastradas no banco de dados.
 
+    Com `Accept: application/x-ndjson` ou `?stream=1`, a listagem é transmitida em NDJSON (um objeto por linha),
+    lendo o banco em lotes.
+
     Args:
         current_user_cpf (str): O cpf do usuário autenticado.
         current_user_role (str): O role do usuário autenticado.
@@ -88,9 +233,17 @@ def listar_aulas(current_user_cpf: str, current_user_role: str) -> jsonify:
     Returns:
         jsonify: Resposta JSON contendo uma lista de aulas com seus respectivos dados.
     """
+    def serializar(aula):
+        return {"id": aula.id, "hora_inicio": hora_para_string(aula.hora_inicio), "hora_fim": hora_para_string(aula.hora_fim), "dias_da_semana": aula.dias_da_semana, "professor_id": aula.professor.id, "professor_nome": aula.professor.nome, "disciplina_codigo": aula.disciplina_codigo, "turma_id": aula.turma_id}
+
+    if pediu_ndjson():
+        # o professor de cada aula vem na mesma consulta, para não buscar um professor por linha transmitida
+        consulta = select(Aula).options(joinedload(Aula.professor)).order_by(Aula.id)
+        return transmitir_ndjson(consultar_em_lotes(consulta).scalars(), serializar)
+
     aulas = Aula.query.all()
 
-    return jsonify([{"id": aula.id, "hora_inicio": hora_para_string(aula.hora_inicio), "hora_fim": hora_para_string(aula.hora_fim), "dias_da_semana": aula.dias_da_semana, "professor_id": aula.professor.id, "professor_nome": aula.professor.nome, "disciplina_codigo": aula.disciplina_codigo, "turma_id": aula.turma_id} for aula in aulas]), 200
+    return jsonify([serializar(aula) for aula in aulas]), 200
 
 
 def buscar_aula(id: int, current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -150,9 +303,10 @@ def alterar_aula(id: int, current_user_cpf: str, current_user_role: str) -> json
     elif usuario_existente.tipo != "p":
         return jsonify({"erro": ["O usuário não é do tipo 'professor'"]}), 400
     
-    aula_no_mesmo_horario_com_mesmo_usuario = db.session.query(Aula).filter_by(hora_inicio=data['hora_inicio'], hora_fim=data['hora_fim'], dias_da_semana=data['dias_da_semana'], turma_id=data['turma_id']).first()
-    if aula_no_mesmo_horario_com_mesmo_usuario is not None:
-        return jsonify({"erro": ["Já existe uma aula no mesmo horário, com o mesmo professor"]}), 400
+    agenda = AgendaDeAulas.carregar(turma_existente.calendario_ano_letivo, turma_id=turma_existente.id, usuario_id=usuario_existente.id, sala_numero=turma_existente.sala_numero, ignorar=id)
+    conflitos = agenda.conflitos(data['dias_da_semana'], data['hora_inicio'], data['hora_fim'], turma_existente.id, usuario_existente.id, turma_existente.sala_numero)
+    if conflitos:
+        return jsonify({"erro": conflitos}), 400
     
     aula.hora_inicio = data['hora_inicio']
     aula.hora_fim = data['hora_fim']
@@ -160,7 +314,15 @@ def alterar_aula(id: int, current_user_cpf: str, current_user_role: str) -> json
     aula.usuario_id = usuario_existente.id
     aula.disciplina_codigo = data['disciplina_codigo']
     aula.turma_id = data['turma_id']
-    db.session.commit()
+    aula.horarios = montar_horarios(data['dias_da_semana'], data['hora_inicio'], data['hora_fim'], turma_existente.calendario_ano_letivo, turma_existente.id, usuario_existente.id)
+
+    try:
+        db.session.commit()
+    except IntegrityError as erro:
+        db.session.rollback()
+        if not eh_conflito_de_horario(erro):
+            raise
+        return jsonify({"erro": ["Já existe uma aula no mesmo horário"]}), 400
 
     # Usando a função hora_para_string para converter os objetos time para string
     hora_inicio_str = hora_para_string(aula.hora_inicio)
@@ -5,7 +5,9 @@ Este módulo contém as funções que implementam a lógica de negócio para as
 """
 
 from flask import request, jsonify
-from app.extensions import db
+from sqlalchemy import and_, case, column, func, update, values
+from sqlalchemy.orm import aliased
+from app.extensions import db, pdf_cache
 from ..models import Boletim, Aula, Aluno, Turma, Disciplina
 from app.utils.validators import validar_ausencias_registradas, validar_ausencias_alteradas
 from app.utils.ausencias_helpers import calcular_intervalo
@@ -23,7 +25,7 @@ def registrar_ausencias(aula_id: int, current_user_cpf: str, current_user_role:
         current_user_role (str): O role do usuário autenticado.
 
     Returns:
-        jsonify: Resposta JSON contendo uma mensagem de sucesso e os dados da ausência registrada, ou uma mensagem de erro em caso de dados inválidos.
+        jsonify: Resposta JSON contendo uma mensagem de sucesso e as matrículas dos alunos reprovados por falta nesse registro, ou uma mensagem de erro em caso de dados inválidos.
     """
     data = request.get_json()
 
@@ -53,30 +55,56 @@ def registrar_ausencias(aula_id: int, current_user_cpf: str, current_user_role:
     if turma.status != 'A':
         return jsonify({"erro": ["Turma inativa"]}), 400
 
-    # Para cada aluno, buscar o boletim relacionado a ele e a aula e cadastrar a ausência
-    for aluno in data["alunos"]:
-        # pegar o aluno
-        if aluno['ausencia']:
-            aluno_existente = db.session.get(Aluno, aluno['matricula'])
-            if aluno_existente is None:
-                return jsonify({"erro": ["Algum aluno não foi encontrado"]}), 400
-            
-            # pegar o boletim
-            boletim = db.session.query(Boletim).filter_by(aluno_matricula=aluno['matricula'], aula_id=aula.id).first()
-            # tratar um possivel erro
-            if boletim is None:
-                return jsonify({"erro": ["Algum boletim não foi encontrado"]}), 400
-            
-            # adicionar ausencia
-            boletim.ausencias += 1
-
-            # verificar se aluno reprovou por falta
-            if boletim.ausencias >= limite_ausencias and boletim.situacao != 'R':
-                boletim.situacao = 'R'
-    
+    # buscar, em uma única consulta, os alunos ausentes e se possuem boletim na aula
+    ausentes = [aluno['matricula'] for aluno in data["alunos"] if aluno['ausencia']]
+    boletins_existentes = dict(
+        db.session.query(Aluno.matricula, Boletim.aluno_matricula.is_not(None))
+        .outerjoin(Boletim, and_(Boletim.aluno_matricula == Aluno.matricula, Boletim.aula_id == aula.id))
+        .filter(Aluno.matricula.in_(set(ausentes)))
+    )
+
+    # validar cada aluno ausente na ordem enviada, contando as ausências por matrícula
+    novas_ausencias = {}
+    for matricula in ausentes:
+        if matricula not in boletins_existentes:
+            return jsonify({"erro": ["Algum aluno não foi encontrado"]}), 400
+
+        if not boletins_existentes[matricula]:
+            return jsonify({"erro": ["Algum boletim não foi encontrado"]}), 400
+
+        novas_ausencias[matricula] = novas_ausencias.get(matricula, 0) + 1
+
+    # adicionar as ausências e reprovar por falta quem atingiu o limite, em um único UPDATE ... FROM (VALUES ...),
+    # comparando com a situação anterior do boletim para retornar apenas os alunos que acabaram de ser reprovados
+    reprovados = []
+    if novas_ausencias:
+        valores = values(column("aluno_matricula", db.String), column("quantidade", db.Integer), name="novas_ausencias").data(list(novas_ausencias.items()))
+        anterior = aliased(Boletim, name="anterior")
+        ausencias_atualizadas = func.coalesce(Boletim.ausencias, 0) + valores.c.quantidade
+
+        resultado = db.session.execute(
+            update(Boletim)
+            .where(
+                Boletim.aluno_matricula == valores.c.aluno_matricula,
+                Boletim.aula_id == aula.id,
+                anterior.aluno_matricula == Boletim.aluno_matricula,
+                anterior.aula_id == Boletim.aula_id
+            )
+            .values(
+                ausencias=ausencias_atualizadas,
+                situacao=case((ausencias_atualizadas >= limite_ausencias, 'R'), else_=Boletim.situacao)
+            )
+            .returning(Boletim.aluno_matricula, and_(Boletim.situacao == 'R', anterior.situacao.is_distinct_from('R')))
+            .execution_options(synchronize_session=False)
+        )
+        reprovados = sorted(matricula for matricula, reprovado in resultado if reprovado)
+
     db.session.commit()
 
-    return jsonify({"mensagem": "Ausências cadastradas com sucesso!"}), 200
+    # descartar os PDFs em cache dos alunos alterados
+    pdf_cache.invalidar(*novas_ausencias)
+
+    return jsonify({"mensagem": "Ausências cadastradas com sucesso!", "reprovados": reprovados}), 200
 
 
 def buscar_ausencias_aula(aula_id: int, current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -191,4 +219,7 @@ def alterar_ausencia(aluno_matricula: str, aula_id: int, current_user_cpf: str,
 
     db.session.commit()
 
+    # descartar os PDFs em cache do aluno
+    pdf_cache.invalidar(aluno_matricula)
+
     return jsonify({"mensagem": "Ausências alteradas com sucesso!", "ausencias": boletim.ausencias }), 200
\ No newline at end of file
@@ -5,10 +5,13 @@ Este módulo contém as funções que implementam a lógica de negócio para as
 Ele interage com o modelo `Boletim` para realizar operações CRUD e valida os dados usando o módulo `validators`.
 """
 
-from flask import jsonify, send_file
-from app.extensions import db
-from ..models import Aula, Usuario, Turma, Disciplina, Aluno, Boletim
-from app.utils.boletim_helpers import gerar_pdf_boletim, gerar_pdf_historico
+import itertools
+import time
+from flask import jsonify, send_file, request, Response, stream_with_context, g
+from sqlalchemy.orm import contains_eager, joinedload
+from app.extensions import db, pdf_renderer, pdf_cache
+from ..models import Aula, Turma, Disciplina, Aluno, Boletim
+from app.utils.boletim_helpers import gerar_pdf_boletim, gerar_pdf_historico, gerar_pdf_boletins, gerar_zip_boletins, montar_linha_boletim, registrar_vazao_boletins
 
 
 def listar_aulas_professor (current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -21,34 +24,38 @@ def listar_aulas_professor (current_user_cpf: str, current_user_role: str) -> js
     Returns:
         jsonify: Resposta JSON contendo uma lista de aulas com seus respectivos dados.
     """
-    usuario = db.session.query(Usuario).filter_by(cpf = current_user_cpf).first()
-    if usuario.tipo != current_user_role:
+    usuario = g.usuario
+    if usuario is None or usuario["tipo"] != current_user_role:
         return jsonify({"erro": ["O usuário não tem permissão para acessar a página"]})
     
-    aulas = db.session.query(Aula).filter_by(usuario_id=usuario.id)
+    # Uma única consulta traz cada aula das turmas ativas junto com os dados da turma e da disciplina
+    aulas = (
+        db.session.query(Aula.id, Turma.id, Turma.ano, Turma.serie, Turma.nivel_de_ensino, Disciplina.codigo, Disciplina.nome)
+        .join(Turma, Aula.turma_id == Turma.id)
+        .join(Disciplina, Aula.disciplina_codigo == Disciplina.codigo)
+        .filter(Aula.usuario_id == usuario["id"], Turma.status == "A")
+        .order_by(Aula.id)
+    )
 
     resposta = {"turmas": [], "disciplinas": []}
-    for aula in aulas:
-        turma = db.session.get(Turma, aula.turma_id)
-        if turma.status == "A":
-            turma_atual = {
-                "id": turma.id,
-                "ano": turma.ano,
-                "serie": turma.serie,
-                "nivel_de_ensino": turma.nivel_de_ensino
-            }
-
-            if turma_atual not in resposta["turmas"]:
-                resposta["turmas"].append(turma_atual)
-            
-            disciplina = db.session.get(Disciplina, aula.disciplina_codigo)
-            resposta["disciplinas"].append({
-                "turma_id": turma.id,
-                "codigo": disciplina.codigo,
-                "nome": disciplina.nome,
-                "aula_id": aula.id
+    turmas_vistas = set()
+    for aula_id, turma_id, turma_ano, turma_serie, turma_nivel_de_ensino, disciplina_codigo, disciplina_nome in aulas:
+        if turma_id not in turmas_vistas:
+            turmas_vistas.add(turma_id)
+            resposta["turmas"].append({
+                "id": turma_id,
+                "ano": turma_ano,
+                "serie": turma_serie,
+                "nivel_de_ensino": turma_nivel_de_ensino
             })
 
+        resposta["disciplinas"].append({
+            "turma_id": turma_id,
+            "codigo": disciplina_codigo,
+            "nome": disciplina_nome,
+            "aula_id": aula_id
+        })
+
     return jsonify(resposta), 200
 
 
@@ -84,32 +91,10 @@ def buscar_boletim (aluno_matricula: str, current_user_cpf: str, current_user_ro
         if not boletim:
             return jsonify({"erro": ["O aluno não está associado a todas as aulas da turma"]}), 400
         
-        notas_boletim = boletim.notas
-
-        notas = (notas_boletim + [None] * 4)[:4] if notas_boletim else [None] * 4
-        
-        situacao_map = {"A": "Aprovado", "R": "Reprovado", "M": "Cursando"}
-        situacao = situacao_map.get(boletim.situacao, "Cursando")
-
-        # Calcula a média
-        if all(n is not None for n in notas):
-            media = sum(notas) / len(notas)
-            media_formatada = f"{media:.1f}"
-        else:
-            media_formatada = "---"
-        
-        data.append([
-            aula.disciplina.nome,
-            f"{notas[0]:.1f}" if notas[0] is not None else "---",
-            f"{notas[1]:.1f}" if notas[1] is not None else "---",
-            f"{notas[2]:.1f}" if notas[2] is not None else "---",
-            f"{notas[3]:.1f}" if notas[3] is not None else "---",
-            str(boletim.ausencias),
-            media_formatada,
-            situacao
-        ])
+        data.append(montar_linha_boletim(aula.disciplina.nome, boletim))
     
-    return jsonify({"aluno_matricula": aluno.matricula, "aluno_nome": aluno.nome, "turma_ano": turma_atual.ano, "turma_serie": turma_atual.serie, "turma_nivel_de_ensino": turma_atual.nivel_de_ensino, "boletim": [{"disciplina": b[0], "u1": b[1], "u2": b[2], "u3": b[3], "u4": b[4], "media": b[5], "ausencias": b[6], "situacao": b[7]} for b in data]}), 200
+    # a tela do boletim exibe "media" na coluna de ausências e "ausencias" na coluna de média, por isso os índices invertidos
+    return jsonify({"aluno_matricula": aluno.matricula, "aluno_nome": aluno.nome, "turma_ano": turma_atual.ano, "turma_serie": turma_atual.serie, "turma_nivel_de_ensino": turma_atual.nivel_de_ensino, "boletim": [{"disciplina": b[0], "u1": b[1], "u2": b[2], "u3": b[3], "u4": b[4], "media": b[6], "ausencias": b[5], "situacao": b[7]} for b in data]}), 200
 
 
 def gerar_boletim(aluno_matricula: str, current_user_cpf: str, current_user_role: str):
@@ -153,32 +138,10 @@ def gerar_boletim(aluno_matricula: str, current_user_cpf: str, current_user_role
         "ano_letivo": turma_atual.calendario_ano_letivo,
     }
     
-    data = []
-    for aula in turma_atual.aulas:
-        boletim = boletins[aula.id]
-        notas_boletim = boletim.notas
-
-        notas = (notas_boletim + [None] * 4)[:4] if notas_boletim else [None] * 4
-
-        situacao = {"A": "Aprovado", "R": "Reprovado", "M": "Cursando"}.get(boletim.situacao, "Cursando")
-
-        # Calcula a média
-        if all(n is not None for n in notas):
-            media = sum(notas) / len(notas)
-            media_formatada = f"{media:.1f}"
-        else:
-            media_formatada = "---"
-        
-        data.append([
-            aula.disciplina.nome,
-            *[f"{n:.1f}" if n is not None else "---" for n in notas],
-            media_formatada,
-            str(boletim.ausencias),
-            situacao
-        ])
+    data = [montar_linha_boletim(aula.disciplina.nome, boletins[aula.id]) for aula in turma_atual.aulas]
     
     # Gera o PDF
-    pdf_buffer = gerar_pdf_boletim(data_aluno, data_turma, data)
+    pdf_buffer = pdf_cache.obter_ou_renderizar(gerar_pdf_boletim, data_aluno, data_turma, data, matriculas=[aluno.matricula])
     
     # Limpa qualquer resposta que possa ter sido iniciada
     response = send_file(
@@ -193,6 +156,108 @@ def gerar_boletim(aluno_matricula: str, current_user_cpf: str, current_user_role
     return response
 
 
+def gerar_boletins_turma(turma_id: int, current_user_cpf: str, current_user_role: str):
+    """Gera os boletins de todos os alunos de uma turma em uma única requisição.
+
+    Por padrão, todos os boletins são reunidos em um único PDF (um aluno por página). Com `?formato=zip`, é enviado
+    um arquivo .zip com um PDF por aluno, transmitido à medida que cada boletim é gerado. O primeiro boletim é gerado
+    antes do início da transmissão, para que um executor ocupado ainda seja respondido com 503/504 em vez de um .zip
+    interrompido.
+
+    Args:
+        turma_id (int): O id da turma.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        PDF | ZIP: Resposta contendo os boletins gerados, ou uma resposta JSON com mensagem de erro.
+    """
+    formato = request.args.get("formato", "pdf")
+    if formato not in ("pdf", "zip"):
+        return jsonify({"erro": ["O formato deve ser 'pdf' ou 'zip'"]}), 400
+
+    turma = db.session.get(Turma, turma_id)
+    if not turma:
+        return jsonify({"erro": ["Turma não existe"]}), 400
+
+    aulas = db.session.query(Aula).options(joinedload(Aula.disciplina)).filter_by(turma_id=turma.id).order_by(Aula.id).all()
+    if not aulas:
+        return jsonify({"erro": ["A turma não possui aulas cadastradas"]}), 400
+
+    # Carrega todos os boletins das aulas da turma, junto com os alunos, em uma única consulta
+    boletins = (
+        db.session.query(Boletim)
+        .join(Boletim.aluno)
+        .options(contains_eager(Boletim.aluno))
+        .filter(Boletim.aula_id.in_([aula.id for aula in aulas]))
+        .order_by(Aluno.nome, Aluno.matricula)
+        .all()
+    )
+    if not boletins:
+        return jsonify({"erro": ["A turma não possui alunos com boletim"]}), 400
+
+    boletins_por_aluno = {}
+    for boletim in boletins:
+        boletins_por_aluno.setdefault(boletim.aluno_matricula, {})[boletim.aula_id] = boletim
+
+    # Verifica se todos os alunos têm boletim em todas as aulas
+    incompletos = [matricula for matricula, boletins_aluno in boletins_por_aluno.items() if len(boletins_aluno) != len(aulas)]
+    if incompletos:
+        return jsonify({"erro": [f"Alunos não associados a todas as aulas da turma: {', '.join(incompletos)}"]}), 400
+
+    data_turma = {
+        "ano": turma.ano,
+        "serie": turma.serie,
+        "nivel_de_ensino": turma.nivel_de_ensino,
+        "ano_letivo": turma.calendario_ano_letivo,
+    }
+
+    dados_boletins = []
+    for boletins_aluno in boletins_por_aluno.values():
+        aluno = next(iter(boletins_aluno.values())).aluno
+        data_aluno = {"nome": aluno.nome, "matricula": aluno.matricula}
+        data = [montar_linha_boletim(aula.disciplina.nome, boletins_aluno[aula.id]) for aula in aulas]
+        dados_boletins.append((data_aluno, data_turma, data))
+
+    inicio = time.perf_counter()
+
+    if formato == "zip":
+        # Os dados já foram carregados, então a conexão é devolvida ao pool antes da transmissão começar
+        db.session.close()
+
+        # Os PDFs são renderizados em paralelo e compactados na ordem dos alunos. O primeiro é aguardado aqui, antes do
+        # envio dos cabeçalhos, para que FilaCheiaError e TempoEsgotadoError ainda cheguem aos tratadores da aplicação
+        pdfs = pdf_renderer.renderizar_em_lote(gerar_pdf_boletim, dados_boletins)
+        primeiro_pdf = next(pdfs)
+
+        def transmitir():
+            arquivos = zip(dados_boletins, itertools.chain([primeiro_pdf], pdfs))
+            yield from gerar_zip_boletins((f"boletim_{data_aluno['matricula']}.pdf", pdf) for (data_aluno, _, _), pdf in arquivos)
+            registrar_vazao_boletins(turma_id, len(dados_boletins), time.perf_counter() - inicio)
+
+        response = Response(
+            stream_with_context(transmitir()),
+            mimetype='application/zip',
+            headers={"Content-Disposition": f"attachment; filename=boletins_turma_{turma_id}.zip"}
+        )
+        # Se a transmissão não chegar ao fim, os PDFs ainda não aguardados são cancelados
+        response.call_on_close(pdfs.close)
+        return response
+
+    pdf_buffer = pdf_cache.obter_ou_renderizar(gerar_pdf_boletins, dados_boletins, matriculas=list(boletins_por_aluno))
+    alunos_por_segundo = registrar_vazao_boletins(turma.id, len(dados_boletins), time.perf_counter() - inicio)
+
+    response = send_file(
+        pdf_buffer,
+        mimetype='application/pdf',
+        download_name=f'boletins_turma_{turma.id}.pdf',
+        as_attachment=True
+    )
+    response.headers["X-Alunos-Por-Segundo"] = f"{alunos_por_segundo:.1f}"
+    response.call_on_close(pdf_buffer.close)
+    return response
+
+
 def buscar_historico (aluno_matricula: str, current_user_cpf: str, current_user_role: str) -> jsonify:
     """Busca o histórico pela matrícula do aluno.
 
@@ -231,28 +296,7 @@ def buscar_historico (aluno_matricula: str, current_user_cpf: str, current_user_
             if not boletim:
                 return jsonify({"erro": ["O aluno não está associado a todas as aulas das turmas"]}), 400
 
-            notas_boletim = boletim.notas
-            notas = (notas_boletim + [None] * 4)[:4] if notas_boletim else [None] * 4
-            
-            situacao = {"A": "Aprovado", "R": "Reprovado", "M": "Cursando"}.get(boletim.situacao, "Cursando")
-
-            # Calcula a média
-            if all(n is not None for n in notas):
-                media = sum(notas) / len(notas)
-                media_formatada = f"{media:.1f}"
-            else:
-                media_formatada = "---"
-            
-            data_turma["aulas"].append([
-                aula.disciplina.nome,
-                f"{notas[0]:.1f}" if notas[0] is not None else "---",
-                f"{notas[1]:.1f}" if notas[1] is not None else "---",
-                f"{notas[2]:.1f}" if notas[2] is not None else "---",
-                f"{notas[3]:.1f}" if notas[3] is not None else "---",
-                media_formatada,
-                str(boletim.ausencias),
-                situacao
-            ])
+            data_turma["aulas"].append(montar_linha_boletim(aula.disciplina.nome, boletim))
         data_historico.append(data_turma)
     
     return jsonify({"aluno_matricula": aluno.matricula, "aluno_nome": aluno.nome, "turmas": [{"ano": t["ano"], "serie": t["serie"], "nivel_de_ensino": t["nivel_de_ensino"], "ano_letivo": t["ano_letivo"], "aulas": [{"disciplina": b[0], "u1": b[1], "u2": b[2], "u3": b[3], "u4": b[4], "media": b[5], "ausencias": b[6], "situacao": b[7]} for b in t["aulas"]]} for t in data_historico]})
@@ -301,31 +345,10 @@ def gerar_historico (aluno_matricula: str, current_user_cpf: str, current_user_r
             if not boletim:
                 return jsonify({"erro": ["O aluno não está associado a todas as aulas das turmas"]}), 400
 
-            notas_boletim = boletim.notas
-            notas = (notas_boletim + [None] * 4)[:4] if notas_boletim else [None] * 4
-            
-            situacao = {"A": "Aprovado", "R": "Reprovado", "M": "Cursando"}.get(boletim.situacao, "Cursando")
-
-            # Calcula a média
-            if all(n is not None for n in notas):
-                media = sum(notas) / len(notas)
-                media_formatada = f"{media:.1f}"
-            else:
-                media_formatada = "---"
-            
-            data_turma["aulas"].append([
-                aula.disciplina.nome,
-                f"{notas[0]:.1f}" if notas[0] is not None else "---",
-                f"{notas[1]:.1f}" if notas[1] is not None else "---",
-                f"{notas[2]:.1f}" if notas[2] is not None else "---",
-                f"{notas[3]:.1f}" if notas[3] is not None else "---",
-                media_formatada,
-                str(boletim.ausencias),
-                situacao
-            ])
+            data_turma["aulas"].append(montar_linha_boletim(aula.disciplina.nome, boletim))
         data_historico.append(data_turma)
     
-    pdf_buffer = gerar_pdf_historico(data_aluno, data_historico)
+    pdf_buffer = pdf_cache.obter_ou_renderizar(gerar_pdf_historico, data_aluno, data_historico, matriculas=[aluno.matricula])
     
     return send_file(
         pdf_buffer,
@@ -6,9 +6,11 @@ Ele interage com o modelo `Disciplina` para realizar operações CRUD e valida o
 """
 
 from flask import request, jsonify
+from sqlalchemy import select
 from app.extensions import db
 from ..models import Disciplina
 from app.utils.validators import validar_disciplina
+from app.utils.stream_helpers import pediu_ndjson, consultar_em_lotes, transmitir_ndjson
 
 
 def cadastrar_disciplina(current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -42,6 +44,9 @@ def cadastrar_disciplina(current_user_cpf: str, current_user_role: str) -> jsoni
 def listar_disciplinas(current_user_cpf: str, current_user_role: str) -> jsonify:
     """Lista todas as disciplinas cadastradas no banco de dados.
 
+    Com `Accept: application/x-ndjson` ou `?stream=1`, a listagem é transmitida em NDJSON (um objeto por linha),
+    lendo o banco em lotes.
+
     Args:
         current_user_cpf (str): O cpf do usuário autenticado.
         current_user_role (str): O role do usuário autenticado.
@@ -49,8 +54,14 @@ def listar_disciplinas(current_user_cpf: str, current_user_role: str) -> jsonify
     Returns:
         jsonify: Resposta JSON contendo uma lista de disciplinas com seus respectivos dados.
     """
+    def serializar(disciplina):
+        return {"codigo": disciplina.codigo, "nome": disciplina.nome, "carga_horaria": disciplina.carga_horaria, "ementa": disciplina.ementa, "bibliografia": disciplina.bibliografia}
+
+    if pediu_ndjson():
+        return transmitir_ndjson(consultar_em_lotes(select(Disciplina).order_by(Disciplina.codigo)).scalars(), serializar)
+
     disciplinas = Disciplina.query.all()
-    return jsonify([{"codigo": disciplina.codigo, "nome": disciplina.nome, "carga_horaria": disciplina.carga_horaria, "ementa": disciplina.ementa, "bibliografia": disciplina.bibliografia} for disciplina in disciplinas]), 200
+    return jsonify([serializar(disciplina) for disciplina in disciplinas]), 200
 
 
 def buscar_disciplina(codigo: str, current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -0,0 +1,173 @@
+"""
+Módulo de Controlador das Leituras Assíncronas.
+
+Este módulo contém as versões assíncronas, usadas no modo ASGI, das consultas mais frequentes de boletins, notas e
+ausências. As respostas (inclusive as mensagens de erro) são iguais às dos controladores `boletim_controller`,
+`notas_controller` e `ausencias_controller`; as consultas usam a sessão assíncrona recebida da rota.
+"""
+
+from flask import g
+from sqlalchemy import select
+from starlette.responses import Response
+from app.utils.asgi_helpers import responder
+from ..models import Aula, Aluno, Boletim, Turma, Disciplina
+
+
+async def listar_aulas_professor(sessao, current_user_cpf: str, current_user_role: str) -> Response:
+    """Lista todas as aulas, vinculadas ao professor autenticado, das turmas ativas.
+
+    Args:
+        sessao (AsyncSession): A sessão assíncrona da requisição.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        Response: Resposta JSON contendo as turmas e as disciplinas das aulas do professor.
+    """
+    usuario = g.usuario
+    if usuario is None or usuario["tipo"] != current_user_role:
+        return responder({"erro": ["O usuário não tem permissão para acessar a página"]})
+
+    aulas = await sessao.execute(
+        select(Aula.id, Turma.id, Turma.ano, Turma.serie, Turma.nivel_de_ensino, Disciplina.codigo, Disciplina.nome)
+        .join(Turma, Aula.turma_id == Turma.id)
+        .join(Disciplina, Aula.disciplina_codigo == Disciplina.codigo)
+        .filter(Aula.usuario_id == usuario["id"], Turma.status == "A")
+        .order_by(Aula.id)
+    )
+
+    resposta = {"turmas": [], "disciplinas": []}
+    turmas_vistas = set()
+    for aula_id, turma_id, turma_ano, turma_serie, turma_nivel_de_ensino, disciplina_codigo, disciplina_nome in aulas:
+        if turma_id not in turmas_vistas:
+            turmas_vistas.add(turma_id)
+            resposta["turmas"].append({
+                "id": turma_id,
+                "ano": turma_ano,
+                "serie": turma_serie,
+                "nivel_de_ensino": turma_nivel_de_ensino
+            })
+
+        resposta["disciplinas"].append({
+            "turma_id": turma_id,
+            "codigo": disciplina_codigo,
+            "nome": disciplina_nome,
+            "aula_id": aula_id
+        })
+
+    return responder(resposta)
+
+
+async def listar_alunos_aula(sessao, aula_id: int) -> list:
+    """Busca a matrícula e o nome dos alunos com boletim na aula, em uma única consulta."""
+    alunos = await sessao.execute(
+        select(Aluno.matricula, Aluno.nome)
+        .join(Boletim, Boletim.aluno_matricula == Aluno.matricula)
+        .filter(Boletim.aula_id == aula_id)
+    )
+    return [{"matricula": matricula, "nome": nome} for matricula, nome in alunos]
+
+
+async def buscar_notas_aula(sessao, aula_id: int, current_user_cpf: str, current_user_role: str) -> Response:
+    """Busca os alunos de uma aula de turma ativa, para o lançamento das notas.
+
+    Args:
+        sessao (AsyncSession): A sessão assíncrona da requisição.
+        aula_id (int): O id da aula.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        Response: Resposta JSON contendo os alunos da aula.
+    """
+    aula = await sessao.get(Aula, aula_id)
+    if not aula:
+        return responder({"erro": ["O 'id_aula' não corresponde a nenhuma aula"]}, 400)
+
+    turma = await sessao.get(Turma, aula.turma_id)
+    if not turma or turma.status != "A":
+        return responder({"erro": ["A aula está em uma turma já consolidada"]}, 400)
+
+    return responder({"aula_id": aula.id, "alunos": await listar_alunos_aula(sessao, aula.id)})
+
+
+async def buscar_notas_aluno(sessao, aluno_matricula: str, aula_id: int, current_user_cpf: str, current_user_role: str) -> Response:
+    """Busca as notas de um aluno em uma aula.
+
+    Args:
+        sessao (AsyncSession): A sessão assíncrona da requisição.
+        aluno_matricula (str): A matrícula do aluno.
+        aula_id (int): O id da aula.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        Response: Resposta JSON contendo as notas e a situação do aluno na aula.
+    """
+    aula = await sessao.get(Aula, aula_id)
+    if not aula:
+        return responder({"erro": ["Nenhuma aula foi encontrada"]}, 400)
+
+    aluno = await sessao.get(Aluno, aluno_matricula)
+    if not aluno:
+        return responder({"erro": ["A matrícula informada não corresponde a nenhuma aluno"]}, 400)
+
+    boletim = await sessao.get(Boletim, (aluno.matricula, aula.id))
+    if not boletim:
+        return responder({"erro": ["Boletim não foi encontrado"]}, 400)
+
+    return responder({"aula_id": aula.id, "matricula": aluno.matricula, "nome": aluno.nome, "notas": boletim.notas, "situacao": boletim.situacao})
+
+
+async def buscar_ausencias_aula(sessao, aula_id: int, current_user_cpf: str, current_user_role: str) -> Response:
+    """Busca os alunos de uma aula de turma ativa, para o registro das ausências.
+
+    Args:
+        sessao (AsyncSession): A sessão assíncrona da requisição.
+        aula_id (int): O id da aula.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        Response: Resposta JSON contendo os alunos da aula.
+    """
+    aula = await sessao.get(Aula, aula_id)
+    if aula is None:
+        return responder({"erro": ["Aula não existe"]}, 400)
+
+    turma = await sessao.get(Turma, aula.turma_id)
+    if turma is None:
+        return responder({"erro": ["Turma não existe"]}, 400)
+
+    if turma.status != 'A':
+        return responder({"erro": ["Turma inativa"]}, 400)
+
+    return responder({"aula_id": aula.id, "alunos": await listar_alunos_aula(sessao, aula.id)})
+
+
+async def buscar_ausencias_aluno(sessao, aluno_matricula: str, aula_id: int, current_user_cpf: str, current_user_role: str) -> Response:
+    """Busca as ausências de um aluno em uma aula.
+
+    Args:
+        sessao (AsyncSession): A sessão assíncrona da requisição.
+        aluno_matricula (str): A matrícula do aluno.
+        aula_id (int): O id da aula.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        Response: Resposta JSON contendo as ausências do aluno na aula.
+    """
+    aula = await sessao.get(Aula, aula_id)
+    if aula is None:
+        return responder({"erro": ["Aula não existe"]}, 400)
+
+    aluno = await sessao.get(Aluno, aluno_matricula)
+    if aluno is None:
+        return responder({"erro": ["Aluno não existe"]}, 400)
+
+    boletim = await sessao.get(Boletim, (aluno_matricula, aula_id))
+    if boletim is None:
+        return responder({"erro": ["Boletim não existe"]}, 400)
+
+    return responder({"aula_id": aula.id, "matricula": aluno.matricula, "nome": aluno.nome, "ausencias": boletim.ausencias})
@@ -4,10 +4,10 @@ Módulo de Controlador para Login.
 Este módulo contém as funções que implementam a lógica de negócio para as operações relacionadas às login.
 """
 
-from flask import request, jsonify, make_response
+from flask import request, jsonify, make_response, g
 from app.extensions import db
 from ..utils.login_helpers import gerar_token
-from ..utils.usuario_helpers import checar_senha
+from ..utils.usuario_helpers import checar_senha, precisa_novo_hash, gerar_hashing
 from ..models import Usuario
 from datetime import timedelta
 
@@ -28,6 +28,11 @@ def login() -> jsonify:
     
     if not checar_senha(data['senha'], usuario.senha):
         return jsonify({"erro": "Senha incorreta"}), 401
+
+    # com a senha conferida, refaz o hash se ele foi gerado com um custo diferente do configurado
+    if precisa_novo_hash(usuario.senha):
+        usuario.senha = gerar_hashing(data['senha'])
+        db.session.commit()
     
     token = gerar_token(usuario.cpf, usuario.tipo)
 
@@ -56,11 +61,11 @@ def validate(current_user_cpf: str, current_user_role: str) -> jsonify:
     Returns:
         jsonify: Resposta JSON contendo uma mensagem de sucesso, ou uma mensagem de erro em caso de dados inválidos.
     """
-    usuario = db.session.query(Usuario).filter_by(cpf=current_user_cpf).first()
+    usuario = g.usuario
     if not usuario:
         return jsonify({ "autenticado": False, "mensagem": "Usuário não existe"}), 401
     
-    return jsonify({ "autenticado": True, "usuario": {"nome": usuario.nome, "role": current_user_role } }), 200
+    return jsonify({ "autenticado": True, "usuario": {"nome": usuario["nome"], "role": current_user_role } }), 200
 
 
 def logout() -> jsonify:
@@ -4,10 +4,13 @@ Módulo de Controlador para Notas.
 Este módulo contém as funções que implementam a lógica de negócio para as operações relacionadas às notas.
 """
 
-from flask import jsonify, request
-from app.extensions import db
+import numpy as np
+from flask import jsonify, request, current_app
+from sqlalchemy import and_, cast, column, func, select, update, values
+from app.extensions import db, pdf_cache, estatisticas_cache
 from app.utils.validators import validar_notas_cadastradas, validar_nota_alterada
-from ..models import Aula, Aluno, Boletim, Turma
+from app.utils.estatisticas_helpers import montar_matriz_notas, calcular_estatisticas, calcular_resumo_por_grupo
+from ..models import Aula, Aluno, Boletim, Turma, Disciplina, Calendario
 
 
 def cadastrar_notas(current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -38,21 +41,47 @@ def cadastrar_notas(current_user_cpf: str, current_user_role: str) -> jsonify:
     if not turma or turma.status != "A":
         return jsonify({"erro": ["A aula está em uma turma já consolidada"]}), 400
 
+    # buscar, em uma única consulta, os alunos enviados e as notas já cadastradas no boletim da aula (None se não houver boletim)
+    matriculas = {aluno["matricula"] for aluno in data['alunos']}
+    notas_cadastradas = dict(
+        db.session.query(Aluno.matricula, Boletim.notas)
+        .outerjoin(Boletim, and_(Boletim.aluno_matricula == Aluno.matricula, Boletim.aula_id == aula.id))
+        .filter(Aluno.matricula.in_(matriculas))
+    )
+
+    # validar cada aluno na ordem enviada, acumulando as novas notas por matrícula
+    novas_notas = {}
     for aluno in data['alunos']:
-        aluno_existente = db.session.get(Aluno, aluno["matricula"])
-        if not aluno_existente:
+        if aluno["matricula"] not in notas_cadastradas:
             return jsonify({"erro": ["Algum aluno não foi encontrado"]}), 400
 
-        boletim = db.session.query(Boletim).filter_by(aluno_matricula=aluno["matricula"], aula_id=data['aula_id']).first()
-        if not boletim:
+        notas = notas_cadastradas[aluno["matricula"]]
+        if notas is None:
             return jsonify({"erro": ["Algum aluno não possui boletim para essa aula"]}), 400
-        elif len(boletim.notas) >= 4:
+        elif len(notas) + len(novas_notas.get(aluno["matricula"], [])) >= 4:
             return jsonify({"erro": ["Todas as notas já foram cadastradas para essa aula"]}), 400
 
-        boletim.notas = boletim.notas + [aluno["nota"]]
+        novas_notas.setdefault(aluno["matricula"], []).append(aluno["nota"])
+
+    # acrescentar as notas de todos os alunos em um único UPDATE ... FROM (VALUES ...)
+    if novas_notas:
+        valores = values(column("aluno_matricula", db.String), column("notas", Boletim.notas.type), name="novas_notas").data(list(novas_notas.items()))
+        db.session.execute(
+            update(Boletim)
+            .where(Boletim.aluno_matricula == valores.c.aluno_matricula, Boletim.aula_id == aula.id)
+            .values(notas=func.array_cat(Boletim.notas, cast(valores.c.notas, Boletim.notas.type)))
+            .execution_options(synchronize_session=False)
+        )
+        # incrementada no próprio UPDATE, a versão só cresce, na ordem em que as escritas são confirmadas
+        aula.versao_notas = Aula.versao_notas + 1
 
     db.session.commit()
 
+    # descartar os PDFs em cache dos alunos alterados e as estatísticas da aula (os outros workers percebem a nova
+    # versão das notas da aula na próxima leitura)
+    pdf_cache.invalidar(*(aluno["matricula"] for aluno in data['alunos']))
+    estatisticas_cache.invalidar(("aula", aula.id), ("calendario", turma.calendario_ano_letivo))
+
     return jsonify({"mensagem": "Notas cadastradas com sucesso!"}), 201
 
 
@@ -147,7 +176,120 @@ def alterar_notas(aluno_matricula: str, aula_id: int, current_user_cpf: str, cur
 
     # alterar o valor da nota
     boletim.notas = data["notas"]
+    aula.versao_notas = Aula.versao_notas + 1
     db.session.commit()
 
+    # descartar os PDFs em cache do aluno e as estatísticas da aula (os outros workers percebem a nova versão das notas
+    # da aula na próxima leitura)
+    pdf_cache.invalidar(aluno_matricula)
+    estatisticas_cache.invalidar(("aula", aula.id), ("calendario", aula.turma.calendario_ano_letivo))
+
     # retornar mensagem de sucesso
-    return jsonify({"mensagem": "Notas alteradas com sucesso!", "notas": boletim.notas }), 200
\ No newline at end of file
+    return jsonify({"mensagem": "Notas alteradas com sucesso!", "notas": boletim.notas }), 200
+
+
+def buscar_estatisticas_aula(aula_id: int, current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Calcula as estatísticas da distribuição das notas de uma aula.
+
+    As estatísticas (média, mediana, desvio padrão, percentis, taxa de aprovação e histograma) são calculadas para cada
+    unidade e para a média final, e ficam em cache até o próximo cadastro ou alteração de notas da aula. Como o cache é
+    de cada processo, a resposta em cache guarda a versão das notas da aula (`Aula.versao_notas`, incrementada a cada
+    escrita), que é comparada com a do banco a cada leitura, para que um worker não responda com estatísticas alteradas
+    em outro.
+
+    Args:
+        aula_id (int): O id da aula.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo as estatísticas das notas da aula.
+    """
+    aula = db.session.get(Aula, aula_id)
+    if not aula:
+        return jsonify({"erro": ["O 'id_aula' não corresponde a nenhuma aula"]}), 400
+
+    chave = ("aula", aula.id)
+    versao = aula.versao_notas
+    versao_em_cache, resposta = estatisticas_cache.obter(chave, (None, None))
+    if resposta is None or versao_em_cache != versao:
+        # todas as notas e médias da aula em uma única consulta (lidas depois da versão, então uma escrita
+        # concorrente no máximo faz a próxima leitura recalcular)
+        matriz = montar_matriz_notas(db.session.query(Boletim.notas, Boletim.media).filter_by(aula_id=aula.id))
+
+        resposta = {
+            "aula_id": aula.id,
+            "quantidade_alunos": len(matriz),
+            "nota_minima": current_app.config["NOTA_MINIMA_APROVACAO"],
+            "estatisticas": calcular_estatisticas(matriz, current_app.config["NOTA_MINIMA_APROVACAO"])
+        }
+        estatisticas_cache.definir(chave, (versao, resposta), etiquetas=[chave, ("calendario", aula.turma.calendario_ano_letivo)])
+
+    return jsonify(resposta), 200
+
+
+def buscar_estatisticas_calendario(ano_letivo: int, current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Calcula as estatísticas da distribuição das notas de todas as aulas de um ano letivo.
+
+    Além das estatísticas gerais, retorna a média final e a taxa de aprovação de cada aula. O resultado fica em cache
+    até o próximo cadastro ou alteração de notas de alguma aula do ano letivo, em qualquer worker: a versão das notas do
+    ano letivo (a soma das versões das aulas, que cresce a cada escrita confirmada em qualquer aula, o número de aulas
+    e o maior id entre elas) é consultada a cada leitura.
+
+    Args:
+        ano_letivo (int): O ano letivo do calendário.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo as estatísticas das notas do ano letivo e o resumo de cada aula.
+    """
+    calendario = db.session.get(Calendario, ano_letivo)
+    if not calendario:
+        return jsonify({"erro": ["Calendário não existe"]}), 400
+
+    chave = ("calendario", calendario.ano_letivo)
+    versao = tuple(db.session.execute(
+        select(func.coalesce(func.sum(Aula.versao_notas), 0), func.count(Aula.id), func.max(Aula.id))
+        .join(Turma, Aula.turma_id == Turma.id)
+        .where(Turma.calendario_ano_letivo == calendario.ano_letivo)
+    ).one())
+    versao_em_cache, resposta = estatisticas_cache.obter(chave, (None, None))
+    if resposta is None or versao_em_cache != versao:
+        aulas = (
+            db.session.query(Aula.id, Turma.id, Turma.ano, Turma.serie, Turma.nivel_de_ensino, Disciplina.nome)
+            .join(Turma, Aula.turma_id == Turma.id)
+            .join(Disciplina, Aula.disciplina_codigo == Disciplina.codigo)
+            .filter(Turma.calendario_ano_letivo == calendario.ano_letivo)
+            .order_by(Aula.id)
+            .all()
+        )
+        indice_aula = {aula[0]: indice for indice, aula in enumerate(aulas)}
+
+        # todas as notas do ano letivo em uma única consulta
+        boletins = (
+            db.session.query(Boletim.aula_id, Boletim.notas, Boletim.media)
+            .join(Aula, Boletim.aula_id == Aula.id)
+            .join(Turma, Aula.turma_id == Turma.id)
+            .filter(Turma.calendario_ano_letivo == calendario.ano_letivo)
+            .all()
+        )
+        matriz = montar_matriz_notas((boletim.notas, boletim.media) for boletim in boletins)
+        grupos = np.fromiter((indice_aula[boletim.aula_id] for boletim in boletins), dtype=np.intp, count=len(boletins))
+
+        nota_minima = current_app.config["NOTA_MINIMA_APROVACAO"]
+        resumos = calcular_resumo_por_grupo(matriz, grupos, len(aulas), nota_minima)
+
+        resposta = {
+            "ano_letivo": calendario.ano_letivo,
+            "quantidade_boletins": len(matriz),
+            "nota_minima": nota_minima,
+            "estatisticas": calcular_estatisticas(matriz, nota_minima),
+            "aulas": [
+                {"aula_id": aula_id, "turma_id": turma_id, "turma_ano": turma_ano, "turma_serie": turma_serie, "turma_nivel_de_ensino": turma_nivel_de_ensino, "disciplina": disciplina_nome, **resumo}
+                for (aula_id, turma_id, turma_ano, turma_serie, turma_nivel_de_ensino, disciplina_nome), resumo in zip(aulas, resumos)
+            ]
+        }
+        estatisticas_cache.definir(chave, (versao, resposta), etiquetas=[chave])
+
+    return jsonify(resposta), 200
@@ -0,0 +1,47 @@
+"""
+Módulo de Controlador para a Saúde do Servidor.
+
+Este módulo contém as funções que informam o estado interno do worker que atendeu a requisição, como o pool de conexões
+com o banco de dados, as métricas das consultas SQL de cada rota e a fila do pool de senhas.
+"""
+
+from flask import jsonify, Response
+from app.extensions import db, metricas, tokens_cache
+from app.utils.pool_helpers import estado_dos_pools
+from app.utils.usuario_helpers import verificador_senhas
+
+
+def estado_pool(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Informa o estado do pool de conexões do worker que atendeu a requisição.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON com o estado de cada pool (conexões em uso, ociosas e em overflow, e tempos de espera).
+    """
+    return jsonify(estado_dos_pools(db.engines)), 200
+
+
+def consultas_por_rota(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Informa, para cada rota já atendida pelo worker, as médias de consultas e de tempo no banco e os comandos mais lentos.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON com as rotas, da que mais executa consultas por requisição para a que menos executa.
+    """
+    return jsonify(metricas.comandos_lentos()), 200
+
+
+def exportar_metricas() -> Response:
+    """Exporta as métricas das requisições, dos pools de conexões, do cache dos tokens JWT e da fila do pool de senhas
+    do worker no formato de texto do Prometheus.
+
+    Returns:
+        Response: Resposta em texto com as métricas.
+    """
+    return Response(metricas.exportar(estado_dos_pools(db.engines), {"tokens": tokens_cache.metricas()}, verificador_senhas.metricas()), mimetype="text/plain; version=0.0.4")
@@ -6,9 +6,13 @@ Ele interage com o modelo `Turma` para realizar operações CRUD e valida os dad
 """
 
 from flask import request, jsonify
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from ..models import Turma, Calendario, Sala
 from app.utils.validators import validar_turma
+from app.utils.agenda_helpers import montar_horarios, eh_conflito_de_horario
+from app.utils.stream_helpers import pediu_ndjson, consultar_em_lotes, transmitir_ndjson
 
 
 def cadastrar_turma(current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -54,6 +58,9 @@ def cadastrar_turma(current_user_cpf: str, current_user_role: str) -> jsonify:
 def listar_turmas(current_user_cpf: str, current_user_role: str) -> jsonify:
     """Lista todas as turmas cadastradas no banco de dados.
 
+    Com `Accept: application/x-ndjson` ou `?stream=1`, a listagem é transmitida em NDJSON (um objeto por linha),
+    lendo o banco em lotes.
+
     Args:
         current_user_cpf (str): O cpf do usuário autenticado.
         current_user_role (str): O role do usuário autenticado.
@@ -61,8 +68,14 @@ def listar_turmas(current_user_cpf: str, current_user_role: str) -> jsonify:
     Returns:
         jsonify: Resposta JSON contendo uma lista de turmas com seus respectivos dados.
     """
+    def serializar(turma):
+        return {"id": turma.id, "ano": turma.ano, "serie": turma.serie, "nivel_de_ensino": turma.nivel_de_ensino, "turno": turma.turno, "status": turma.status, "sala_numero": turma.sala_numero, "calendario_ano_letivo": turma.calendario_ano_letivo}
+
+    if pediu_ndjson():
+        return transmitir_ndjson(consultar_em_lotes(select(Turma).order_by(Turma.id)).scalars(), serializar)
+
     turmas = Turma.query.all()
-    return jsonify([{"id": turma.id, "ano": turma.ano, "serie": turma.serie, "nivel_de_ensino": turma.nivel_de_ensino, "turno": turma.turno, "status": turma.status, "sala_numero": turma.sala_numero, "calendario_ano_letivo": turma.calendario_ano_letivo} for turma in turmas]), 200
+    return jsonify([serializar(turma) for turma in turmas]), 200
 
 
 def buscar_turma(id: int, current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -120,6 +133,8 @@ def alterar_turma(id: int, current_user_cpf: str, current_user_role: str) -> jso
     if sala_existente is None:
         return jsonify({"erro": ["Sala não existe"]}), 400
 
+    ano_letivo_anterior = turma.calendario_ano_letivo
+
     turma.ano = data['ano']
     turma.serie = data['serie']
     turma.nivel_de_ensino = data['nivel_de_ensino']
@@ -127,7 +142,19 @@ def alterar_turma(id: int, current_user_cpf: str, current_user_role: str) -> jso
     turma.status = data['status']
     turma.sala_numero = data['sala_numero']
     turma.calendario_ano_letivo = data['calendario_ano_letivo']
-    db.session.commit()
+
+    # os horários das aulas ficam na semana de referência do ano letivo, e passam a ser comparados com os do novo ano
+    if turma.calendario_ano_letivo != ano_letivo_anterior:
+        for aula in turma.aulas:
+            aula.horarios = montar_horarios(aula.dias_da_semana, aula.hora_inicio, aula.hora_fim, turma.calendario_ano_letivo, turma.id, aula.usuario_id)
+
+    try:
+        db.session.commit()
+    except IntegrityError as erro:
+        db.session.rollback()
+        if not eh_conflito_de_horario(erro):
+            raise
+        return jsonify({"erro": ["Os professores da turma já têm aulas no mesmo horário no novo ano letivo"]}), 400
 
     return jsonify({"mensagem": "Turma atualizada com sucesso!", "data": {"id": turma.id, "ano": turma.ano, "serie": turma.serie, "nivel_de_ensino": turma.nivel_de_ensino, "turno": turma.turno, "status": turma.status, "sala_numero": turma.sala_numero, "calendario_ano_letivo": turma.calendario_ano_letivo}}), 200
 
@@ -6,11 +6,68 @@ Ele interage com o modelo `Usuário` para realizar operações CRUD e valida os
 """
 
 from flask import request, jsonify
-from app.extensions import db
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload, load_only
+from app.extensions import db, usuarios_cache
 from ..models import Usuario, Disciplina, Cargo
 from app.utils.validators import validar_usuario
 from app.utils.usuario_helpers import gerar_hashing
 from app.utils.date_helpers import string_para_data
+from app.utils.paginacao_helpers import ler_paginacao, ler_campos, definir_cursor
+from app.utils.stream_helpers import pediu_ndjson, consultar_em_lotes, transmitir_ndjson
+
+
+CAMPOS_USUARIO = ["id", "cpf", "nome", "email", "telefone", "endereco", "horario_de_trabalho", "data_de_nascimento", "tipo", "formacao", "escolaridade", "habilidades", "disciplinas", "cargos"]
+RELACIONAMENTOS_USUARIO = ("disciplinas", "cargos")
+
+
+def opcoes_de_carregamento(campos: list) -> list:
+    """Monta as opções de carregamento de uma consulta de usuários que serão serializados com os campos informados.
+
+    Apenas as colunas pedidas (e o id) são lidas, e cada relacionamento pedido é carregado com `selectinload`,
+    em uma única consulta para todos os usuários do resultado.
+
+    Args:
+        campos (list): Os campos que serão serializados (ver `CAMPOS_USUARIO`).
+
+    Returns:
+        list: As opções a serem passadas para `Select.options`.
+    """
+    colunas = [getattr(Usuario, campo) for campo in campos if campo not in RELACIONAMENTOS_USUARIO]
+    opcoes = [load_only(Usuario.id, *colunas)]
+
+    if "disciplinas" in campos:
+        opcoes.append(selectinload(Usuario.disciplinas).load_only(Disciplina.codigo, Disciplina.nome))
+    if "cargos" in campos:
+        opcoes.append(selectinload(Usuario.cargos))
+
+    return opcoes
+
+
+def serializar_usuario(usuario: Usuario, campos: list = CAMPOS_USUARIO) -> dict:
+    """Serializa um usuário com os campos informados.
+
+    Os relacionamentos devem ter sido carregados pela consulta (ver `opcoes_de_carregamento`), para que a
+    serialização não faça uma consulta por usuário.
+
+    Args:
+        usuario (Usuario): O usuário a ser serializado.
+        campos (list): Os campos retornados, na ordem desejada.
+
+    Returns:
+        dict: Os dados do usuário.
+    """
+    dados = {}
+    for campo in campos:
+        if campo == "disciplinas":
+            dados[campo] = [{"codigo": disciplina.codigo, "nome": disciplina.nome} for disciplina in usuario.disciplinas]
+        elif campo == "cargos":
+            dados[campo] = [{"id": cargo.id, "nome": cargo.nome, "salario": cargo.salario, "data_contrato": cargo.data_contrato} for cargo in usuario.cargos]
+        else:
+            dados[campo] = getattr(usuario, campo)
+
+    return dados
+
 
 def cadastrar_usuario(current_user_cpf: str, current_user_role: str) -> jsonify:
     """Cadastra um novo usuário no banco de dados.
@@ -87,7 +144,19 @@ def cadastrar_usuario(current_user_cpf: str, current_user_role: str) -> jsonify:
 
 
 def listar_usuarios(current_user_cpf: str, current_user_role: str) -> jsonify:
-    """Lista todas os usuários cadastrados no banco de dados.
+    """Lista os usuários cadastrados no banco de dados, ordenados pelo id.
+
+    As disciplinas e os cargos dos usuários listados são carregados com uma consulta para cada relacionamento,
+    e não uma por usuário.
+
+    Parâmetros opcionais da requisição:
+        limite (int): Número máximo de usuários retornados. Quando informado, o cabeçalho `X-Proximo-Cursor` traz o
+            id a ser usado em `apos` para buscar a próxima página.
+        apos (int): Lista apenas os usuários com id maior que este.
+        fields (str): Campos retornados, separados por vírgula (ex: "id,nome,tipo"). Os relacionamentos que não
+            forem pedidos não são consultados.
+        stream (str): Com `stream=1` (ou `Accept: application/x-ndjson`), a listagem é transmitida em NDJSON
+            (um objeto por linha), lendo o banco em lotes.
 
     Args:
         current_user_cpf (str): O cpf do usuário autenticado.
@@ -96,8 +165,32 @@ def listar_usuarios(current_user_cpf: str, current_user_role: str) -> jsonify:
     Returns:
         jsonify: Resposta JSON contendo uma lista dos usuários com seus respectivos dados.
     """
-    usuarios = Usuario.query.all()
-    return jsonify([{"id": usuario.id, "cpf": usuario.cpf, "nome": usuario.nome, "email": usuario.email, "senha": usuario.senha, "telefone": usuario.telefone, "endereco": usuario.endereco, "horario_de_trabalho": usuario.horario_de_trabalho, "data_de_nascimento": usuario.data_de_nascimento, "tipo": usuario.tipo, "formacao": usuario.formacao, "escolaridade": usuario.escolaridade, "habilidades": usuario.habilidades, "disciplinas": [{"codigo": disciplina.codigo, "nome": disciplina.nome} for disciplina in usuario.disciplinas], "cargos": [{"nome": cargo.nome, "salario": cargo.salario, "data_contrato": cargo.data_contrato} for cargo in usuario.cargos]} for usuario in usuarios]), 200
+    limite, apos, erros = ler_paginacao(request.args)
+    campos, erros_campos = ler_campos(request.args, CAMPOS_USUARIO)
+    erros += erros_campos
+
+    if apos is not None:
+        try:
+            apos = int(apos)
+        except ValueError:
+            erros.append("O parâmetro 'apos' deve ser um número inteiro")
+
+    if erros:
+        return jsonify({"erro": erros}), 400
+
+    consulta = select(Usuario).options(*opcoes_de_carregamento(campos)).order_by(Usuario.id)
+    if apos is not None:
+        consulta = consulta.where(Usuario.id > apos)
+    if limite:
+        consulta = consulta.limit(limite)
+
+    if pediu_ndjson():
+        return transmitir_ndjson(consultar_em_lotes(consulta).scalars(), lambda usuario: serializar_usuario(usuario, campos))
+
+    usuarios = db.session.execute(consulta).scalars().all()
+
+    response = jsonify([serializar_usuario(usuario, campos) for usuario in usuarios])
+    return definir_cursor(response, len(usuarios), limite, usuarios[-1].id if usuarios else None), 200
 
 
 def buscar_usuario_por_cpf(cpf: str, current_user_cpf: str, current_user_role: str):
@@ -111,8 +204,12 @@ def buscar_usuario_por_cpf(cpf: str, current_user_cpf: str, current_user_role: s
     Returns:
         jsonify: Resposta JSON contendo os dados do usuário encontrado.
     """
-    usuario = db.session.query(Usuario).filter_by(cpf=cpf).first()
-    return jsonify({"id": usuario.id, "cpf": usuario.cpf, "nome": usuario.nome, "email": usuario.email, "senha": usuario.senha, "telefone": usuario.telefone, "endereco": usuario.endereco, "horario_de_trabalho": usuario.horario_de_trabalho, "data_de_nascimento": usuario.data_de_nascimento, "tipo": usuario.tipo, "formacao": usuario.formacao, "escolaridade": usuario.escolaridade, "habilidades": usuario.habilidades, "disciplinas": [{"codigo": disciplina.codigo, "nome": disciplina.nome} for disciplina in usuario.disciplinas], "cargos": [{"id" : cargo.id, "nome": cargo.nome, "salario": cargo.salario, "data_contrato": cargo.data_contrato} for cargo in usuario.cargos]}), 200
+    consulta = select(Usuario).options(*opcoes_de_carregamento(CAMPOS_USUARIO)).filter_by(cpf=cpf)
+    usuario = db.session.execute(consulta).scalar_one_or_none()
+    if usuario is None:
+        return jsonify({"erro": ["Usuário não encontrado"]}), 404
+
+    return jsonify(serializar_usuario(usuario)), 200
 
 
 def buscar_usuario_por_id(id: int, current_user_cpf: str, current_user_role: str):
@@ -126,8 +223,12 @@ def buscar_usuario_por_id(id: int, current_user_cpf: str, current_user_role: str
     Returns:
         jsonify: Resposta JSON contendo os dados do usuário encontrado.
     """
-    usuario = db.session.get(Usuario, id)
-    return jsonify({"id": usuario.id, "cpf": usuario.cpf, "nome": usuario.nome, "email": usuario.email, "senha": usuario.senha, "telefone": usuario.telefone, "endereco": usuario.endereco, "horario_de_trabalho": usuario.horario_de_trabalho, "data_de_nascimento": usuario.data_de_nascimento, "tipo": usuario.tipo, "formacao": usuario.formacao, "escolaridade": usuario.escolaridade, "habilidades": usuario.habilidades, "disciplinas": [{"codigo": disciplina.codigo, "nome": disciplina.nome} for disciplina in usuario.disciplinas], "cargos": [{"id" : cargo.id, "nome": cargo.nome, "salario": cargo.salario, "data_contrato": cargo.data_contrato} for cargo in usuario.cargos]}), 200
+    consulta = select(Usuario).options(*opcoes_de_carregamento(CAMPOS_USUARIO)).filter_by(id=id)
+    usuario = db.session.execute(consulta).scalar_one_or_none()
+    if usuario is None:
+        return jsonify({"erro": ["Usuário não encontrado"]}), 404
+
+    return jsonify(serializar_usuario(usuario)), 200
 
 
 def alterar_usuario(id: int, current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -237,6 +338,9 @@ def alterar_usuario(id: int, current_user_cpf: str, current_user_role: str) -> j
     
     db.session.commit()
 
+    # descarta os dados do usuário guardados pelo middleware de autenticação
+    usuarios_cache.invalidar(usuario.cpf)
+
     return jsonify({"mensagem": "Usuário atualizado com sucesso!", "data": {"id": usuario.id, "cpf": usuario.cpf, "nome": usuario.nome, "email": usuario.email, "senha": usuario.senha, "telefone": usuario.telefone, "endereco": usuario.endereco, "horario_de_trabalho": usuario.horario_de_trabalho, "data_de_nascimento": usuario.data_de_nascimento, "tipo": usuario.tipo, "formacao": usuario.formacao, "escolaridade": usuario.escolaridade, "habilidades": usuario.habilidades, "disciplinas": [d.codigo for d in usuario.disciplinas], "cargos": [{"nome": c.nome, "salario": c.salario, "data_contrato": c.data_contrato} for c in usuario.cargos]}}), 200
 
 
@@ -255,4 +359,6 @@ def remover_usuario(id: int, current_user_cpf: str, current_user_role: str) -> j
     
     db.session.delete(usuario)
     db.session.commit()
+
+    usuarios_cache.invalidar(usuario.cpf)
     return jsonify({"mensagem": "Usuário deletado com sucesso!"}), 200
\ No newline at end of file
@@ -1,3 +1,17 @@
 from flask_sqlalchemy import SQLAlchemy
+from flask_migrate import Migrate
+from .utils.pdf_helpers import RenderizadorPDF, CachePDF
+from .utils.cache_helpers import CacheLRU
+from .utils.replica_helpers import SessaoRoteada
+from .utils.async_db_helpers import BancoAssincrono
+from .utils.metricas_helpers import MetricasRequisicoes
 
-db = SQLAlchemy()
\ No newline at end of file
+db = SQLAlchemy(session_options={"class_": SessaoRoteada})
+migrate = Migrate()
+pdf_renderer = RenderizadorPDF()
+pdf_cache = CachePDF(pdf_renderer)
+estatisticas_cache = CacheLRU()
+usuarios_cache = CacheLRU()
+tokens_cache = CacheLRU()
+banco_assincrono = BancoAssincrono()
+metricas = MetricasRequisicoes()
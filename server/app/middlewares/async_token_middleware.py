@@ -0,0 +1,75 @@
+from functools import wraps
+from flask import g
+from sqlalchemy import select
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from ..utils.login_helpers import validar_token
+from ..utils.asgi_helpers import responder
+from app.extensions import banco_assincrono, usuarios_cache
+from ..models import Usuario
+import jwt
+
+
+async def carregar_usuario_assincrono(sessao, cpf: str, emitido_em) -> dict | None:
+    """Versão assíncrona de `carregar_usuario`, que usa o mesmo cache dos usuários autenticados.
+
+    Args:
+        sessao (AsyncSession): A sessão assíncrona da requisição.
+        cpf (str): O CPF do usuário autenticado.
+        emitido_em (int | None): A data de emissão do token (`iat`).
+
+    Returns:
+        dict | None: Os dados do usuário ({"id", "cpf", "nome", "tipo"}), ou `None` se ele não existir.
+    """
+    chave = (cpf, emitido_em)
+
+    usuario = usuarios_cache.obter(chave)
+    if usuario is None:
+        linha = (await sessao.execute(
+            select(Usuario.id, Usuario.cpf, Usuario.nome, Usuario.tipo).filter_by(cpf=cpf)
+        )).first()
+        if linha is None:
+            return None
+
+        usuario = dict(linha._mapping)
+        usuarios_cache.definir(chave, usuario, etiquetas=[cpf])
+
+    return usuario
+
+
+def token_required_async(f):
+    """Versão assíncrona de `token_required`, para as rotas do modo ASGI.
+
+    A rota é executada dentro de um contexto da aplicação Flask e recebe, além da requisição, uma sessão assíncrona
+    aberta apenas durante a requisição. Se todas as conexões do pool estiverem em uso além do `pool_timeout`, a
+    resposta é 503.
+    """
+    @wraps(f)
+    async def decorated(request):
+        with request.app.state.flask_app.app_context():
+            token = request.cookies.get("auth_token")
+
+            if not token:
+                return responder({"erro": "Token de autenticação ausente"}, 401)
+
+            try:
+                payload = validar_token(token)
+                if payload is None:
+                    return responder({"erro": "Token inválido"}, 401)
+
+                current_user_cpf = payload["usuario_cpf"]
+                current_user_role = payload["role"]
+
+            except jwt.ExpiredSignatureError:
+                return responder({"erro": "Token expirado"}, 401)
+            except jwt.InvalidTokenError:
+                return responder({"erro": "Token inválido"}, 401)
+
+            try:
+                async with banco_assincrono.sessao() as sessao:
+                    g.usuario = await carregar_usuario_assincrono(sessao, current_user_cpf, payload.get("iat"))
+
+                    return await f(request, sessao, **request.path_params, current_user_cpf=current_user_cpf, current_user_role=current_user_role)
+            except PoolTimeoutError:
+                return responder({"erro": "Muitos acessos simultâneos, tente novamente em instantes"}, 503, {"Retry-After": "1"})
+
+    return decorated
@@ -1,9 +1,42 @@
 from functools import wraps
-from flask import request, jsonify
+from flask import request, jsonify, g
+from sqlalchemy import select
 from ..utils.login_helpers import validar_token
+from app.extensions import db, usuarios_cache
+from ..models import Usuario
 import jwt
 from flask import current_app
 
+
+def carregar_usuario(cpf: str, emitido_em) -> dict | None:
+    """Busca os dados do usuário autenticado, consultando o banco apenas quando eles não estão no cache.
+
+    O cache é indexado pelo CPF e pela data de emissão do token, e cada item é associado ao CPF, para que
+    `alterar_usuario` e `remover_usuario` possam descartá-lo. Usuários inexistentes não são guardados.
+
+    Args:
+        cpf (str): O CPF do usuário autenticado.
+        emitido_em (int | None): A data de emissão do token (`iat`).
+
+    Returns:
+        dict | None: Os dados do usuário ({"id", "cpf", "nome", "tipo"}), ou `None` se ele não existir.
+    """
+    chave = (cpf, emitido_em)
+
+    usuario = usuarios_cache.obter(chave)
+    if usuario is None:
+        linha = db.session.execute(
+            select(Usuario.id, Usuario.cpf, Usuario.nome, Usuario.tipo).filter_by(cpf=cpf)
+        ).first()
+        if linha is None:
+            return None
+
+        usuario = dict(linha._mapping)
+        usuarios_cache.definir(chave, usuario, etiquetas=[cpf])
+
+    return usuario
+
+
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
@@ -17,18 +50,23 @@ def token_required(f):
 
         try:
             payload = validar_token(token)
+            if payload is None:
+                return jsonify({"erro": "Token inválido"}), 401
 
             current_user_cpf = payload["usuario_cpf"]
             current_user_role = payload["role"]
 
             kwargs["current_user_cpf"] = current_user_cpf
             kwargs["current_user_role"] = current_user_role
-        
+
         except jwt.ExpiredSignatureError:
             return jsonify({"erro": "Token expirado"}), 401
         except jwt.InvalidTokenError:
             return jsonify({"erro": "Token inválido"}), 401
 
+        # o usuário é resolvido uma única vez por requisição, e os controladores o leem de `g.usuario`
+        g.usuario = carregar_usuario(current_user_cpf, payload.get("iat"))
+
         return f(*args, **kwargs)
 
-    return decorated
\ No newline at end of file
+    return decorated
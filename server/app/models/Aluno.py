@@ -12,9 +12,15 @@ from app.extensions import db
 aluno_turma = db.Table(
     'aluno_turma',
     db.Column('aluno_matricula', db.String(15), db.ForeignKey('aluno.matricula', ondelete='CASCADE', onupdate = 'CASCADE'), primary_key=True),
-    db.Column('turma_id', db.Integer, db.ForeignKey('turma.id', ondelete='CASCADE', onupdate = 'CASCADE'), primary_key=True)
+    db.Column('turma_id', db.Integer, db.ForeignKey('turma.id', ondelete='CASCADE', onupdate = 'CASCADE'), primary_key=True),
+    # a chave primária começa pela matrícula, então as buscas pelos alunos de uma turma precisam do próprio índice
+    db.Index('ix_aluno_turma_turma_id', 'turma_id')
 )
 
+# Números das matrículas, reservados pelo banco para que cadastros simultâneos nunca recebam a mesma matrícula. O limite
+# é o maior número de 5 dígitos do formato da matrícula: ao alcançá-lo, a reserva falha em vez de gerar uma matrícula maior
+matricula_seq = db.Sequence('aluno_matricula_seq', maxvalue=99999, metadata=db.metadata)
+
 
 class Aluno (db.Model):
     """Classe que representa a entidade Aluno no banco de dados.
@@ -20,8 +20,16 @@ class Aula (db.Model):
         usuario_id (str): O cpf do professor que ministra a aula (máximo de 20 caracteres).
         disciplina_codigo (str): O código da discplina referente a aula (máximo de 10 caracteres).
         turma_id (int): O id da turma referente a aula (Número inteiro positivo).
+        versao_notas (int): O número de cadastros e alterações de notas da aula (versão das estatísticas em cache).
         boletins (ralationship): Relacionamento com a entidade Boletim. Cada aula deve ter um boletim (pertencente a um aluno) associado a ela.
+        horarios (relationship): Relacionamento com a entidade HorarioAula. Cada aula ocupa um período em cada dia da semana em que acontece.
     """
+    # o índice de (turma_id, disciplina_codigo) também atende as buscas só pelas aulas de uma turma
+    __table_args__ = (
+        db.Index("ix_aula_usuario_id", "usuario_id"),
+        db.Index("ix_aula_turma_id_disciplina_codigo", "turma_id", "disciplina_codigo"),
+    )
+
     id = db.Column(db.Integer, primary_key=True, autoincrement=True, doc="O id da aula (Chave primária) (Autoincrementa-se).")
     hora_inicio = db.Column(db.Time, nullable=False, doc="O horário de início da aula (Deve ser no formato 'HH:MM', em que HH representa as horas e MM representa os minutos).")
     hora_fim = db.Column(db.Time, nullable=False, doc="O horário de fim da aula (Deve ser no formato 'HH:MM', em que HH representa as horas e MM representa os minutos).")
@@ -29,5 +37,7 @@ class Aula (db.Model):
     usuario_id = db.Column(db.Integer, db.ForeignKey('usuario.id', ondelete = 'CASCADE', onupdate = 'CASCADE'), nullable=False, doc="O cpf do professor que ministra a aula (máximo de 20 caracteres).")
     disciplina_codigo = db.Column(db.String(10), db.ForeignKey('disciplina.codigo', ondelete = 'CASCADE', onupdate = 'CASCADE'), nullable=False, doc="O código da discplina referente a aula (máximo de 10 caracteres).")
     turma_id = db.Column(db.Integer, db.ForeignKey('turma.id', ondelete = 'CASCADE', onupdate = 'CASCADE'), nullable=False, doc="O id da turma referente a aula (Número inteiro positivo).")
+    versao_notas = db.Column(db.Integer, nullable=False, default=0, server_default="0", doc="O número de cadastros e alterações de notas da aula (versão das estatísticas em cache).")
 
-    boletins = db.relationship('Boletim', back_populates='aula', cascade = 'all, delete', doc="Relacionamento com a entidade Boletim. Cada aula deve ter um boletim (pertencente a um aluno) associado a ela.")
\ No newline at end of file
+    boletins = db.relationship('Boletim', back_populates='aula', cascade = 'all, delete', doc="Relacionamento com a entidade Boletim. Cada aula deve ter um boletim (pertencente a um aluno) associado a ela.")
+    horarios = db.relationship('HorarioAula', cascade='all, delete-orphan', passive_deletes=True, doc="Relacionamento com a entidade HorarioAula. Cada aula ocupa um período em cada dia da semana em que acontece.")
\ No newline at end of file
@@ -18,12 +18,21 @@ class Boletim(db.Model):
         notas (float): As notas relacionadas ao aluno.
         ausencias (int): As ausências de um aluno.
         situacao (str): A situação do aluno (Caractér único).
+        quantidade_notas (int): O número de notas cadastradas (calculado pelo banco a partir de `notas`).
+        media (float): A média das quatro unidades, ou nulo enquanto alguma nota não foi cadastrada (calculada pelo banco a partir de `notas`).
     """
+    # a chave primária começa pela matrícula, então as buscas pelos boletins de uma aula precisam do próprio índice
+    __table_args__ = (
+        db.Index("ix_boletim_aula_id", "aula_id"),
+    )
+
     aluno_matricula = db.Column('aluno_matricula', db.String, db.ForeignKey('aluno.matricula', ondelete = 'CASCADE', onupdate = 'CASCADE'), primary_key=True)
     aula_id = db.Column('aula_id', db.Integer, db.ForeignKey('aula.id', ondelete = 'CASCADE', onupdate = 'CASCADE'), primary_key=True)
     notas = db.Column(ARRAY(db.Float), nullable=False)
     ausencias = db.Column(db.Integer, default=0)
     situacao = db.Column(db.CHAR(1), default="M") # M = matriculado, A = aprovado, R = reprovado
+    quantidade_notas = db.Column(db.Integer, db.Computed("cardinality(notas)", persisted=True))
+    media = db.Column(db.Float, db.Computed("CASE WHEN cardinality(notas) >= 4 THEN (notas[1] + notas[2] + notas[3] + notas[4]) / 4 END", persisted=True))
 
     aluno = db.relationship('Aluno', back_populates='boletins')
     aula = db.relationship('Aula', back_populates='boletins', cascade = 'all, delete')
\ No newline at end of file
@@ -0,0 +1,38 @@
+"""
+Módulo de Modelo da Entidade Horário de Aula.
+
+Este módulo define a classe `HorarioAula`, que guarda o período ocupado por uma aula em cada dia da semana em que ela
+acontece. As restrições de exclusão da tabela impedem, no próprio banco de dados, que duas aulas da mesma turma ou do
+mesmo professor ocupem períodos que se sobrepõem.
+"""
+
+from app.extensions import db
+from sqlalchemy.dialects.postgresql import TSRANGE, ExcludeConstraint
+
+
+class HorarioAula(db.Model):
+    """Classe que representa o horário de uma aula em um dia da semana.
+
+    O período é um intervalo `[início, fim)` em uma semana de referência do ano letivo da turma (a primeira semana
+    iniciada em uma segunda-feira no ano), para que as aulas de anos letivos diferentes nunca se sobreponham. Como o
+    `btree_gist` nem sempre está disponível, a igualdade da turma e do professor é comparada como a sobreposição dos
+    intervalos `int4range(id, id, '[]')`, que usa apenas os operadores nativos do GiST.
+
+    Atributos:
+        aula_id (int): O id da aula (chave estrangeira de `Aula`(id)).
+        dia_da_semana (str): O dia da semana do horário (máximo de 7 caracteres).
+        turma_id (int): O id da turma da aula (cópia de `Aula`(turma_id)).
+        usuario_id (int): O id do professor da aula (cópia de `Aula`(usuario_id)).
+        periodo (tsrange): O período ocupado pela aula na semana de referência do ano letivo.
+    """
+    __tablename__ = "horario_aula"
+    __table_args__ = (
+        ExcludeConstraint((db.text("int4range(turma_id, turma_id, '[]')"), "&&"), ("periodo", "&&"), name="ex_horario_aula_turma", using="gist"),
+        ExcludeConstraint((db.text("int4range(usuario_id, usuario_id, '[]')"), "&&"), ("periodo", "&&"), name="ex_horario_aula_professor", using="gist"),
+    )
+
+    aula_id = db.Column(db.Integer, db.ForeignKey('aula.id', ondelete='CASCADE', onupdate='CASCADE'), primary_key=True, doc="O id da aula (chave estrangeira de `Aula`(id)).")
+    dia_da_semana = db.Column(db.String(7), primary_key=True, doc="O dia da semana do horário (máximo de 7 caracteres).")
+    turma_id = db.Column(db.Integer, nullable=False, doc="O id da turma da aula (cópia de `Aula`(turma_id)).")
+    usuario_id = db.Column(db.Integer, nullable=False, doc="O id do professor da aula (cópia de `Aula`(usuario_id)).")
+    periodo = db.Column(TSRANGE, nullable=False, doc="O período ocupado pela aula na semana de referência do ano letivo.")
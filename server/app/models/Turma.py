@@ -22,6 +22,11 @@ class Turma(db.Model):
         calendario_ano_letivo (int): O ano letivo do calendário da turma (chave estrangeira de `Calendario`(ano_letivo)).
         aulas (relatioship): Relacionamento com a entidade Aula. Cada turma deve ter uma ou várias aulas associadas. 
     """
+    # usado na verificação de conflito de sala, turno e ano letivo ao cadastrar ou alterar uma turma
+    __table_args__ = (
+        db.Index("ix_turma_sala_numero_calendario_ano_letivo_turno", "sala_numero", "calendario_ano_letivo", "turno"),
+    )
+
     id = db.Column(db.Integer, primary_key = True, autoincrement = True, doc="Id da turma (Chave primária) (Autoincrementa-se).")
     ano = db.Column(db.Integer, nullable = False, doc="Ano da turma (Número inteiro positivo).")
     serie = db.Column(db.CHAR(1), nullable = False, doc="A série da turma (Carácter único).")
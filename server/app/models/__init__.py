@@ -5,5 +5,6 @@ from .Disciplina import Disciplina
 from .Cargo import Cargo
 from .Calendario import Calendario
 from .Boletim import Boletim
-from .Aluno import Aluno, aluno_turma
-from .Aula import Aula
\ No newline at end of file
+from .Aluno import Aluno, aluno_turma, matricula_seq
+from .Aula import Aula
+from .HorarioAula import HorarioAula
\ No newline at end of file
@@ -31,6 +31,23 @@ def cadastrar_aluno(current_user_cpf: str, current_user_role: str) -> jsonify:
     return aluno_controller.cadastrar_aluno(current_user_cpf, current_user_role)
 
 
+@aluno_bp.route("/importar", methods=['POST'])
+@token_required
+def importar_alunos(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Rota para cadastrar e matricular vários alunos de uma só vez.
+
+    Esta rota recebe os alunos como uma lista JSON ou como CSV e chama o controlador para realizar a importação.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo uma mensagem, as matrículas dos alunos cadastrados e o número de boletins criados.
+    """
+    return aluno_controller.importar_alunos(current_user_cpf, current_user_role)
+
+
 @aluno_bp.route("/matricula", methods=['POST'])
 @token_required
 def matricular_aluno(current_user_cpf: str, current_user_role: str) -> jsonify:
@@ -0,0 +1,50 @@
+"""
+Módulo de Rotas Assíncronas.
+
+Este módulo define as rotas de leitura atendidas de forma assíncrona no modo ASGI. Os caminhos são os mesmos das rotas
+dos blueprints `boletim`, `notas` e `ausencias`, que continuam atendendo as demais operações.
+Ele utiliza as rotas do Starlette e delega a lógica de negócio ao módulo `leituras_async_controller`.
+"""
+
+from starlette.routing import Route
+from ..controllers import leituras_async_controller
+from ..middlewares.async_token_middleware import token_required_async
+
+
+@token_required_async
+async def listar_aulas_professor(request, sessao, current_user_cpf: str, current_user_role: str):
+    """Rota assíncrona para listar as aulas do professor autenticado (GET /boletim/)."""
+    return await leituras_async_controller.listar_aulas_professor(sessao, current_user_cpf, current_user_role)
+
+
+@token_required_async
+async def buscar_notas_aula(request, sessao, aula_id: int, current_user_cpf: str, current_user_role: str):
+    """Rota assíncrona para buscar os alunos de uma aula (GET /notas/<aula_id>)."""
+    return await leituras_async_controller.buscar_notas_aula(sessao, aula_id, current_user_cpf, current_user_role)
+
+
+@token_required_async
+async def buscar_notas_aluno(request, sessao, aluno_matricula: str, aula_id: int, current_user_cpf: str, current_user_role: str):
+    """Rota assíncrona para buscar as notas de um aluno em uma aula (GET /notas/<aluno_matricula>/<aula_id>)."""
+    return await leituras_async_controller.buscar_notas_aluno(sessao, aluno_matricula, aula_id, current_user_cpf, current_user_role)
+
+
+@token_required_async
+async def buscar_ausencias_aula(request, sessao, aula_id: int, current_user_cpf: str, current_user_role: str):
+    """Rota assíncrona para buscar os alunos de uma aula (GET /ausencias/<aula_id>)."""
+    return await leituras_async_controller.buscar_ausencias_aula(sessao, aula_id, current_user_cpf, current_user_role)
+
+
+@token_required_async
+async def buscar_ausencias_aluno(request, sessao, aula_id: int, aluno_matricula: str, current_user_cpf: str, current_user_role: str):
+    """Rota assíncrona para buscar as ausências de um aluno em uma aula (GET /ausencias/<aula_id>/<aluno_matricula>)."""
+    return await leituras_async_controller.buscar_ausencias_aluno(sessao, aluno_matricula, aula_id, current_user_cpf, current_user_role)
+
+
+rotas_assincronas = [
+    Route("/boletim/", listar_aulas_professor, methods=["GET"]),
+    Route("/notas/{aula_id:int}", buscar_notas_aula, methods=["GET"]),
+    Route("/notas/{aluno_matricula:str}/{aula_id:int}", buscar_notas_aluno, methods=["GET"]),
+    Route("/ausencias/{aula_id:int}", buscar_ausencias_aula, methods=["GET"]),
+    Route("/ausencias/{aula_id:int}/{aluno_matricula:str}", buscar_ausencias_aluno, methods=["GET"]),
+]
@@ -31,6 +31,23 @@ def cadastrar_aula(current_user_cpf: str, current_user_role: str) -> jsonify:
     return aula_controller.cadastrar_aula(current_user_cpf, current_user_role)
 
 
+@aula_bp.route("/importar", methods=['POST'])
+@token_required
+def importar_aulas(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Rota para cadastrar as aulas de uma grade horária de uma só vez.
+
+    Esta rota recebe as aulas como uma lista JSON ou como CSV e chama o controlador para realizar a importação.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo uma mensagem, os ids das aulas cadastradas e o número de boletins criados.
+    """
+    return aula_controller.importar_aulas(current_user_cpf, current_user_role)
+
+
 @aula_bp.route("/", methods=['GET'])
 @token_required
 def listar_aulas(current_user_cpf: str, current_user_role: str) -> jsonify:
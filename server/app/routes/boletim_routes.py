@@ -70,4 +70,21 @@ def gerar_historico(aluno_matricula: str, current_user_cpf: str, current_user_ro
     if request.args.get('preview'):
         return boletim_controller.buscar_historico(aluno_matricula, current_user_cpf, current_user_role)
     else:
-        return boletim_controller.gerar_historico(aluno_matricula, current_user_cpf, current_user_role)
\ No newline at end of file
+        return boletim_controller.gerar_historico(aluno_matricula, current_user_cpf, current_user_role)
+
+@boletim_bp.route("/turma/<int:turma_id>/pdf", methods=['GET'])
+@token_required
+def gerar_boletins_turma(turma_id: int, current_user_cpf: str, current_user_role: str):
+    """Rota para gerar os boletins de todos os alunos de uma turma.
+
+    Esta rota retorna um único PDF com os boletins de todos os alunos da turma, ou um arquivo .zip com um PDF por aluno quando `?formato=zip` é informado.
+
+    Args:
+        turma_id (int): O id da turma.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        PDF | ZIP: Resposta contendo os boletins da turma.
+    """
+    return boletim_controller.gerar_boletins_turma(turma_id, current_user_cpf, current_user_role)
@@ -0,0 +1,25 @@
+"""
+Módulo de Rotas para as Métricas.
+
+Este módulo define a rota `/metrics`, lida pelo Prometheus, com as métricas das requisições e dos pools de conexões.
+Ele utiliza Flask Blueprint para organizar as rotas e delega a lógica de negócio ao módulo `saude_controller`.
+"""
+
+from flask import Blueprint, Response
+from ..controllers import saude_controller
+
+# Cria um Blueprint para a rota de métricas
+metricas_bp = Blueprint("metricas", __name__)
+
+
+@metricas_bp.route("", methods=['GET'])
+def exportar_metricas() -> Response:
+    """Rota para exportar as métricas no formato de texto do Prometheus.
+
+    A rota não exige autenticação, para que possa ser lida pelo Prometheus, e não expõe os comandos SQL nem os seus
+    parâmetros. Cada worker do servidor tem as suas próprias métricas, identificadas pelo rótulo `pid`.
+
+    Returns:
+        Response: Resposta em texto com as métricas do worker que atendeu a requisição.
+    """
+    return saude_controller.exportar_metricas()
@@ -82,4 +82,36 @@ def alterar_notas(aluno_matricula: str, aula_id: int, current_user_cpf: str, cur
     Returns:
         jsonify: Resposta JSON contendo uma mensagem de confirmação de atualização das notas.
     """
-    return notas_controller.alterar_notas(aluno_matricula, aula_id, current_user_cpf, current_user_role)
\ No newline at end of file
+    return notas_controller.alterar_notas(aluno_matricula, aula_id, current_user_cpf, current_user_role)
+
+
+@notas_bp.route("/<int:aula_id>/estatisticas", methods=['GET'])
+@token_required
+def buscar_estatisticas_aula(aula_id: int, current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Rota para buscar as estatísticas das notas de uma aula específica.
+
+    Args:
+        aula_id (int): O id da aula.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo as estatísticas das notas de cada unidade e da média final.
+    """
+    return notas_controller.buscar_estatisticas_aula(aula_id, current_user_cpf, current_user_role)
+
+
+@notas_bp.route("/calendario/<int:ano_letivo>/estatisticas", methods=['GET'])
+@token_required
+def buscar_estatisticas_calendario(ano_letivo: int, current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Rota para buscar as estatísticas das notas de todas as aulas de um ano letivo.
+
+    Args:
+        ano_letivo (int): O ano letivo do calendário.
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON contendo as estatísticas das notas do ano letivo e o resumo de cada aula.
+    """
+    return notas_controller.buscar_estatisticas_calendario(ano_letivo, current_user_cpf, current_user_role)
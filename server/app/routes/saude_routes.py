@@ -0,0 +1,47 @@
+"""
+Módulo de Rotas para a Saúde do Servidor.
+
+Este módulo define as rotas que informam o estado interno do servidor.
+Ele utiliza Flask Blueprint para organizar as rotas e delega a lógica de negócio ao módulo `saude_controller`.
+"""
+
+from flask import Blueprint, jsonify
+from ..controllers import saude_controller
+from ..middlewares.token_middleware import token_required
+
+# Cria um Blueprint para as rotas de saúde
+saude_bp = Blueprint("saude", __name__)
+
+
+@saude_bp.route("/pool", methods=['GET'])
+@token_required
+def estado_pool(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Rota para consultar o estado do pool de conexões com o banco de dados.
+
+    Cada worker do servidor tem o seu próprio pool; a resposta traz o PID do worker que atendeu a requisição.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON com o estado do pool de conexões.
+    """
+    return saude_controller.estado_pool(current_user_cpf, current_user_role)
+
+
+@saude_bp.route("/consultas", methods=['GET'])
+@token_required
+def consultas_por_rota(current_user_cpf: str, current_user_role: str) -> jsonify:
+    """Rota para consultar as médias de consultas SQL e os comandos mais lentos de cada rota.
+
+    As métricas são do worker que atendeu a requisição, desde o seu início.
+
+    Args:
+        current_user_cpf (str): O cpf do usuário autenticado.
+        current_user_role (str): O role do usuário autenticado.
+
+    Returns:
+        jsonify: Resposta JSON com as métricas de cada rota.
+    """
+    return saude_controller.consultas_por_rota(current_user_cpf, current_user_role)
@@ -0,0 +1,205 @@
+"""
+Módulo de detecção de conflitos de horário entre aulas.
+
+Este módulo fornece a `AgendaDeAulas`, que guarda as aulas de um ano letivo em índices de intervalos por dia da semana
+(um por turma, um por professor e um por sala) e responde, com uma busca binária em cada índice, se um novo horário se
+sobrepõe ao de outra aula. Ele também monta os `HorarioAula`, cujas restrições de exclusão garantem no banco de dados
+que duas aulas da mesma turma ou do mesmo professor não se sobreponham, mesmo com cadastros simultâneos.
+"""
+
+from bisect import bisect_left, insort
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import select, or_
+from sqlalchemy.dialects.postgresql import Range
+from app.extensions import db
+from ..models import Aula, Turma, HorarioAula
+
+
+DIAS_DA_SEMANA = ("Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado")
+VIOLACAO_DE_EXCLUSAO = "23P01"
+
+CONFLITOS = {
+    "turma": "Já existe uma aula no mesmo horário, na mesma turma",
+    "professor": "Já existe uma aula no mesmo horário, com o mesmo professor",
+    "sala": "Já existe uma aula no mesmo horário, na mesma sala",
+}
+
+
+def ler_hora(hora) -> time:
+    """Converte uma hora no formato 'HH:MM' ou 'HH:MM:SS' para um objeto time (objetos time são retornados sem alteração)."""
+    return hora if isinstance(hora, time) else time.fromisoformat(hora)
+
+
+def semana_de_referencia(ano_letivo: int) -> date:
+    """Retorna a primeira segunda-feira do ano, que é o início da semana de referência dos horários do ano letivo."""
+    primeiro_dia = date(ano_letivo, 1, 1)
+    return primeiro_dia + timedelta(days=(7 - primeiro_dia.weekday()) % 7)
+
+
+def montar_horarios(dias_da_semana: list, hora_inicio, hora_fim, ano_letivo: int, turma_id: int, usuario_id: int) -> list:
+    """Monta os horários de uma aula, um por dia da semana, na semana de referência do ano letivo.
+
+    Args:
+        dias_da_semana (list): Os dias da semana em que a aula acontece (ex: ["Segunda", "Quarta"]).
+        hora_inicio (time | str): O horário de início da aula.
+        hora_fim (time | str): O horário de fim da aula.
+        ano_letivo (int): O ano letivo do calendário da turma.
+        turma_id (int): O id da turma da aula.
+        usuario_id (int): O id do professor da aula.
+
+    Returns:
+        list: Os `HorarioAula` da aula, a serem atribuídos a `Aula.horarios`.
+    """
+    return [
+        HorarioAula(dia_da_semana=dia, turma_id=turma_id, usuario_id=usuario_id, periodo=periodo)
+        for dia, periodo in montar_periodos(dias_da_semana, hora_inicio, hora_fim, ano_letivo)
+    ]
+
+
+def montar_periodos(dias_da_semana: list, hora_inicio, hora_fim, ano_letivo: int) -> list:
+    """Monta o período `[início, fim)` de cada dia da semana de uma aula, na semana de referência do ano letivo.
+
+    Args:
+        dias_da_semana (list): Os dias da semana em que a aula acontece (dias repetidos são ignorados).
+        hora_inicio (time | str): O horário de início da aula.
+        hora_fim (time | str): O horário de fim da aula.
+        ano_letivo (int): O ano letivo do calendário da turma.
+
+    Returns:
+        list: Tuplas (dia da semana, Range) na ordem dos dias informados.
+    """
+    semana = semana_de_referencia(ano_letivo)
+    hora_inicio, hora_fim = ler_hora(hora_inicio), ler_hora(hora_fim)
+
+    periodos = []
+    for dia in dict.fromkeys(dias_da_semana):
+        data = semana + timedelta(days=DIAS_DA_SEMANA.index(dia))
+        periodos.append((dia, Range(datetime.combine(data, hora_inicio), datetime.combine(data, hora_fim), bounds="[)")))
+
+    return periodos
+
+
+def eh_conflito_de_horario(erro) -> bool:
+    """Verifica se um `IntegrityError` foi causado pelas restrições de exclusão de `HorarioAula`."""
+    return getattr(erro.orig, "pgcode", None) == VIOLACAO_DE_EXCLUSAO
+
+
+class IndiceDeIntervalos:
+    """Intervalos `[início, fim)` de um dia, ordenados pelo início.
+
+    Junto com cada intervalo é guardado o maior fim entre ele e os anteriores, para que a busca por sobreposição seja
+    uma busca binária mesmo quando o índice já tem intervalos sobrepostos (aulas cadastradas antes da verificação).
+    """
+
+    def __init__(self):
+        self.inicios = []
+        self.intervalos = []
+        self.maiores_fins = []
+
+    def adicionar(self, inicio: time, fim: time, aula_id: int):
+        posicao = bisect_left(self.inicios, inicio)
+        self.inicios.insert(posicao, inicio)
+        self.intervalos.insert(posicao, (inicio, fim, aula_id))
+
+        # recalcula o maior fim a partir da posição inserida (os índices de um dia têm poucas aulas)
+        self.maiores_fins[posicao:] = []
+        maior_fim = self.maiores_fins[-1] if self.maiores_fins else None
+        for _, fim_intervalo, _ in self.intervalos[posicao:]:
+            maior_fim = fim_intervalo if maior_fim is None else max(maior_fim, fim_intervalo)
+            self.maiores_fins.append(maior_fim)
+
+    def sobrepoe(self, inicio: time, fim: time) -> bool:
+        """Verifica se algum intervalo do índice se sobrepõe a `[inicio, fim)`.
+
+        Os intervalos que começam antes de `fim` ocupam o início da lista, e algum deles se sobrepõe a `[inicio, fim)`
+        se o maior fim entre eles passa de `inicio`.
+        """
+        posicao = bisect_left(self.inicios, fim)
+        return posicao > 0 and self.maiores_fins[posicao - 1] > inicio
+
+
+class AgendaDeAulas:
+    """Aulas de um ano letivo, indexadas por dia da semana para cada turma, professor e sala."""
+
+    def __init__(self):
+        self._indices = {}
+
+    @classmethod
+    def carregar(cls, ano_letivo: int, turma_id: int | None = None, usuario_id: int | None = None, sala_numero: int | None = None, ignorar: int | None = None) -> "AgendaDeAulas":
+        """Carrega, em uma única consulta, as aulas do ano letivo que podem conflitar com um novo horário.
+
+        Sem filtros, são carregadas todas as aulas do ano letivo (ex: para verificar uma grade inteira).
+
+        Args:
+            ano_letivo (int): O ano letivo do calendário das turmas.
+            turma_id (int | None): Carrega as aulas desta turma.
+            usuario_id (int | None): Carrega as aulas deste professor.
+            sala_numero (int | None): Carrega as aulas das turmas desta sala.
+            ignorar (int | None): O id de uma aula a não ser carregada (ex: a aula que está sendo alterada).
+
+        Returns:
+            AgendaDeAulas: A agenda com as aulas carregadas.
+        """
+        consulta = (
+            select(Aula.id, Aula.dias_da_semana, Aula.hora_inicio, Aula.hora_fim, Aula.turma_id, Aula.usuario_id, Turma.sala_numero)
+            .join(Turma, Turma.id == Aula.turma_id)
+            .where(Turma.calendario_ano_letivo == ano_letivo)
+        )
+
+        filtros = []
+        if turma_id is not None:
+            filtros.append(Aula.turma_id == turma_id)
+        if usuario_id is not None:
+            filtros.append(Aula.usuario_id == usuario_id)
+        if sala_numero is not None:
+            filtros.append(Turma.sala_numero == sala_numero)
+        if filtros:
+            consulta = consulta.where(or_(*filtros))
+        if ignorar is not None:
+            consulta = consulta.where(Aula.id != ignorar)
+
+        agenda = cls()
+        for aula in db.session.execute(consulta):
+            agenda.adicionar(aula.id, aula.dias_da_semana, aula.hora_inicio, aula.hora_fim, aula.turma_id, aula.usuario_id, aula.sala_numero)
+
+        return agenda
+
+    def _chaves(self, turma_id: int, usuario_id: int, sala_numero: int | None):
+        yield "turma", turma_id
+        yield "professor", usuario_id
+        if sala_numero is not None:
+            yield "sala", sala_numero
+
+    def adicionar(self, aula_id: int, dias_da_semana: list, hora_inicio, hora_fim, turma_id: int, usuario_id: int, sala_numero: int | None):
+        """Adiciona uma aula aos índices da sua turma, do seu professor e da sua sala."""
+        hora_inicio, hora_fim = ler_hora(hora_inicio), ler_hora(hora_fim)
+
+        for tipo, chave in self._chaves(turma_id, usuario_id, sala_numero):
+            for dia in dias_da_semana:
+                self._indices.setdefault((tipo, chave, dia), IndiceDeIntervalos()).adicionar(hora_inicio, hora_fim, aula_id)
+
+    def conflitos(self, dias_da_semana: list, hora_inicio, hora_fim, turma_id: int, usuario_id: int, sala_numero: int | None) -> list:
+        """Verifica se um horário se sobrepõe ao de outra aula da mesma turma, do mesmo professor ou da mesma sala.
+
+        Args:
+            dias_da_semana (list): Os dias da semana do horário.
+            hora_inicio (time | str): O horário de início.
+            hora_fim (time | str): O horário de fim.
+            turma_id (int): O id da turma.
+            usuario_id (int): O id do professor.
+            sala_numero (int | None): O número da sala da turma.
+
+        Returns:
+            list: As mensagens de erro dos conflitos encontrados (vazia se o horário está livre).
+        """
+        hora_inicio, hora_fim = ler_hora(hora_inicio), ler_hora(hora_fim)
+
+        erros = []
+        for tipo, chave in self._chaves(turma_id, usuario_id, sala_numero):
+            for dia in dias_da_semana:
+                indice = self._indices.get((tipo, chave, dia))
+                if indice is not None and indice.sobrepoe(hora_inicio, hora_fim):
+                    erros.append(CONFLITOS[tipo])
+                    break
+
+        return erros
@@ -0,0 +1,24 @@
+"""
+Módulo de funções auxiliares das rotas assíncronas do modo ASGI.
+"""
+
+from flask import current_app
+from starlette.responses import Response
+
+
+def responder(dados, status: int = 200, headers: dict | None = None) -> Response:
+    """Monta uma resposta JSON com o mesmo formato das respostas do Flask (`jsonify`).
+
+    O JSON é gerado pelo JSON provider da aplicação Flask atual, para que as datas, a ordem das chaves e a
+    formatação sejam iguais nos dois modos.
+
+    Args:
+        dados (dict | list): Os dados da resposta.
+        status (int): O status code da resposta.
+        headers (dict | None): Cabeçalhos adicionais da resposta.
+
+    Returns:
+        Response: A resposta JSON.
+    """
+    resposta = current_app.json.response(dados)
+    return Response(resposta.get_data(), status_code=status, headers=headers, media_type=resposta.mimetype)
@@ -0,0 +1,88 @@
+"""
+Módulo do banco de dados assíncrono usado no modo ASGI.
+
+Este módulo fornece o `BancoAssincrono`, que cria, a partir da configuração da aplicação Flask, um engine assíncrono
+do SQLAlchemy (driver asyncpg) com o mesmo banco e o mesmo tamanho de pool do engine síncrono. No modo ASGI, o número
+de leituras atendidas ao mesmo tempo é limitado pelas conexões desse pool, e não pelo número de threads.
+"""
+
+import os
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from .pool_helpers import PREFIXO_APLICACAO
+
+
+OPCOES_DO_POOL = ("pool_size", "max_overflow", "pool_timeout", "pool_recycle", "pool_pre_ping")
+
+
+def montar_uri_assincrona(uri: str) -> str:
+    """Converte a URI do banco de dados para o driver asyncpg.
+
+    Args:
+        uri (str): A URI do banco de dados (ex: "postgresql+psycopg2://...?client_encoding=utf8").
+
+    Returns:
+        str: A mesma URI com o driver asyncpg, sem o `client_encoding` (o asyncpg sempre usa UTF-8).
+    """
+    url = make_url(uri).set(drivername="postgresql+asyncpg").difference_update_query(["client_encoding"])
+    return url.render_as_string(hide_password=False)
+
+
+def montar_opcoes_engine_assincrono(config) -> dict:
+    """Monta as opções do engine assíncrono a partir da configuração da aplicação.
+
+    Args:
+        config (Config): A configuração da aplicação Flask.
+
+    Returns:
+        dict: As opções do pool de `SQLALCHEMY_ENGINE_OPTIONS` e os parâmetros de conexão do asyncpg.
+    """
+    opcoes = {
+        chave: valor for chave, valor in config.get("SQLALCHEMY_ENGINE_OPTIONS", {}).items()
+        if chave in OPCOES_DO_POOL
+    }
+
+    parametros = {"application_name": f"{PREFIXO_APLICACAO}:{os.getpid()}"}
+    if config.get("DB_STATEMENT_TIMEOUT_MS"):
+        parametros["statement_timeout"] = str(config["DB_STATEMENT_TIMEOUT_MS"])
+    opcoes["connect_args"] = {"server_settings": parametros}
+
+    return opcoes
+
+
+class BancoAssincrono:
+    """Engine e fábrica de sessões assíncronas de uma aplicação.
+
+    Atributos:
+        engine (AsyncEngine | None): O engine assíncrono, criado em `init_app`.
+    """
+
+    def __init__(self):
+        self.engine = None
+        self._fabrica = None
+
+    def init_app(self, app):
+        """Cria o engine assíncrono para o banco de dados da aplicação.
+
+        Args:
+            app (Flask): A aplicação Flask.
+        """
+        self.engine = create_async_engine(
+            montar_uri_assincrona(app.config["SQLALCHEMY_DATABASE_URI"]),
+            **montar_opcoes_engine_assincrono(app.config)
+        )
+        self._fabrica = async_sessionmaker(self.engine, expire_on_commit=False)
+        app.extensions["banco_assincrono"] = self
+
+    def sessao(self) -> AsyncSession:
+        """Abre uma nova sessão assíncrona, que deve ser usada com `async with`.
+
+        Returns:
+            AsyncSession: A sessão assíncrona.
+        """
+        return self._fabrica()
+
+    async def fechar(self):
+        """Fecha todas as conexões do pool assíncrono."""
+        if self.engine is not None:
+            await self.engine.dispose()
@@ -1,9 +1,14 @@
-from flask import jsonify
+from flask import jsonify, current_app
+from sqlalchemy import select, insert, cast, literal, literal_column
+from sqlalchemy.dialects.postgresql import ARRAY
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
 from io import BytesIO
+import zipfile
+from app.extensions import db
+from ..models import Aula, Boletim, aluno_turma
 
 def criar_cabecalho(titulo: str, aluno=None, turma=None, ano_letivo=None):
     """Cria um cabeçalho genérico para documentos escolares
@@ -101,6 +106,109 @@ def gerar_pdf_boletim(aluno, turma, dados):
     buffer.seek(0)
     return buffer
 
+def gerar_pdf_boletins(boletins):
+    """Gera um único PDF com vários boletins escolares (um por página)
+
+    Args:
+        boletins: Lista de tuplas (aluno, turma, dados), no mesmo formato recebido por `gerar_pdf_boletim`
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+
+    elementos = []
+    cabecalho = ["Disciplina", "1° Unid.", "2° Unid.", "3° Unid.", "4° Unid.", "Média Final","Ausências", "Situação"]
+
+    for indice, (aluno, turma, dados) in enumerate(boletins):
+        if indice > 0:
+            elementos.append(PageBreak())
+
+        elementos.extend(criar_cabecalho("BOLETIM ESCOLAR", aluno, turma))
+        elementos.append(criar_tabela_dados(cabecalho, dados))
+
+    doc.build(elementos)
+
+    buffer.seek(0)
+    return buffer
+
+def montar_linha_boletim(disciplina_nome: str, boletim) -> list:
+    """Monta a linha de uma disciplina na tabela do boletim
+
+    Args:
+        disciplina_nome (str): Nome da disciplina da aula
+        boletim: Objeto boletim com notas, ausências e situação
+
+    Returns:
+        list: [disciplina, 1° unid., 2° unid., 3° unid., 4° unid., média, ausências, situação]
+    """
+    # A quantidade de notas e a média são mantidas pelo banco a cada escrita em `notas`
+    quantidade_notas = min(boletim.quantidade_notas or 0, 4)
+    notas_formatadas = [f"{n:.1f}" for n in boletim.notas[:quantidade_notas]] + ["---"] * (4 - quantidade_notas)
+    media_formatada = f"{boletim.media:.1f}" if boletim.media is not None else "---"
+
+    situacao = {"A": "Aprovado", "R": "Reprovado", "M": "Cursando"}.get(boletim.situacao, "Cursando")
+
+    return [
+        disciplina_nome,
+        *notas_formatadas,
+        media_formatada,
+        str(boletim.ausencias),
+        situacao
+    ]
+
+class _SaidaEmPartes:
+    """Destino de escrita não posicionável usado para transmitir um arquivo .zip enquanto ele é montado"""
+
+    def __init__(self):
+        self.partes = []
+
+    def write(self, dados):
+        self.partes.append(bytes(dados))
+        return len(dados)
+
+    def flush(self):
+        pass
+
+    def esvaziar(self) -> bytes:
+        dados = b"".join(self.partes)
+        self.partes.clear()
+        return dados
+
+def gerar_zip_boletins(arquivos):
+    """Gera, sob demanda, um arquivo .zip com os PDFs de boletim informados
+
+    Cada PDF é compactado e enviado assim que fica pronto, sem manter o arquivo inteiro em memória.
+
+    Args:
+        arquivos: Iterável de tuplas (nome do arquivo, conteúdo do PDF em bytes)
+
+    Yields:
+        bytes: Partes do arquivo .zip, na ordem em que devem ser enviadas
+    """
+    saida = _SaidaEmPartes()
+
+    with zipfile.ZipFile(saida, mode="w", compression=zipfile.ZIP_DEFLATED) as arquivo:
+        for nome, conteudo in arquivos:
+            arquivo.writestr(nome, conteudo)
+
+            yield saida.esvaziar()
+
+    yield saida.esvaziar()
+
+def registrar_vazao_boletins(turma_id: int, quantidade_alunos: int, duracao: float) -> float:
+    """Registra no log a vazão da geração de boletins de uma turma
+
+    Args:
+        turma_id (int): O id da turma
+        quantidade_alunos (int): A quantidade de boletins gerados
+        duracao (float): O tempo de geração, em segundos
+
+    Returns:
+        float: A vazão da geração, em alunos por segundo
+    """
+    alunos_por_segundo = quantidade_alunos / duracao if duracao > 0 else float(quantidade_alunos)
+    current_app.logger.info("Boletins da turma %s: %d alunos em %.2fs (%.1f alunos/s)", turma_id, quantidade_alunos, duracao, alunos_por_segundo)
+    return alunos_por_segundo
+
 def gerar_pdf_historico(aluno, turmas):
     """Gera um histórico escolar com múltiplas tabelas (uma por turma)"""
     buffer = BytesIO()
@@ -126,4 +234,27 @@ def gerar_pdf_historico(aluno, turmas):
     
     doc.build(elementos)
     buffer.seek(0)
-    return buffer
\ No newline at end of file
+    return buffer
+
+
+def criar_boletins(*filtros) -> int:
+    """Cria, com um único `INSERT ... SELECT` a partir de `aluno_turma`, um boletim para cada aluno em cada aula da sua turma.
+
+    Os filtros escolhem os pares de aluno e aula (ex: `Aula.id.in_(ids)` para aulas recém-cadastradas, ou
+    `aluno_turma.c.aluno_matricula.in_(matriculas)` para alunos recém-matriculados), que ainda não devem ter boletim.
+
+    Args:
+        *filtros: Condições sobre `aluno_turma` e `Aula`.
+
+    Returns:
+        int: O número de boletins criados.
+    """
+    alunos_das_aulas = (
+        select(aluno_turma.c.aluno_matricula, Aula.id, cast(literal_column("'{}'"), ARRAY(db.Float)), literal(0), literal("M"))
+        .join(Aula, Aula.turma_id == aluno_turma.c.turma_id)
+        .where(*filtros)
+    )
+    resultado = db.session.execute(
+        insert(Boletim).from_select([Boletim.aluno_matricula, Boletim.aula_id, Boletim.notas, Boletim.ausencias, Boletim.situacao], alunos_das_aulas)
+    )
+    return resultado.rowcount
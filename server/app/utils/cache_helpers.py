@@ -0,0 +1,148 @@
+"""
+Módulo de cache em memória.
+
+Este módulo fornece o `CacheLRU`, um cache local ao processo, seguro para uso entre threads, com descarte dos itens
+menos usados, expiração opcional e invalidação por etiquetas (ex: a matrícula do aluno dono do item).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """Cache com capacidade máxima, descartando primeiro os itens usados há mais tempo.
+
+    Atributos:
+        capacidade (int): Número máximo de itens mantidos no cache.
+        ttl (float | None): Tempo padrão de vida dos itens, em segundos (None para não expirar).
+        acertos (int): Número de consultas que encontraram o item no cache.
+        falhas (int): Número de consultas que não encontraram o item no cache.
+    """
+
+    def __init__(self, capacidade: int = 128, ttl: float | None = None):
+        self._lock = threading.Lock()
+        self.configurar(capacidade, ttl)
+
+    def configurar(self, capacidade: int, ttl: float | None = None):
+        """Define a capacidade e o tempo de vida dos itens, esvaziando o cache.
+
+        Args:
+            capacidade (int): Número máximo de itens mantidos no cache.
+            ttl (float | None): Tempo padrão de vida dos itens, em segundos (None para não expirar).
+        """
+        with self._lock:
+            self.capacidade = capacidade
+            self.ttl = ttl
+            self.acertos = 0
+            self.falhas = 0
+            self._itens = OrderedDict()
+            self._etiquetas = {}
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    @property
+    def taxa_acerto(self) -> float:
+        """float: A proporção de consultas que encontraram o item no cache (0 quando não houve consultas)."""
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def metricas(self) -> dict:
+        """Retorna os acertos, as falhas e a taxa de acerto do cache.
+
+        Returns:
+            dict: {"acertos": int, "falhas": int, "taxa_acerto": float}.
+        """
+        with self._lock:
+            return {"acertos": self.acertos, "falhas": self.falhas, "taxa_acerto": self.taxa_acerto}
+
+    def obter(self, chave, padrao=None):
+        """Busca um item no cache.
+
+        Args:
+            chave: A chave do item.
+            padrao: O valor retornado quando o item não existe ou expirou.
+
+        Returns:
+            O valor armazenado, ou `padrao`.
+        """
+        with self._lock:
+            item = self._itens.get(chave)
+
+            if item is None or (item[1] is not None and item[1] <= time.monotonic()):
+                if item is not None:
+                    self._descartar(chave)
+                self.falhas += 1
+                return padrao
+
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            return item[0]
+
+    def definir(self, chave, valor, etiquetas=(), expira_em: float | None = None):
+        """Armazena um item no cache, descartando os menos usados se a capacidade for excedida.
+
+        Args:
+            chave: A chave do item.
+            valor: O valor a ser armazenado.
+            etiquetas (iterable): Etiquetas usadas para invalidar o item em grupo.
+            expira_em (float | None): Instante (em `time.monotonic()`) em que o item expira. Quando omitido, usa o `ttl` do cache.
+        """
+        if expira_em is None and self.ttl is not None:
+            expira_em = time.monotonic() + self.ttl
+
+        with self._lock:
+            if chave in self._itens:
+                self._descartar(chave)
+
+            self._itens[chave] = (valor, expira_em, tuple(etiquetas))
+            for etiqueta in etiquetas:
+                self._etiquetas.setdefault(etiqueta, set()).add(chave)
+
+            while len(self._itens) > self.capacidade:
+                self._descartar(next(iter(self._itens)))
+
+    def remover(self, chave):
+        """Remove um item do cache, se existir.
+
+        Args:
+            chave: A chave do item.
+        """
+        with self._lock:
+            if chave in self._itens:
+                self._descartar(chave)
+
+    def invalidar(self, *etiquetas) -> set:
+        """Remove todos os itens associados a qualquer uma das etiquetas informadas.
+
+        Args:
+            *etiquetas: As etiquetas a serem invalidadas.
+
+        Returns:
+            set: As chaves dos itens removidos.
+        """
+        with self._lock:
+            chaves = set()
+            for etiqueta in etiquetas:
+                chaves |= self._etiquetas.get(etiqueta, set())
+
+            for chave in chaves:
+                self._descartar(chave)
+
+            return chaves
+
+    def limpar(self):
+        """Remove todos os itens do cache."""
+        with self._lock:
+            self._itens.clear()
+            self._etiquetas.clear()
+
+    def _descartar(self, chave):
+        _, _, etiquetas = self._itens.pop(chave)
+        for etiqueta in etiquetas:
+            chaves = self._etiquetas.get(etiqueta)
+            if chaves is not None:
+                chaves.discard(chave)
+                if not chaves:
+                    del self._etiquetas[etiqueta]
@@ -0,0 +1,122 @@
+"""
+Módulo de estatísticas de notas.
+
+Este módulo fornece funções para calcular, com o numpy, as estatísticas da distribuição das notas de uma aula ou de um
+conjunto de aulas (média, mediana, desvio padrão, percentis, taxa de aprovação e histograma), de uma só vez para as
+quatro unidades e a média final.
+"""
+
+import warnings
+import numpy as np
+
+
+UNIDADES = ["u1", "u2", "u3", "u4"]
+PERCENTIS = [25, 50, 75, 90]
+FAIXAS_HISTOGRAMA = 10
+
+
+def montar_matriz_notas(boletins) -> np.ndarray:
+    """Monta a matriz de notas, com uma linha por boletim e uma coluna por unidade, seguida da média final.
+
+    A média final é a coluna `Boletim.media`, calculada pelo banco, para que as estatísticas usem a mesma média do
+    boletim. Notas ainda não cadastradas (e a média final de quem não tem as quatro notas) ficam como `NaN`.
+
+    Args:
+        boletins (iterable): Os pares (notas, media) de cada boletim (ex: as linhas de uma consulta de
+            `Boletim.notas` e `Boletim.media`).
+
+    Returns:
+        np.ndarray: Matriz de formato (boletins, 5).
+    """
+    boletins = list(boletins)
+
+    matriz = np.full((len(boletins), len(UNIDADES) + 1), np.nan)
+    for linha, (notas, media) in enumerate(boletins):
+        notas = notas[:len(UNIDADES)]
+        matriz[linha, :len(notas)] = notas
+        if media is not None:
+            matriz[linha, -1] = media
+
+    return matriz
+
+
+def _valor(numero) -> float | None:
+    """Converte um número do numpy para `float`, trocando `NaN` por `None`."""
+    return None if np.isnan(numero) else round(float(numero), 2)
+
+
+def calcular_estatisticas(matriz: np.ndarray, nota_minima: float) -> dict:
+    """Calcula as estatísticas de cada coluna da matriz de notas.
+
+    Args:
+        matriz (np.ndarray): Matriz retornada por `montar_matriz_notas`.
+        nota_minima (float): A nota mínima para aprovação.
+
+    Returns:
+        dict: As estatísticas de cada unidade e da média final, no formato
+            {"quantidade": int, "media": float, "mediana": float, "desvio_padrao": float, "percentis": {...},
+            "taxa_aprovacao": float, "histograma": [int, ...]}, com `None` nos valores de colunas sem notas.
+    """
+    # sem boletins, uma linha só de NaN mantém o formato dos resultados sem alterar contagens e histogramas
+    if not len(matriz):
+        matriz = np.full((1, matriz.shape[1]), np.nan)
+
+    validas = ~np.isnan(matriz)
+    quantidades = validas.sum(axis=0)
+
+    # com todas as notas como NaN as funções "nan*" retornam NaN e emitem avisos, que aqui são esperados
+    with warnings.catch_warnings(), np.errstate(invalid="ignore", divide="ignore"):
+        warnings.simplefilter("ignore", RuntimeWarning)
+        medias = np.nanmean(matriz, axis=0)
+        desvios = np.nanstd(matriz, axis=0)
+        percentis = np.nanpercentile(matriz, PERCENTIS, axis=0)
+        aprovacoes = (matriz >= nota_minima).sum(axis=0) / quantidades
+
+    # histograma de faixas de 1 ponto ([0, 1), [1, 2), ..., [9, 10]) para todas as colunas de uma vez
+    faixas = np.clip(np.floor(matriz), 0, FAIXAS_HISTOGRAMA - 1)
+    histogramas = (faixas[..., np.newaxis] == np.arange(FAIXAS_HISTOGRAMA)).sum(axis=0)
+
+    estatisticas = {}
+    for coluna, nome in enumerate(UNIDADES + ["media_final"]):
+        estatisticas[nome] = {
+            "quantidade": int(quantidades[coluna]),
+            "media": _valor(medias[coluna]),
+            "mediana": _valor(percentis[PERCENTIS.index(50), coluna]),
+            "desvio_padrao": _valor(desvios[coluna]),
+            "percentis": {f"p{p}": _valor(percentis[i, coluna]) for i, p in enumerate(PERCENTIS)},
+            "taxa_aprovacao": _valor(aprovacoes[coluna]),
+            "histograma": histogramas[coluna].tolist()
+        }
+
+    return estatisticas
+
+
+def calcular_resumo_por_grupo(matriz: np.ndarray, grupos: np.ndarray, quantidade_grupos: int, nota_minima: float) -> list:
+    """Calcula, para cada grupo de boletins (ex: cada aula), a média final da turma e a taxa de aprovação.
+
+    As somas são feitas com `np.bincount`, sem percorrer os grupos em Python.
+
+    Args:
+        matriz (np.ndarray): Matriz retornada por `montar_matriz_notas`.
+        grupos (np.ndarray): O índice do grupo (0 a `quantidade_grupos` - 1) de cada linha da matriz.
+        quantidade_grupos (int): O número de grupos.
+        nota_minima (float): A nota mínima para aprovação.
+
+    Returns:
+        list: Um dicionário {"quantidade": int, "media": float, "taxa_aprovacao": float} por grupo, na ordem dos índices.
+    """
+    medias_finais = matriz[:, -1]
+    validas = ~np.isnan(medias_finais)
+
+    quantidades = np.bincount(grupos[validas], minlength=quantidade_grupos)
+    somas = np.bincount(grupos[validas], weights=medias_finais[validas], minlength=quantidade_grupos)
+    aprovados = np.bincount(grupos[validas & (medias_finais >= nota_minima)], minlength=quantidade_grupos)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        medias = somas / quantidades
+        aprovacoes = aprovados / quantidades
+
+    return [
+        {"quantidade": int(quantidades[i]), "media": _valor(medias[i]), "taxa_aprovacao": _valor(aprovacoes[i])}
+        for i in range(quantidade_grupos)
+    ]
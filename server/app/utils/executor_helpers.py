@@ -0,0 +1,195 @@
+"""
+Módulo de execução limitada de tarefas.
+
+Este módulo fornece um executor com número fixo de trabalhadores, limite de tarefas pendentes e tempo máximo
+de espera pelo resultado, usado para tirar trabalho pesado de CPU das threads que atendem as requisições. Os erros
+de fila cheia e de tempo esgotado são respondidos por tratadores registrados na aplicação (`registrar_tratadores`),
+para qualquer rota que use um executor.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from flask import jsonify
+
+
+class FilaCheiaError(Exception):
+    """Erro lançado quando o executor já possui o número máximo de tarefas pendentes."""
+
+
+class TempoEsgotadoError(Exception):
+    """Erro lançado quando uma tarefa não termina dentro do tempo limite."""
+
+
+def responder_fila_cheia(erro: FilaCheiaError) -> jsonify:
+    """Responde quando um executor (ex: o de senhas ou o de PDFs) está com todas as vagas ocupadas.
+
+    Args:
+        erro (FilaCheiaError): O erro lançado pelo executor.
+
+    Returns:
+        jsonify: Resposta JSON contendo uma mensagem de erro.
+    """
+    return jsonify({"erro": ["O servidor está ocupado, tente novamente em instantes"]}), 503, {"Retry-After": "1"}
+
+
+def responder_tempo_esgotado(erro: TempoEsgotadoError) -> jsonify:
+    """Responde quando uma tarefa de um executor ultrapassa o tempo limite.
+
+    Args:
+        erro (TempoEsgotadoError): O erro lançado pelo executor.
+
+    Returns:
+        jsonify: Resposta JSON contendo uma mensagem de erro.
+    """
+    return jsonify({"erro": ["A operação excedeu o tempo limite"]}), 504
+
+
+def registrar_tratadores(app):
+    """Registra, para todas as rotas da aplicação, as respostas 503 e 504 dos erros dos executores."""
+    app.register_error_handler(FilaCheiaError, responder_fila_cheia)
+    app.register_error_handler(TempoEsgotadoError, responder_tempo_esgotado)
+
+
+class ExecutorLimitado:
+    """Executor com limite de trabalhadores, de tarefas pendentes e de tempo de espera.
+
+    O executor interno é criado sob demanda, na primeira tarefa, para que cada processo (por exemplo, cada worker
+    do servidor) tenha o seu próprio. Com `trabalhadores` igual a zero, as tarefas são executadas na própria thread
+    de quem as chamou.
+
+    Atributos:
+        criar_executor (callable): Função que recebe o número de trabalhadores e retorna um `concurrent.futures.Executor`.
+        trabalhadores (int): Número de trabalhadores do executor (0 executa as tarefas diretamente).
+        fila_maxima (int): Número máximo de tarefas aguardando um trabalhador livre.
+        timeout (float): Tempo máximo, em segundos, de espera pelo resultado de uma tarefa.
+    """
+
+    def __init__(self, criar_executor, trabalhadores: int = 0, fila_maxima: int = 0, timeout: float = 30.0):
+        self.criar_executor = criar_executor
+        self.configurar(trabalhadores, fila_maxima, timeout)
+
+    def configurar(self, trabalhadores: int, fila_maxima: int, timeout: float):
+        """Define os limites do executor, descartando o executor interno atual.
+
+        Args:
+            trabalhadores (int): Número de trabalhadores do executor (0 executa as tarefas diretamente).
+            fila_maxima (int): Número máximo de tarefas aguardando um trabalhador livre.
+            timeout (float): Tempo máximo, em segundos, de espera pelo resultado de uma tarefa.
+        """
+        self.trabalhadores = trabalhadores
+        self.fila_maxima = fila_maxima
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._vagas = threading.BoundedSemaphore(trabalhadores + fila_maxima) if trabalhadores > 0 else None
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta o executor interno sem esperar pelas tarefas em andamento.
+
+        Deve ser chamado em processos filhos criados por `fork`, que não podem reutilizar o executor do processo pai.
+        """
+        executor = getattr(self, "_executor", None)
+        self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _obter_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = self.criar_executor(self.trabalhadores)
+            return self._executor
+
+    def submeter(self, funcao, *args):
+        """Agenda uma tarefa no executor, respeitando o limite de tarefas pendentes.
+
+        A vaga ocupada pela tarefa só é liberada quando ela termina, mesmo que quem a submeteu desista de esperar.
+
+        Args:
+            funcao (callable): A função a ser executada.
+            *args: Os argumentos da função.
+
+        Returns:
+            Future: O `Future` da tarefa agendada.
+
+        Raises:
+            FilaCheiaError: Se o executor já estiver com todas as vagas ocupadas.
+        """
+        if not self._vagas.acquire(blocking=False):
+            raise FilaCheiaError("O executor atingiu o limite de tarefas pendentes")
+
+        try:
+            futuro = self._obter_executor().submit(funcao, *args)
+        except BaseException:
+            self._vagas.release()
+            raise
+
+        futuro.add_done_callback(lambda _: self._vagas.release())
+        return futuro
+
+    def aguardar(self, futuro):
+        """Aguarda o resultado de uma tarefa, respeitando o tempo limite do executor.
+
+        No tempo esgotado, a tarefa é cancelada, mas `futuro.cancel()` só tem efeito sobre tarefas que ainda estão na
+        fila: uma tarefa que já começou continua rodando até o fim, ocupando o trabalhador e a sua vaga.
+
+        Args:
+            futuro (Future): O `Future` retornado por `submeter`.
+
+        Returns:
+            O resultado da tarefa.
+
+        Raises:
+            TempoEsgotadoError: Se a tarefa não terminar dentro do tempo limite.
+        """
+        try:
+            return futuro.result(timeout=self.timeout)
+        except FuturesTimeoutError:
+            futuro.cancel()
+            raise TempoEsgotadoError("A tarefa não terminou dentro do tempo limite")
+
+    def executar(self, funcao, *args):
+        """Executa uma tarefa e retorna o seu resultado.
+
+        Args:
+            funcao (callable): A função a ser executada.
+            *args: Os argumentos da função.
+
+        Returns:
+            O resultado da função.
+        """
+        if self.trabalhadores <= 0:
+            return funcao(*args)
+
+        return self.aguardar(self.submeter(funcao, *args))
+
+    def executar_em_lote(self, funcao, lista_de_args):
+        """Executa a mesma função para vários conjuntos de argumentos, retornando os resultados na ordem de entrada.
+
+        No máximo `trabalhadores` tarefas do lote ficam em andamento ao mesmo tempo, para que um único lote grande
+        não ocupe todas as vagas do executor.
+
+        Args:
+            funcao (callable): A função a ser executada.
+            lista_de_args (iterable): Iterável de tuplas com os argumentos de cada chamada.
+
+        Yields:
+            O resultado de cada chamada, na mesma ordem de `lista_de_args`.
+        """
+        if self.trabalhadores <= 0:
+            for args in lista_de_args:
+                yield funcao(*args)
+            return
+
+        pendentes = deque()
+        try:
+            for args in lista_de_args:
+                if len(pendentes) >= self.trabalhadores:
+                    yield self.aguardar(pendentes.popleft())
+                pendentes.append(self.submeter(funcao, *args))
+
+            while pendentes:
+                yield self.aguardar(pendentes.popleft())
+        finally:
+            for futuro in pendentes:
+                futuro.cancel()
@@ -0,0 +1,135 @@
+"""
+Módulo de leitura dos arquivos de importação em lote.
+
+Este módulo fornece funções para ler as linhas de uma importação enviada como um array JSON ou como CSV (no corpo da
+requisição, com `Content-Type: text/csv`, ou como o arquivo `arquivo` de um formulário), para montar as mensagens
+de erro de cada linha, ordená-las e gravar as linhas validadas com `COPY`.
+"""
+
+import csv
+import io
+import re
+from flask import request
+from sqlalchemy.exc import DBAPIError
+from app.extensions import db
+
+MIMETYPE_CSV = "text/csv"
+SEPARADOR_LISTA_CSV = "|"
+NUMERO_DA_LINHA = re.compile(r"Linha (\d+): ")
+
+
+def ler_linhas_importacao(campos: list) -> tuple:
+    """Lê as linhas de uma importação, em JSON ou CSV.
+
+    No CSV, a primeira linha deve ter o nome das colunas, o separador pode ser vírgula ou ponto e vírgula, e os
+    valores de uma lista (ex: os dias da semana) são separados por `|`. Os valores lidos do CSV são strings.
+
+    Args:
+        campos (list): Os campos obrigatórios de cada linha.
+
+    Returns:
+        tuple: A lista de linhas (dicionários) e a lista de erros encontrados no formato do arquivo.
+    """
+    if request.is_json:
+        linhas = request.get_json(silent=True)
+        if not isinstance(linhas, list) or not all(isinstance(linha, dict) for linha in linhas):
+            return [], ["O corpo da requisição deve ser uma lista de objetos"]
+    else:
+        conteudo = ler_csv()
+        if conteudo is None:
+            return [], ["Envie as linhas como uma lista JSON ou como CSV (no corpo da requisição ou no arquivo 'arquivo')"]
+
+        try:
+            dialeto = csv.Sniffer().sniff(conteudo.partition("\n")[0], delimiters=",;")
+        except csv.Error:
+            dialeto = csv.excel
+
+        leitor = csv.DictReader(io.StringIO(conteudo), dialect=dialeto)
+        faltando = [campo for campo in campos if campo not in (leitor.fieldnames or [])]
+        if faltando:
+            return [], [f"O CSV não possui as colunas: {', '.join(faltando)}"]
+
+        linhas = [{campo: (valor or "").strip() for campo, valor in linha.items() if campo is not None} for linha in leitor]
+
+    if not linhas:
+        return [], ["Nenhuma linha para importar"]
+
+    erros = [
+        erro_na_linha(numero, f"Campos ausentes: {', '.join(faltando)}")
+        for numero, linha in enumerate(linhas, start=1)
+        if (faltando := [campo for campo in campos if campo not in linha])
+    ]
+
+    return linhas, erros
+
+
+def ler_csv() -> str | None:
+    """Retorna o conteúdo CSV da requisição, do arquivo `arquivo` ou do corpo, ou None se não houver um CSV."""
+    arquivo = request.files.get("arquivo")
+    if arquivo is not None:
+        return arquivo.read().decode("utf-8-sig")
+
+    if request.mimetype == MIMETYPE_CSV:
+        return request.get_data().decode("utf-8-sig")
+
+    return None
+
+
+def ler_lista_csv(valor) -> list:
+    """Converte o valor de uma coluna de lista do CSV (ex: "Segunda|Quarta") em uma lista (listas do JSON são mantidas)."""
+    if isinstance(valor, str):
+        return [item.strip() for item in valor.split(SEPARADOR_LISTA_CSV) if item.strip()]
+    return valor
+
+
+def ler_inteiro_csv(valor):
+    """Converte o valor de uma coluna numérica do CSV em int (valores inválidos são mantidos para a validação)."""
+    if isinstance(valor, str):
+        try:
+            return int(valor)
+        except ValueError:
+            return valor
+    return valor
+
+
+def erro_na_linha(numero: int, mensagem: str) -> str:
+    """Monta a mensagem de erro de uma linha da importação (numeradas a partir de 1, sem contar o cabeçalho do CSV)."""
+    return f"Linha {numero}: {mensagem}"
+
+
+def ordenar_erros_por_linha(erros: list) -> list:
+    """Ordena os erros montados por `erro_na_linha` pelo número da linha, mantendo a ordem dos erros de uma mesma linha.
+
+    Args:
+        erros (list): Os erros das linhas, na ordem em que foram encontrados (ex: primeiro os da validação e depois os
+            das verificações no banco).
+
+    Returns:
+        list: Os erros, na ordem das linhas.
+    """
+    return sorted(erros, key=lambda erro: int(NUMERO_DA_LINHA.match(erro).group(1)))
+
+
+def copiar_linhas(tabela, colunas: list, linhas: list):
+    """Grava as linhas em uma tabela com `COPY ... FROM STDIN`, na transação da sessão.
+
+    Args:
+        tabela (Table): A tabela de destino.
+        colunas (list): Os nomes das colunas, na ordem dos valores de cada linha.
+        linhas (list): As linhas a gravar (tuplas de valores; datas são gravadas no formato ISO).
+    """
+    conteudo = io.StringIO()
+    csv.writer(conteudo).writerows(linhas)
+    conteudo.seek(0)
+
+    # o COPY não é um comando SQLAlchemy, então é executado pelo cursor do psycopg2 da conexão da sessão
+    conexao = db.session.connection()
+    comando = f"COPY {tabela.name} ({', '.join(colunas)}) FROM STDIN WITH (FORMAT csv)"
+    cursor = conexao.connection.cursor()
+    try:
+        cursor.copy_expert(comando, conteudo)
+    except conexao.dialect.loaded_dbapi.Error as erro:
+        # converte o erro do psycopg2 na exceção do SQLAlchemy (ex: IntegrityError), como nos demais comandos
+        raise DBAPIError.instance(comando, None, erro, conexao.dialect.loaded_dbapi.Error, dialect=conexao.dialect) from erro
+    finally:
+        cursor.close()
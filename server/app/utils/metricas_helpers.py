@@ -0,0 +1,288 @@
+"""
+Módulo de instrumentação das consultas SQL de cada requisição.
+
+Este módulo fornece as `MetricasRequisicoes`, que registram, por meio dos eventos do SQLAlchemy, o número de comandos
+SQL e o tempo gasto no banco em cada requisição. Os valores da requisição são enviados no cabeçalho `Server-Timing`
+da resposta e acumulados por rota (método e regra da URL), junto com os comandos mais lentos de cada rota, para a
+rota `/metrics` (formato de texto do Prometheus) e a rota `/saude/consultas`.
+
+Com `LOG_REQUISICOES_LENTAS_MS` maior que zero, as requisições mais lentas que esse limite são registradas no log
+com todos os seus comandos e os respectivos parâmetros.
+"""
+
+import heapq
+import os
+import threading
+import time
+from flask import g, request, has_request_context, current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+# limites superiores dos histogramas da duração das requisições (segundos) e do número de consultas por requisição
+LIMITES_DURACAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LIMITES_CONSULTAS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+COMANDOS_LENTOS_POR_ROTA = 5
+
+
+def inicio_consulta(conn, cursor, statement, parameters, context, executemany):
+    context._inicio_consulta = time.perf_counter()
+
+
+def fim_consulta(conn, cursor, statement, parameters, context, executemany):
+    """Acumula o comando no registro da requisição atual (se houver uma em andamento)."""
+    if not has_request_context() or "consultas_sql" not in g:
+        return
+
+    duracao = time.perf_counter() - context._inicio_consulta
+    g.consultas_sql += 1
+    g.tempo_sql += duracao
+    if g.guardar_parametros:
+        # o log das requisições lentas precisa de todos os comandos
+        g.comandos_sql.append((duracao, statement, parameters))
+    else:
+        # sem o log, só os mais lentos chegam às métricas da rota, então a memória não cresce com o número de comandos
+        guardar_mais_lentos(g.comandos_sql, (duracao, statement, None), COMANDOS_LENTOS_POR_ROTA)
+
+
+def guardar_mais_lentos(comandos_lentos: list, item: tuple, limite: int):
+    """Acrescenta o comando a um heap de mínimo que guarda apenas os `limite` comandos mais lentos.
+
+    Args:
+        comandos_lentos (list): O heap, com tuplas que começam pela duração do comando.
+        item (tuple): O comando a ser acrescentado.
+        limite (int): O número máximo de comandos guardados.
+    """
+    if len(comandos_lentos) < limite:
+        heapq.heappush(comandos_lentos, item)
+    elif item > comandos_lentos[0]:
+        heapq.heapreplace(comandos_lentos, item)
+
+
+class Histograma:
+    """Histograma cumulativo no formato do Prometheus (contagem de valores menores ou iguais a cada limite)."""
+
+    def __init__(self, limites: tuple):
+        self.limites = limites
+        self.contagens = [0] * len(limites)
+        self.soma = 0.0
+        self.quantidade = 0
+
+    def observar(self, valor: float):
+        for indice, limite in enumerate(self.limites):
+            if valor <= limite:
+                self.contagens[indice] += 1
+        self.soma += valor
+        self.quantidade += 1
+
+
+class MetricasRota:
+    """Métricas acumuladas das requisições de uma rota."""
+
+    def __init__(self):
+        self.requisicoes_por_status = {}
+        self.duracao = Histograma(LIMITES_DURACAO)
+        self.consultas = Histograma(LIMITES_CONSULTAS)
+        self.tempo_sql = 0.0
+        self.comandos_lentos = []
+
+    def registrar(self, status: int, duracao: float, consultas: int, tempo_sql: float, comandos: list):
+        self.requisicoes_por_status[status] = self.requisicoes_por_status.get(status, 0) + 1
+        self.duracao.observar(duracao)
+        self.consultas.observar(consultas)
+        self.tempo_sql += tempo_sql
+
+        # mantém apenas os comandos mais lentos já vistos na rota (um heap de mínimo com os N maiores)
+        for duracao_comando, comando, _ in comandos:
+            guardar_mais_lentos(self.comandos_lentos, (duracao_comando, comando), COMANDOS_LENTOS_POR_ROTA)
+
+
+class MetricasRequisicoes:
+    """Registro, por processo, das métricas de cada rota da aplicação.
+
+    Configurações lidas da aplicação:
+        LOG_REQUISICOES_LENTAS_MS (float): Duração a partir da qual a requisição é registrada no log com os seus
+            comandos SQL e parâmetros (0 desativa e não guarda os parâmetros).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.rotas = {}
+
+    def init_app(self, app):
+        """Registra os eventos do SQLAlchemy e os tratadores de início e fim das requisições da aplicação.
+
+        Args:
+            app (Flask): A aplicação Flask.
+        """
+        if not event.contains(Engine, "before_cursor_execute", inicio_consulta):
+            event.listen(Engine, "before_cursor_execute", inicio_consulta)
+            event.listen(Engine, "after_cursor_execute", fim_consulta)
+
+        limite_log = app.config.get("LOG_REQUISICOES_LENTAS_MS", 0) / 1000
+
+        def iniciar_requisicao():
+            g.inicio_requisicao = time.perf_counter()
+            g.consultas_sql = 0
+            g.tempo_sql = 0.0
+            g.comandos_sql = []
+            g.guardar_parametros = limite_log > 0
+
+        def finalizar_requisicao(response):
+            if "inicio_requisicao" not in g:
+                return response
+
+            duracao = time.perf_counter() - g.inicio_requisicao
+            response.headers["Server-Timing"] = (
+                f'db;dur={1000 * g.tempo_sql:.2f};desc="{g.consultas_sql} consultas", total;dur={1000 * duracao:.2f}'
+            )
+
+            rota = request.url_rule.rule if request.url_rule is not None else "<nao_encontrada>"
+            self.registrar(request.method, rota, response.status_code, duracao, g.consultas_sql, g.tempo_sql, g.comandos_sql)
+
+            if 0 < limite_log <= duracao:
+                registrar_requisicao_lenta(request.method, request.full_path, duracao, g.tempo_sql, g.comandos_sql)
+
+            g.pop("inicio_requisicao")
+            return response
+
+        app.before_request(iniciar_requisicao)
+        app.after_request(finalizar_requisicao)
+        app.extensions["metricas"] = self
+
+    def registrar(self, metodo: str, rota: str, status: int, duracao: float, consultas: int, tempo_sql: float, comandos: list):
+        """Acumula as métricas de uma requisição na sua rota.
+
+        Args:
+            metodo (str): O método HTTP da requisição.
+            rota (str): A regra da URL (ex: "/notas/<int:aula_id>").
+            status (int): O status code da resposta.
+            duracao (float): A duração da requisição, em segundos.
+            consultas (int): O número de comandos SQL executados.
+            tempo_sql (float): O tempo gasto no banco, em segundos.
+            comandos (list): Tuplas (duração, comando, parâmetros) dos comandos executados (sem o log das requisições
+                lentas, apenas os mais lentos da requisição).
+        """
+        with self._lock:
+            metricas = self.rotas.setdefault((metodo, rota), MetricasRota())
+            metricas.registrar(status, duracao, consultas, tempo_sql, comandos)
+
+    def zerar(self):
+        """Descarta as métricas acumuladas."""
+        with self._lock:
+            self.rotas = {}
+
+    def comandos_lentos(self) -> list:
+        """Retorna, para cada rota, as médias da rota e os comandos SQL mais lentos já executados nela.
+
+        Returns:
+            list: Dicionários com o método, a rota, o número de requisições, as médias de consultas e de tempo no banco
+                (em milissegundos) e os comandos mais lentos, ordenados pela média de consultas.
+        """
+        with self._lock:
+            rotas = [
+                {
+                    "metodo": metodo,
+                    "rota": rota,
+                    "requisicoes": metricas.duracao.quantidade,
+                    "consultas_media": round(metricas.consultas.soma / metricas.duracao.quantidade, 2),
+                    "tempo_sql_medio_ms": round(1000 * metricas.tempo_sql / metricas.duracao.quantidade, 3),
+                    "comandos_lentos": [
+                        {"duracao_ms": round(1000 * duracao, 3), "comando": comando}
+                        for duracao, comando in sorted(metricas.comandos_lentos, reverse=True)
+                    ]
+                }
+                for (metodo, rota), metricas in self.rotas.items()
+            ]
+
+        return sorted(rotas, key=lambda rota: rota["consultas_media"], reverse=True)
+
+    def exportar(self, pools: dict | None = None, caches: dict | None = None, senhas: dict | None = None) -> str:
+        """Exporta as métricas no formato de texto do Prometheus.
+
+        Args:
+            pools (dict | None): O estado dos pools de conexões (`estado_dos_pools`), exportado como medidores.
+            caches (dict | None): As métricas (`CacheLRU.metricas`) de cada cache, pelo nome (ex: "tokens").
+            senhas (dict | None): As métricas de espera na fila do pool do Bcrypt (`VerificadorSenhas.metricas`).
+
+        Returns:
+            str: As métricas do processo atual.
+        """
+        linhas = []
+
+        def cabecalho(nome: str, tipo: str, descricao: str):
+            linhas.append(f"# HELP {nome} {descricao}")
+            linhas.append(f"# TYPE {nome} {tipo}")
+
+        def histograma(nome: str, rotulos: str, valores: Histograma):
+            for limite, contagem in zip(valores.limites, valores.contagens):
+                linhas.append(f'{nome}_bucket{{{rotulos},le="{limite}"}} {contagem}')
+            linhas.append(f'{nome}_bucket{{{rotulos},le="+Inf"}} {valores.quantidade}')
+            linhas.append(f"{nome}_sum{{{rotulos}}} {valores.soma}")
+            linhas.append(f"{nome}_count{{{rotulos}}} {valores.quantidade}")
+
+        with self._lock:
+            rotas = sorted(self.rotas.items())
+
+            cabecalho("edumanager_requisicoes_total", "counter", "Número de requisições atendidas, por rota e status.")
+            for (metodo, rota), metricas in rotas:
+                for status, quantidade in sorted(metricas.requisicoes_por_status.items()):
+                    linhas.append(f'edumanager_requisicoes_total{{{rotular(metodo, rota)},status="{status}"}} {quantidade}')
+
+            cabecalho("edumanager_requisicao_duracao_segundos", "histogram", "Duração das requisições, em segundos.")
+            for (metodo, rota), metricas in rotas:
+                histograma("edumanager_requisicao_duracao_segundos", rotular(metodo, rota), metricas.duracao)
+
+            cabecalho("edumanager_sql_consultas_por_requisicao", "histogram", "Número de comandos SQL executados por requisição.")
+            for (metodo, rota), metricas in rotas:
+                histograma("edumanager_sql_consultas_por_requisicao", rotular(metodo, rota), metricas.consultas)
+
+            cabecalho("edumanager_sql_duracao_segundos_total", "counter", "Tempo total gasto no banco de dados, em segundos.")
+            for (metodo, rota), metricas in rotas:
+                linhas.append(f"edumanager_sql_duracao_segundos_total{{{rotular(metodo, rota)}}} {metricas.tempo_sql}")
+
+        if pools:
+            for campo, descricao in (("em_uso", "Conexões do pool em uso."), ("ociosas", "Conexões ociosas do pool."), ("timeouts", "Pedidos de conexão que excederam o tempo limite.")):
+                nome = f"edumanager_pool_{campo}"
+                cabecalho(nome, "counter" if campo == "timeouts" else "gauge", descricao)
+                for bind, estado in pools.items():
+                    linhas.append(f'{nome}{{bind="{bind}"}} {estado[campo]}')
+
+        if caches:
+            for campo, nome, tipo, descricao in (
+                ("acertos", "edumanager_cache_acertos_total", "counter", "Consultas que encontraram o item no cache."),
+                ("falhas", "edumanager_cache_falhas_total", "counter", "Consultas que não encontraram o item no cache."),
+                ("taxa_acerto", "edumanager_cache_taxa_acerto", "gauge", "Proporção de consultas que encontraram o item no cache."),
+            ):
+                cabecalho(nome, tipo, descricao)
+                for cache, valores in caches.items():
+                    linhas.append(f'{nome}{{cache="{cache}"}} {valores[campo]}')
+
+        if senhas:
+            for campo, nome, tipo, descricao in (
+                ("tarefas", "edumanager_senhas_tarefas_total", "counter", "Operações do Bcrypt executadas no pool de senhas."),
+                ("espera_media", "edumanager_senhas_espera_media_segundos", "gauge", "Tempo médio de espera das operações do Bcrypt na fila, em segundos."),
+                ("espera_maxima", "edumanager_senhas_espera_maxima_segundos", "gauge", "Maior tempo de espera de uma operação do Bcrypt na fila, em segundos."),
+            ):
+                cabecalho(nome, tipo, descricao)
+                linhas.append(f"{nome} {senhas[campo]}")
+
+        return "\n".join(linhas) + "\n"
+
+
+def rotular(metodo: str, rota: str) -> str:
+    """Monta os rótulos de uma rota no formato do Prometheus, escapando as aspas e barras invertidas."""
+    rota = rota.replace("\\", "\\\\").replace('"', '\\"')
+    return f'metodo="{metodo}",rota="{rota}",pid="{os.getpid()}"'
+
+
+def registrar_requisicao_lenta(metodo: str, caminho: str, duracao: float, tempo_sql: float, comandos: list):
+    """Registra no log uma requisição mais lenta que `LOG_REQUISICOES_LENTAS_MS`, com os comandos e os parâmetros."""
+    detalhes = "\n".join(
+        f"  {1000 * duracao_comando:.2f} ms: {comando} {parametros!r}"
+        for duracao_comando, comando, parametros in comandos
+    )
+    current_app.logger.warning(
+        "Requisição lenta: %s %s em %.2f ms (%d consultas, %.2f ms no banco)\n%s",
+        metodo, caminho, 1000 * duracao, len(comandos), 1000 * tempo_sql, detalhes
+    )
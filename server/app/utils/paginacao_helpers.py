@@ -0,0 +1,77 @@
+"""
+Módulo de paginação e projeção de campos das listagens.
+
+Este módulo fornece funções para ler os parâmetros de paginação por cursor (`limite` e `apos`) e de projeção de campos
+(`fields`) das requisições de listagem, e para informar o cursor da próxima página na resposta.
+"""
+
+LIMITE_MAXIMO = 500
+CABECALHO_CURSOR = "X-Proximo-Cursor"
+
+
+def ler_paginacao(argumentos) -> tuple:
+    """Lê os parâmetros de paginação por cursor de uma requisição.
+
+    Sem o parâmetro `limite`, a listagem não é paginada.
+
+    Args:
+        argumentos (MultiDict): Os parâmetros da requisição (`request.args`).
+
+    Returns:
+        tuple: O limite de itens (int | None), o cursor a partir do qual listar (str | None) e a lista de erros encontrados.
+    """
+    erros = []
+
+    limite = argumentos.get("limite")
+    if limite is not None:
+        try:
+            limite = int(limite)
+        except ValueError:
+            limite = 0
+
+        if not 1 <= limite <= LIMITE_MAXIMO:
+            erros.append(f"O parâmetro 'limite' deve ser um número inteiro entre 1 e {LIMITE_MAXIMO}")
+
+    apos = argumentos.get("apos") or None
+
+    return limite, apos, erros
+
+
+def ler_campos(argumentos, campos_permitidos: list) -> tuple:
+    """Lê o parâmetro `fields` de uma requisição, com os campos separados por vírgula.
+
+    Sem o parâmetro, todos os campos permitidos são retornados.
+
+    Args:
+        argumentos (MultiDict): Os parâmetros da requisição (`request.args`).
+        campos_permitidos (list): Os campos que podem ser retornados pela listagem, na ordem padrão.
+
+    Returns:
+        tuple: A lista de campos escolhidos e a lista de erros encontrados.
+    """
+    campos = list(dict.fromkeys(campo.strip() for campo in argumentos.get("fields", "").split(",") if campo.strip()))
+    if not campos:
+        return list(campos_permitidos), []
+
+    erros = [f"O campo '{campo}' não pode ser listado" for campo in campos if campo not in campos_permitidos]
+
+    return campos, erros
+
+
+def definir_cursor(response, quantidade: int, limite: int | None, ultimo_cursor):
+    """Informa, no cabeçalho `X-Proximo-Cursor`, o cursor da próxima página, se ela puder existir.
+
+    Args:
+        response (Response): A resposta da listagem.
+        quantidade (int): O número de itens retornados na página.
+        limite (int | None): O limite de itens da página (None quando a listagem não é paginada).
+        ultimo_cursor: O valor do cursor (ex: a matrícula) do último item da página.
+
+    Returns:
+        Response: A própria resposta.
+    """
+    if limite is not None and quantidade == limite:
+        response.headers[CABECALHO_CURSOR] = str(ultimo_cursor)
+        response.headers["Access-Control-Expose-Headers"] = CABECALHO_CURSOR
+
+    return response
@@ -0,0 +1,278 @@
+"""
+Módulo de renderização de documentos PDF.
+
+Este módulo fornece o `RenderizadorPDF`, que executa a montagem dos documentos do ReportLab (boletins e históricos)
+em um pool de processos, liberando as threads do servidor enquanto o PDF é gerado, e o `CachePDF`, que guarda os
+documentos já gerados a partir do hash dos dados usados na sua montagem.
+"""
+
+import os
+import json
+import hashlib
+import tempfile
+import threading
+import multiprocessing
+from io import BytesIO
+from concurrent.futures import ProcessPoolExecutor
+from .executor_helpers import ExecutorLimitado
+from .cache_helpers import CacheLRU
+
+
+def renderizar_bytes(funcao, *args) -> bytes:
+    """Executa uma função geradora de PDF e retorna o conteúdo do documento.
+
+    É executada nos processos do pool, por isso retorna `bytes` em vez do buffer.
+
+    Args:
+        funcao (callable): Função que recebe `*args` e retorna um `BytesIO` com o PDF (ex: `gerar_pdf_boletim`).
+        *args: Os dados já preparados do documento.
+
+    Returns:
+        bytes: O conteúdo do PDF gerado.
+    """
+    buffer = funcao(*args)
+    try:
+        return buffer.getvalue()
+    finally:
+        buffer.close()
+
+
+def criar_pool_de_processos(trabalhadores: int) -> ProcessPoolExecutor:
+    """Cria o pool de processos usado na renderização.
+
+    Os processos são iniciados com `spawn`, para não herdarem conexões e threads do processo do servidor.
+
+    Args:
+        trabalhadores (int): Número de processos do pool.
+
+    Returns:
+        ProcessPoolExecutor: O pool de processos.
+    """
+    return ProcessPoolExecutor(max_workers=trabalhadores, mp_context=multiprocessing.get_context("spawn"))
+
+
+class RenderizadorPDF(ExecutorLimitado):
+    """Renderizador de PDFs em um pool de processos limitado.
+
+    Configurações lidas da aplicação:
+        PDF_RENDER_TRABALHADORES (int): Número de processos do pool (0 renderiza na própria thread da requisição).
+        PDF_RENDER_FILA_MAXIMA (int): Número máximo de documentos aguardando um processo livre.
+        PDF_RENDER_TIMEOUT (float): Tempo máximo, em segundos, de espera por um documento.
+    """
+
+    def __init__(self, app=None):
+        super().__init__(criar_pool_de_processos)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura o renderizador a partir da configuração da aplicação.
+
+        Args:
+            app (Flask): A aplicação Flask.
+        """
+        self.configurar(
+            trabalhadores=app.config.get("PDF_RENDER_TRABALHADORES", os.cpu_count() or 1),
+            fila_maxima=app.config.get("PDF_RENDER_FILA_MAXIMA", 32),
+            timeout=app.config.get("PDF_RENDER_TIMEOUT", 30.0)
+        )
+        app.extensions["pdf_renderer"] = self
+
+    def renderizar(self, funcao, *args) -> BytesIO:
+        """Renderiza um documento PDF.
+
+        Args:
+            funcao (callable): Função geradora do PDF (ex: `gerar_pdf_boletim`).
+            *args: Os dados já preparados do documento.
+
+        Returns:
+            BytesIO: Buffer posicionado no início do PDF gerado.
+
+        Raises:
+            FilaCheiaError: Se o pool já estiver com todas as vagas ocupadas.
+            TempoEsgotadoError: Se o documento não for gerado dentro do tempo limite.
+        """
+        return BytesIO(self.executar(renderizar_bytes, funcao, *args))
+
+    def renderizar_em_lote(self, funcao, lista_de_args):
+        """Renderiza vários documentos PDF em paralelo, retornando-os na ordem de entrada.
+
+        Args:
+            funcao (callable): Função geradora do PDF (ex: `gerar_pdf_boletim`).
+            lista_de_args (iterable): Iterável de tuplas com os dados de cada documento.
+
+        Yields:
+            bytes: O conteúdo de cada PDF gerado.
+        """
+        yield from self.executar_em_lote(renderizar_bytes, ((funcao, *args) for args in lista_de_args))
+
+
+def calcular_chave_pdf(funcao, *args) -> str:
+    """Calcula a chave de um documento a partir da função geradora e dos dados exatos usados na sua montagem.
+
+    Args:
+        funcao (callable): Função geradora do PDF (ex: `gerar_pdf_boletim`).
+        *args: Os dados já preparados do documento.
+
+    Returns:
+        str: O hash SHA-256 (hexadecimal) da função e dos dados.
+    """
+    conteudo = json.dumps([f"{funcao.__module__}.{funcao.__qualname__}", args], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()
+
+
+class CachePDF:
+    """Cache de PDFs endereçado pelo conteúdo, com um nível em memória e outro opcional em disco.
+
+    Como a chave é o hash dos dados do documento, qualquer alteração de notas, ausências ou situação gera uma chave
+    nova, e um documento desatualizado nunca é servido. A invalidação por matrícula serve para liberar espaço assim
+    que os dados de um aluno mudam.
+
+    Configurações lidas da aplicação:
+        PDF_CACHE_MAX_ITENS (int): Número máximo de documentos mantidos em memória.
+        PDF_CACHE_DIR (str | None): Diretório do nível em disco (None desativa o nível em disco).
+        PDF_CACHE_DISCO_MAX_ITENS (int): Número máximo de documentos mantidos em disco. Para não percorrer o diretório a
+            cada gravação, o excedente é descartado a cada `PDF_CACHE_DISCO_MAX_ITENS // 10` gravações do processo, então
+            o diretório pode passar do limite nesse intervalo.
+    """
+
+    def __init__(self, renderizador: RenderizadorPDF, app=None):
+        self.renderizador = renderizador
+        self.memoria = CacheLRU()
+        self.diretorio = None
+        self.disco_max_itens = 0
+        self._disco_por_matricula = {}
+        self._gravacoes_sem_limpeza = 0
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura o cache a partir da configuração da aplicação.
+
+        Args:
+            app (Flask): A aplicação Flask.
+        """
+        self.memoria.configurar(capacidade=app.config.get("PDF_CACHE_MAX_ITENS", 256))
+        self.diretorio = app.config.get("PDF_CACHE_DIR")
+        self.disco_max_itens = app.config.get("PDF_CACHE_DISCO_MAX_ITENS", 5000)
+        self._disco_por_matricula = {}
+        self._gravacoes_sem_limpeza = 0
+
+        if self.diretorio:
+            os.makedirs(self.diretorio, exist_ok=True)
+
+        app.extensions["pdf_cache"] = self
+
+    def obter_ou_renderizar(self, funcao, *args, matriculas=()) -> BytesIO:
+        """Retorna o PDF do cache ou, se ainda não existir, renderiza e armazena o documento.
+
+        Args:
+            funcao (callable): Função geradora do PDF (ex: `gerar_pdf_boletim`).
+            *args: Os dados já preparados do documento.
+            matriculas (iterable): As matrículas dos alunos cujos dados estão no documento.
+
+        Returns:
+            BytesIO: Buffer posicionado no início do PDF.
+        """
+        chave = calcular_chave_pdf(funcao, *args)
+
+        conteudo = self.memoria.obter(chave)
+        if conteudo is None:
+            conteudo = self._ler_disco(chave)
+
+            if conteudo is None:
+                conteudo = self.renderizador.renderizar(funcao, *args).getvalue()
+                self._gravar_disco(chave, conteudo, matriculas)
+
+            self.memoria.definir(chave, conteudo, etiquetas=matriculas)
+
+        return BytesIO(conteudo)
+
+    def invalidar(self, *matriculas):
+        """Remove do cache os documentos que contêm dados dos alunos informados.
+
+        Args:
+            *matriculas: As matrículas dos alunos cujos dados foram alterados.
+        """
+        chaves = self.memoria.invalidar(*matriculas)
+
+        with self._lock:
+            for matricula in matriculas:
+                chaves |= self._disco_por_matricula.pop(matricula, set())
+
+        for chave in chaves:
+            self._remover_disco(chave)
+
+    def _caminho(self, chave: str) -> str:
+        return os.path.join(self.diretorio, f"{chave}.pdf")
+
+    def _ler_disco(self, chave: str) -> bytes | None:
+        if not self.diretorio:
+            return None
+
+        caminho = self._caminho(chave)
+        try:
+            with open(caminho, "rb") as arquivo:
+                conteudo = arquivo.read()
+        except FileNotFoundError:
+            return None
+
+        try:
+            os.utime(caminho)
+        except FileNotFoundError:
+            # descartado por outro processo depois da leitura; o conteúdo lido continua válido
+            pass
+        return conteudo
+
+    def _gravar_disco(self, chave: str, conteudo: bytes, matriculas):
+        if not self.diretorio:
+            return
+
+        # Escreve em um arquivo temporário e renomeia, para que outro processo nunca leia um PDF pela metade
+        descritor, temporario = tempfile.mkstemp(dir=self.diretorio, suffix=".tmp")
+        with os.fdopen(descritor, "wb") as arquivo:
+            arquivo.write(conteudo)
+        os.replace(temporario, self._caminho(chave))
+
+        with self._lock:
+            for matricula in matriculas:
+                self._disco_por_matricula.setdefault(matricula, set()).add(chave)
+
+            self._gravacoes_sem_limpeza += 1
+            limpar = self._gravacoes_sem_limpeza >= max(1, self.disco_max_itens // 10)
+            if limpar:
+                self._gravacoes_sem_limpeza = 0
+
+        if limpar:
+            self._limitar_disco()
+
+    def _remover_disco(self, chave: str):
+        if not self.diretorio:
+            return
+
+        try:
+            os.remove(self._caminho(chave))
+        except FileNotFoundError:
+            pass
+
+    def _limitar_disco(self):
+        arquivos = []
+        with os.scandir(self.diretorio) as entradas:
+            for entrada in entradas:
+                if not entrada.name.endswith(".pdf"):
+                    continue
+                try:
+                    arquivos.append((entrada.stat().st_mtime, entrada.name[:-len(".pdf")]))
+                except FileNotFoundError:
+                    # o diretório pode ser compartilhado entre os workers: o arquivo já foi descartado por outro processo
+                    continue
+
+        excedente = len(arquivos) - self.disco_max_itens
+        if excedente <= 0:
+            return
+
+        # Descarta os documentos acessados há mais tempo
+        arquivos.sort()
+        for _, chave in arquivos[:excedente]:
+            self._remover_disco(chave)
@@ -0,0 +1,155 @@
+"""
+Módulo de instrumentação do pool de conexões do banco de dados.
+
+Este módulo fornece o `PoolInstrumentado`, um `QueuePool` do SQLAlchemy que mede o tempo que cada requisição espera
+por uma conexão, e funções para montar as opções do engine a partir das variáveis de ambiente e para consultar o
+estado do pool do processo atual (cada worker do servidor tem o seu próprio pool).
+"""
+
+import os
+import time
+import threading
+from sqlalchemy import exc, event
+from sqlalchemy.pool import QueuePool
+
+
+PREFIXO_APLICACAO = "edumanager"
+
+
+def nomear_conexao(conexao_dbapi, registro):
+    """Identifica a conexão no `pg_stat_activity` com o PID do worker que a abriu (ex: "edumanager:1234")."""
+    cursor = conexao_dbapi.cursor()
+    try:
+        cursor.execute("SET application_name = %s", (f"{PREFIXO_APLICACAO}:{os.getpid()}",))
+    finally:
+        cursor.close()
+    conexao_dbapi.commit()
+
+
+class PoolInstrumentado(QueuePool):
+    """Pool de conexões que registra o número de checkouts, os tempos de espera e os checkouts que excederam o tempo limite.
+
+    O tempo de espera inclui a abertura de novas conexões e o `pool_pre_ping`, ou seja, todo o tempo entre pedir uma
+    conexão e recebê-la. Cada conexão aberta é identificada no `pg_stat_activity` pelo PID do worker.
+
+    Atributos:
+        checkouts (int): Número de conexões entregues pelo pool.
+        timeouts (int): Número de pedidos que excederam o `pool_timeout` sem receber uma conexão.
+        espera_total (float): Soma dos tempos de espera, em segundos.
+        espera_maxima (float): Maior tempo de espera, em segundos.
+        pico_em_uso (int): Maior número de conexões em uso ao mesmo tempo.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # ao ser recriado (ex: `engine.dispose()`), o pool herda os eventos do anterior
+        if not event.contains(self, "connect", nomear_conexao):
+            event.listen(self, "connect", nomear_conexao)
+
+        self._lock_metricas = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.pico_em_uso = 0
+
+    def connect(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super().connect()
+        except exc.TimeoutError:
+            with self._lock_metricas:
+                self.timeouts += 1
+            raise
+
+        espera = time.perf_counter() - inicio
+        with self._lock_metricas:
+            self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+            self.pico_em_uso = max(self.pico_em_uso, self.checkedout())
+
+        return conexao
+
+    def estado(self) -> dict:
+        """Retorna o estado atual e as métricas acumuladas do pool.
+
+        Returns:
+            dict: O tamanho e os limites do pool, as conexões em uso, ociosas e além do tamanho (overflow), e as
+                métricas de checkout, com os tempos em milissegundos.
+        """
+        with self._lock_metricas:
+            return {
+                "pid": os.getpid(),
+                "tamanho": self.size(),
+                "overflow_maximo": self._max_overflow,
+                "em_uso": self.checkedout(),
+                "ociosas": self.checkedin(),
+                "overflow": max(self.overflow(), 0),
+                "pico_em_uso": self.pico_em_uso,
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "espera_media_ms": round(1000 * self.espera_total / self.checkouts, 3) if self.checkouts else 0.0,
+                "espera_maxima_ms": round(1000 * self.espera_maxima, 3)
+            }
+
+
+def ler_booleano(valor: str | None, padrao: bool) -> bool:
+    """Converte o valor de uma variável de ambiente em booleano ("1", "true", "sim" e "on" são verdadeiros).
+
+    Args:
+        valor (str | None): O valor da variável de ambiente.
+        padrao (bool): O valor usado quando a variável não está definida.
+
+    Returns:
+        bool: O valor convertido.
+    """
+    if valor is None or valor.strip() == "":
+        return padrao
+
+    return valor.strip().lower() in ("1", "true", "sim", "on")
+
+
+def montar_opcoes_engine(tamanho: int, overflow: int, timeout: float, reciclagem: int, pre_ping: bool, statement_timeout: int) -> dict:
+    """Monta as opções do engine do SQLAlchemy (`SQLALCHEMY_ENGINE_OPTIONS`) com o pool instrumentado.
+
+    Args:
+        tamanho (int): Número de conexões mantidas abertas pelo pool.
+        overflow (int): Número de conexões extras abertas além do tamanho nos picos.
+        timeout (float): Tempo máximo, em segundos, de espera por uma conexão livre.
+        reciclagem (int): Idade máxima, em segundos, de uma conexão antes de ser reaberta (-1 desativa).
+        pre_ping (bool): Se cada conexão deve ser testada antes de ser entregue (descarta conexões derrubadas).
+        statement_timeout (int): Tempo máximo, em milissegundos, de cada comando SQL (0 desativa).
+
+    Returns:
+        dict: As opções do engine.
+    """
+    opcoes = {
+        "poolclass": PoolInstrumentado,
+        "pool_size": tamanho,
+        "max_overflow": overflow,
+        "pool_timeout": timeout,
+        "pool_recycle": reciclagem,
+        "pool_pre_ping": pre_ping,
+    }
+
+    if statement_timeout > 0:
+        opcoes["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+
+    return opcoes
+
+
+def estado_dos_pools(engines) -> dict:
+    """Retorna o estado do pool de cada engine (por exemplo, `db.engines`).
+
+    Args:
+        engines (dict): Os engines, indexados pelo nome do bind (None para o banco padrão).
+
+    Returns:
+        dict: O estado de cada pool instrumentado, indexado pelo nome do bind ("padrao" para o banco padrão).
+    """
+    return {
+        nome or "padrao": engine.pool.estado()
+        for nome, engine in engines.items()
+        if isinstance(engine.pool, PoolInstrumentado)
+    }
@@ -0,0 +1,86 @@
+"""
+Módulo de roteamento das leituras para réplicas do banco de dados.
+
+Este módulo fornece a `SessaoRoteada`, a sessão do `db` que envia as consultas das requisições somente de leitura
+(GET, HEAD e OPTIONS) para uma das réplicas configuradas em `SQLALCHEMY_BINDS` (binds com o prefixo "replica"), e as
+funções que marcam cada requisição como leitura de réplica ou do primário. A réplica é sorteada uma vez por requisição,
+para que todas as suas consultas vejam o mesmo estado do banco, mesmo com réplicas em atrasos diferentes.
+
+Depois de uma escrita bem-sucedida, o cliente recebe um cookie que, por alguns segundos (`REPLICA_JANELA_CONSISTENCIA`),
+faz as suas leituras irem ao primário, para que ele veja o que acabou de gravar mesmo com a réplica atrasada.
+"""
+
+import random
+from flask import g, request, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+
+PREFIXO_REPLICA = "replica"
+COOKIE_PRIMARIO = "ler_do_primario"
+METODOS_DE_LEITURA = ("GET", "HEAD", "OPTIONS")
+
+
+class SessaoRoteada(Session):
+    """Sessão que usa a réplica sorteada para a requisição atual (`g.replica`), nas requisições somente de leitura.
+
+    Escritas (o flush de objetos e comandos INSERT, UPDATE e DELETE) sempre vão para o primário, mesmo nessas requisições.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not isinstance(clause, UpdateBase) and ler_da_replica():
+            return self._db.engines[g.replica]
+
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+def ler_da_replica() -> bool:
+    """Verifica se a requisição atual foi marcada para ler de uma réplica.
+
+    Returns:
+        bool: True dentro de uma requisição somente de leitura sem leituras recentes do primário.
+    """
+    return has_request_context() and g.get("replica") is not None
+
+
+def marcar_requisicao(replicas: list):
+    """Sorteia a réplica da requisição atual, se ela for somente de leitura e o cliente não tiver escrito há pouco.
+
+    Args:
+        replicas (list): Os nomes dos binds das réplicas.
+    """
+    ler_da_replica = request.method in METODOS_DE_LEITURA and COOKIE_PRIMARIO not in request.cookies
+    g.replica = random.choice(replicas) if ler_da_replica else None
+
+
+def fixar_no_primario(response, janela: float):
+    """Depois de uma escrita bem-sucedida, faz as próximas leituras do cliente irem ao primário por `janela` segundos.
+
+    Args:
+        response (Response): A resposta da requisição.
+        janela (float): O tempo, em segundos, em que as leituras do cliente vão ao primário.
+
+    Returns:
+        Response: A própria resposta.
+    """
+    if request.method not in METODOS_DE_LEITURA and response.status_code < 400:
+        response.set_cookie(COOKIE_PRIMARIO, "1", max_age=max(1, round(janela)), httponly=True, samesite="Lax")
+
+    return response
+
+
+def init_app(app):
+    """Registra, na aplicação, a marcação das requisições, se houver réplicas configuradas.
+
+    Args:
+        app (Flask): A aplicação Flask.
+    """
+    binds = app.config.get("SQLALCHEMY_BINDS") or {}
+    replicas = sorted(nome for nome in binds if nome.startswith(PREFIXO_REPLICA))
+    if not replicas:
+        return
+
+    janela = app.config.get("REPLICA_JANELA_CONSISTENCIA", 5)
+
+    app.before_request(lambda: marcar_requisicao(replicas))
+    app.after_request(lambda response: fixar_no_primario(response, janela))
@@ -0,0 +1,58 @@
+"""
+Módulo de transmissão de listagens em NDJSON.
+
+Este módulo fornece funções para que as listagens possam ser exportadas como NDJSON (um objeto JSON por linha),
+lendo o banco com um cursor do lado do servidor em lotes, para que a memória usada não dependa do tamanho da tabela.
+"""
+
+from flask import request, current_app, Response, stream_with_context
+from app.extensions import db
+
+MIMETYPE_NDJSON = "application/x-ndjson"
+TAMANHO_LOTE = 1000
+
+
+def pediu_ndjson() -> bool:
+    """Verifica se a requisição pediu a listagem em NDJSON, pelo parâmetro `stream=1` ou pelo cabeçalho `Accept`.
+
+    Returns:
+        bool: True se a listagem deve ser transmitida em NDJSON.
+    """
+    if request.args.get("stream") in ("1", "true"):
+        return True
+
+    return request.accept_mimetypes.best_match(["application/json", MIMETYPE_NDJSON]) == MIMETYPE_NDJSON
+
+
+def consultar_em_lotes(consulta):
+    """Executa uma consulta com um cursor do lado do servidor, buscando as linhas em lotes de `TAMANHO_LOTE`.
+
+    Args:
+        consulta (Select): A consulta a ser executada.
+
+    Returns:
+        Result: O resultado da consulta, que busca o próximo lote à medida que é percorrido.
+    """
+    return db.session.execute(consulta.execution_options(yield_per=TAMANHO_LOTE))
+
+
+def transmitir_ndjson(itens, serializar) -> Response:
+    """Transmite os itens de uma listagem em NDJSON, serializando um item por vez.
+
+    Args:
+        itens (Result | iterable): Os itens a serem transmitidos (ex: o retorno de `consultar_em_lotes`).
+        serializar (callable): Função que recebe um item e retorna o dicionário a ser enviado.
+
+    Returns:
+        Response: Resposta transmitida com um objeto JSON por linha.
+    """
+    def gerar():
+        try:
+            for item in itens:
+                yield current_app.json.dumps(serializar(item)) + "\n"
+        finally:
+            fechar = getattr(itens, "close", None)
+            if fechar is not None:
+                fechar()
+
+    return Response(stream_with_context(gerar()), mimetype=MIMETYPE_NDJSON)
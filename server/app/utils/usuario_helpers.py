@@ -1,13 +1,113 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
 from flask_bcrypt import Bcrypt
+from .executor_helpers import ExecutorLimitado
 
 bcrypt = Bcrypt()
 
+
+class VerificadorSenhas(ExecutorLimitado):
+    """Executor das operações do Bcrypt (geração e verificação de hashes) em um pool de threads limitado.
+
+    O Bcrypt libera o GIL durante o cálculo do hash, então as threads do pool trabalham em paralelo sem segurar
+    a thread que atende a requisição. O limite de vagas faz com que um pico de logins espere na fila ou seja
+    recusado (`FilaCheiaError`), em vez de ocupar todos os workers do servidor.
+
+    Configurações lidas da aplicação:
+        SENHA_HASH_TRABALHADORES (int): Número de threads do pool (0 calcula na própria thread da requisição).
+        SENHA_HASH_FILA_MAXIMA (int): Número máximo de verificações aguardando uma thread livre.
+        SENHA_HASH_TIMEOUT (float): Tempo máximo, em segundos, de espera por uma verificação.
+        BCRYPT_LOG_ROUNDS (int): O custo dos hashes gerados (lido pelo Flask-Bcrypt).
+
+    Atributos:
+        tarefas (int): Número de operações executadas no pool.
+        espera_total (float): Soma dos tempos, em segundos, que as operações aguardaram na fila.
+        espera_maxima (float): Maior tempo, em segundos, que uma operação aguardou na fila.
+    """
+
+    def __init__(self, app=None):
+        super().__init__(lambda trabalhadores: ThreadPoolExecutor(max_workers=trabalhadores, thread_name_prefix="bcrypt"))
+        self._lock_metricas = threading.Lock()
+        self.zerar_metricas()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Configura o Flask-Bcrypt e o pool a partir da configuração da aplicação.
+
+        Args:
+            app (Flask): A aplicação Flask.
+        """
+        bcrypt.init_app(app)
+        self.configurar(
+            trabalhadores=app.config.get("SENHA_HASH_TRABALHADORES", os.cpu_count() or 1),
+            fila_maxima=app.config.get("SENHA_HASH_FILA_MAXIMA", 64),
+            timeout=app.config.get("SENHA_HASH_TIMEOUT", 10.0)
+        )
+        self.zerar_metricas()
+        app.extensions["verificador_senhas"] = self
+
+    def zerar_metricas(self):
+        """Zera as métricas de espera na fila."""
+        with self._lock_metricas:
+            self.tarefas = 0
+            self.espera_total = 0.0
+            self.espera_maxima = 0.0
+
+    @property
+    def espera_media(self) -> float:
+        """float: O tempo médio, em segundos, que as operações aguardaram na fila (0 quando não houve operações)."""
+        return self.espera_total / self.tarefas if self.tarefas else 0.0
+
+    def metricas(self) -> dict:
+        """Retorna as métricas do pool.
+
+        Returns:
+            dict: {"tarefas": int, "espera_media": float, "espera_maxima": float}, com os tempos em segundos.
+        """
+        with self._lock_metricas:
+            return {"tarefas": self.tarefas, "espera_media": self.espera_media, "espera_maxima": self.espera_maxima}
+
+    def executar(self, funcao, *args):
+        """Executa uma operação do Bcrypt no pool, registrando quanto tempo ela aguardou por uma thread livre.
+
+        Args:
+            funcao (callable): A função a ser executada.
+            *args: Os argumentos da função.
+
+        Returns:
+            O resultado da função.
+
+        Raises:
+            FilaCheiaError: Se o pool já estiver com todas as vagas ocupadas.
+            TempoEsgotadoError: Se a operação não terminar dentro do tempo limite.
+        """
+        if self.trabalhadores <= 0:
+            return funcao(*args)
+
+        return super().executar(self._medir_espera, time.monotonic(), funcao, *args)
+
+    def _medir_espera(self, enfileirado_em: float, funcao, *args):
+        espera = time.monotonic() - enfileirado_em
+        with self._lock_metricas:
+            self.tarefas += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+        return funcao(*args)
+
+
+verificador_senhas = VerificadorSenhas()
+
 def gerar_hashing (senha: str):
     """
     Gera um hash seguro para a senha fornecida utilizando o Bcrypt.
 
-    Essa função utiliza o método generate_password_hash do Flask-Bcrypt para criar um hash a partir da senha
-    em texto plano. Em seguida, o hash gerado é decodificado para o formato UTF-8, retornando uma string.
+    Essa função utiliza o método generate_password_hash do Flask-Bcrypt, no pool do `verificador_senhas`, para criar
+    um hash a partir da senha em texto plano. Em seguida, o hash gerado é decodificado para o formato UTF-8, retornando uma string.
 
     Args:
         senha (str): A senha em texto plano que será convertida em hash.
@@ -15,14 +115,14 @@ def gerar_hashing (senha: str):
     Returns:
         str: O hash da senha, decodificado como uma string UTF-8.
     """
-    return bcrypt.generate_password_hash(senha).decode('utf-8')
+    return verificador_senhas.executar(bcrypt.generate_password_hash, senha).decode('utf-8')
 
 def checar_senha (senha: str, hashed: str):
     """
     Verifica se a senha fornecida corresponde ao hash armazenado.
 
-    Essa função utiliza o método check_password_hash do Flask-Bcrypt para comparar uma senha em texto plano 
-    com um hash previamente gerado. Retorna True se a senha corresponder ao hash e False caso contrário.
+    Essa função utiliza o método check_password_hash do Flask-Bcrypt, no pool do `verificador_senhas`, para comparar
+    uma senha em texto plano com um hash previamente gerado. Retorna True se a senha corresponder ao hash e False caso contrário.
 
     Args:
         senha (str): A senha em texto plano que será verificada.
@@ -31,5 +131,22 @@ def checar_senha (senha: str, hashed: str):
     Returns:
         bool: True se a senha corresponder ao hash, False caso contrário.
     """
-    return bcrypt.check_password_hash(hashed, senha)
+    return verificador_senhas.executar(bcrypt.check_password_hash, hashed, senha)
+
+
+def precisa_novo_hash(hashed: str) -> bool:
+    """Verifica se um hash foi gerado com um custo diferente do configurado em `BCRYPT_LOG_ROUNDS`.
+
+    Args:
+        hashed (str): O hash da senha, no formato "$2b$<custo>$<sal e hash>".
+
+    Returns:
+        bool: True se a senha deve ter o hash gerado de novo com o custo atual.
+    """
+    try:
+        custo = int(hashed.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+
+    return custo != current_app.config.get("BCRYPT_LOG_ROUNDS", 12)
 
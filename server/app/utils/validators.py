@@ -439,6 +439,8 @@ def validar_aula (hora_inicio: str, hora_fim: str, dias_da_semana: list, usuario
 
     if not hora_fim or not isinstance(hora_fim, str) or not validar_hora(hora_fim):
         erros.append("O atributo 'hora_fim' é obrigatório e deve ter o formato correto")
+    elif not erros and hora_fim <= hora_inicio:
+        erros.append("O atributo 'hora_fim' deve ser posterior ao atributo 'hora_inicio'")
 
     if not dias_da_semana or not isinstance(dias_da_semana, list) or len(dias_da_semana) <= 0:
         erros.append("O campo 'dias_da_semana' é obrigatório e deve ser no mínimo 5 e no máximo 7")
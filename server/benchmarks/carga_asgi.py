@@ -0,0 +1,171 @@
+"""
+Teste de carga que compara o servidor síncrono (Flask com uma thread por requisição) com o modo ASGI.
+
+O script inicia cada servidor em um subprocesso, na porta informada, e dispara durante alguns segundos requisições
+simultâneas às leituras de notas, ausências e aulas do professor, medindo a vazão, as latências (p50, p95 e p99), os
+erros e o número máximo de conexões abertas pelo servidor no banco (`pg_stat_activity`).
+
+O cliente HTTP (`httpx`) é uma dependência apenas dos benchmarks, instalada com
+`pip install -r requirements-benchmarks.txt`.
+
+Uso (a partir da pasta *server*, depois de `python -m benchmarks.seed --recriar`):
+    python -m benchmarks.carga_asgi
+    python -m benchmarks.carga_asgi --clientes 200 --duracao 20 --modos asgi
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import signal
+import statistics
+import subprocess
+import sys
+import time
+import httpx
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.utils.login_helpers import gerar_token
+from app.utils.pool_helpers import PREFIXO_APLICACAO
+
+
+COMANDOS = {
+    # o mesmo servidor de `run.py`, sem o modo de depuração: uma thread por requisição
+    "wsgi": [sys.executable, "-m", "flask", "--app", "run", "run", "--with-threads", "--port", "{porta}"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi:app", "--port", "{porta}", "--log-level", "warning"],
+}
+
+
+def montar_caminhos(quantidade: int) -> tuple:
+    """Escolhe, no banco, as leituras do teste e o token de um professor com aulas.
+
+    Returns:
+        tuple: O token do professor e a lista de caminhos a serem requisitados.
+    """
+    linhas = db.session.execute(text(
+        """SELECT b.aula_id, b.aluno_matricula, u.cpf
+           FROM boletim b JOIN aula a ON a.id = b.aula_id JOIN usuario u ON u.id = a.usuario_id
+           ORDER BY random() LIMIT :quantidade"""
+    ), {"quantidade": quantidade}).all()
+    if not linhas:
+        raise SystemExit("O banco não possui boletins; execute antes `python -m benchmarks.seed --recriar`.")
+
+    caminhos = ["/boletim/"]
+    for aula_id, matricula, _ in linhas:
+        caminhos += [f"/notas/{aula_id}", f"/notas/{matricula}/{aula_id}", f"/ausencias/{aula_id}/{matricula}"]
+
+    return gerar_token(usuario_cpf=linhas[0].cpf, usuario_tipo="p"), caminhos
+
+
+async def disparar(url: str, token: str, caminhos: list, clientes: int, duracao: float) -> dict:
+    """Mantém `clientes` requisições simultâneas durante `duracao` segundos.
+
+    Returns:
+        dict: As latências, em segundos, das respostas com sucesso, e o número de erros.
+    """
+    latencias, erros = [], 0
+    limite = httpx.Limits(max_connections=clientes, max_keepalive_connections=clientes)
+
+    async with httpx.AsyncClient(base_url=url, cookies={"auth_token": token}, limits=limite, timeout=60) as cliente:
+        fim = time.perf_counter() + duracao
+
+        async def usuario():
+            nonlocal erros
+            while time.perf_counter() < fim:
+                inicio = time.perf_counter()
+                try:
+                    resposta = await cliente.get(random.choice(caminhos))
+                    if resposta.status_code < 500:
+                        latencias.append(time.perf_counter() - inicio)
+                        continue
+                except httpx.HTTPError:
+                    pass
+                erros += 1
+
+        await asyncio.gather(*(usuario() for _ in range(clientes)))
+
+    return {"latencias": latencias, "erros": erros}
+
+
+def contar_conexoes(pid: int) -> int:
+    """Conta as conexões abertas no banco pelo servidor (identificadas pelo `application_name`)."""
+    consulta = text("SELECT count(*) FROM pg_stat_activity WHERE application_name = :nome")
+    return db.session.execute(consulta, {"nome": f"{PREFIXO_APLICACAO}:{pid}"}).scalar()
+
+
+def percentil(valores: list, p: float) -> float:
+    """Retorna o percentil `p` (0 a 100) dos valores, em milissegundos."""
+    return 1000 * statistics.quantiles(valores, n=100, method="inclusive")[max(0, min(98, round(p) - 1))]
+
+
+def medir(modo: str, porta: int, token: str, caminhos: list, clientes: int, duracao: float) -> dict:
+    """Inicia o servidor do modo informado, executa a carga e encerra o servidor.
+
+    Returns:
+        dict: A vazão, as latências, os erros e o pico de conexões com o banco do modo.
+    """
+    comando = [parte.format(porta=porta) for parte in COMANDOS[modo]]
+    servidor = subprocess.Popen(comando, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{porta}"
+
+    try:
+        for _ in range(100):
+            try:
+                httpx.get(url + "/boletim/", cookies={"auth_token": token}, timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        else:
+            raise SystemExit(f"O servidor {modo} não iniciou.")
+
+        pico_conexoes = 0
+
+        async def executar():
+            nonlocal pico_conexoes
+            tarefa = asyncio.create_task(disparar(url, token, caminhos, clientes, duracao))
+            while not tarefa.done():
+                pico_conexoes = max(pico_conexoes, contar_conexoes(servidor.pid))
+                db.session.rollback()
+                await asyncio.sleep(0.5)
+            return await tarefa
+
+        resultado = asyncio.run(executar())
+    finally:
+        servidor.send_signal(signal.SIGINT)
+        servidor.wait(timeout=30)
+
+    latencias = resultado["latencias"]
+    return {
+        "modo": modo,
+        "requisicoes_por_segundo": len(latencias) / duracao,
+        "p50_ms": percentil(latencias, 50),
+        "p95_ms": percentil(latencias, 95),
+        "p99_ms": percentil(latencias, 99),
+        "erros": resultado["erros"],
+        "pico_conexoes": pico_conexoes,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara o servidor síncrono com o modo ASGI sob carga.")
+    parser.add_argument("--clientes", type=int, default=100, help="número de requisições simultâneas")
+    parser.add_argument("--duracao", type=float, default=10, help="duração de cada medição, em segundos")
+    parser.add_argument("--modos", nargs="+", choices=COMANDOS, default=list(COMANDOS))
+    parser.add_argument("--porta", type=int, default=5050)
+    argumentos = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        token, caminhos = montar_caminhos(200)
+
+        print(f"{'modo':6} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'erros':>7} {'conexões':>9}")
+        for modo in argumentos.modos:
+            r = medir(modo, argumentos.porta, token, caminhos, argumentos.clientes, argumentos.duracao)
+            print(f"{r['modo']:6} {r['requisicoes_por_segundo']:>9.1f} {r['p50_ms']:>9.1f} {r['p95_ms']:>9.1f} "
+                  f"{r['p99_ms']:>9.1f} {r['erros']:>7} {r['pico_conexoes']:>9}")
+
+
+if __name__ == "__main__":
+    os.environ.setdefault("PYTHONUNBUFFERED", "1")
+    main()
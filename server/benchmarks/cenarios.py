@@ -0,0 +1,260 @@
+"""
+Benchmark de latência e de consultas por requisição com o tráfego de um dia letivo.
+
+O script executa, na própria aplicação (pelo cliente de teste do Flask, sem a rede), os cenários abaixo com vários
+usuários simultâneos (threads) e mede, para cada requisição, a latência e o número de comandos SQL enviados ao banco:
+
+    login: vários professores entrando no sistema ao mesmo tempo (POST /auth/login).
+    chamada: o professor abre a lista da aula e registra as ausências (GET e PUT /ausencias/<aula_id>).
+    notas: o professor abre a lista da aula, consulta e altera as notas de alguns alunos (/notas).
+    boletim_pdf: download do boletim em PDF de um aluno (GET /boletim/<matricula>).
+
+O resultado (p50, p95 e p99 em milissegundos, consultas por requisição e vazão) é salvo em
+benchmarks/resultados/<commit>.json, e pode ser comparado com o de outro commit pela opção --comparar.
+
+Uso (a partir da pasta *server*):
+    python -m benchmarks.cenarios --popular
+    python -m benchmarks.cenarios --usuarios 16 --repeticoes 50
+    python -m benchmarks.cenarios --comparar benchmarks/resultados/abc1234.json
+
+Atenção: `--popular` apaga todas as tabelas do banco configurado antes de criar a escola sintética (20.000 alunos em
+800 turmas, 6.000 aulas e 150.000 boletins).
+"""
+
+import argparse
+import json
+import math
+import os
+import random
+import subprocess
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import event, text
+from app import create_app
+from app.extensions import db
+from app.utils.login_helpers import gerar_token
+from benchmarks.seed import popular
+
+
+PASTA_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+SENHA_PROFESSORES = "senha123"
+LIMITE_REGRESSAO = 0.2
+
+
+class Medidor:
+    """Registra a latência, o status e o número de comandos SQL de cada requisição, agrupados pelo nome.
+
+    Os comandos são contados por thread, e cada requisição do cliente de teste é executada na thread que a fez.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.amostras = defaultdict(list)
+
+    def contar_consulta(self, *args):
+        self._local.consultas = getattr(self._local, "consultas", 0) + 1
+
+    def requisitar(self, nome: str, metodo, *args, **kwargs):
+        """Executa uma requisição do cliente de teste, registrando a amostra em `nome`."""
+        self._local.consultas = 0
+        inicio = time.perf_counter()
+        resposta = metodo(*args, **kwargs)
+        resposta.get_data()
+        duracao = time.perf_counter() - inicio
+
+        with self._lock:
+            self.amostras[nome].append((duracao, self._local.consultas, resposta.status_code))
+        return resposta
+
+
+def cenario_login(cliente, medidor: Medidor, dados: dict, rng: random.Random):
+    professor = rng.choice(dados["professores"])
+    medidor.requisitar("POST /auth/login", cliente.post, "/auth/login", json={"email": professor["email"], "senha": SENHA_PROFESSORES})
+
+
+def cenario_chamada(cliente, medidor: Medidor, dados: dict, rng: random.Random):
+    aula_id = rng.choice(dados["aulas"])
+    alunos = medidor.requisitar("GET /ausencias/<aula_id>", cliente.get, f"/ausencias/{aula_id}").json["alunos"]
+
+    chamada = [{"matricula": aluno["matricula"], "ausencia": rng.random() < 0.1} for aluno in alunos]
+    medidor.requisitar("PUT /ausencias/<aula_id>", cliente.put, f"/ausencias/{aula_id}", json={"alunos": chamada})
+
+
+def cenario_notas(cliente, medidor: Medidor, dados: dict, rng: random.Random):
+    aula_id = rng.choice(dados["aulas"])
+    alunos = medidor.requisitar("GET /notas/<aula_id>", cliente.get, f"/notas/{aula_id}").json["alunos"]
+
+    for aluno in rng.sample(alunos, min(5, len(alunos))):
+        caminho = f"/notas/{aluno['matricula']}/{aula_id}"
+        medidor.requisitar("GET /notas/<matricula>/<aula_id>", cliente.get, caminho)
+        notas = [round(rng.uniform(0, 10), 1) for _ in range(4)]
+        medidor.requisitar("PUT /notas/<matricula>/<aula_id>", cliente.put, caminho, json={"notas": notas})
+
+
+def cenario_boletim_pdf(cliente, medidor: Medidor, dados: dict, rng: random.Random):
+    matricula = rng.choice(dados["matriculas"])
+    medidor.requisitar("GET /boletim/<matricula>", cliente.get, f"/boletim/{matricula}")
+
+
+CENARIOS = {
+    "login": cenario_login,
+    "chamada": cenario_chamada,
+    "notas": cenario_notas,
+    "boletim_pdf": cenario_boletim_pdf,
+}
+
+
+def carregar_dados() -> dict:
+    """Escolhe, no banco, os professores, as aulas e os alunos usados nos cenários."""
+    professores = [dict(linha._mapping) for linha in db.session.execute(text("SELECT cpf, email FROM usuario WHERE tipo = 'p'"))]
+    aulas = db.session.execute(text("SELECT id FROM aula")).scalars().all()
+    matriculas = db.session.execute(text("SELECT aluno_matricula FROM boletim TABLESAMPLE SYSTEM (5)")).scalars().all()
+    db.session.rollback()
+
+    if not professores or not aulas or not matriculas:
+        raise SystemExit("O banco não possui dados; execute antes com a opção --popular.")
+
+    return {"professores": professores, "aulas": aulas, "matriculas": sorted(set(matriculas))}
+
+
+def executar_cenario(app, nome: str, dados: dict, usuarios: int, repeticoes: int, semente: int) -> dict:
+    """Executa um cenário com `usuarios` threads, cada uma repetindo-o `repeticoes` vezes.
+
+    Returns:
+        dict: As estatísticas de cada requisição do cenário e a vazão total.
+    """
+    medidor = Medidor()
+
+    def usuario(indice: int):
+        rng = random.Random(semente * 1000 + indice)
+        cliente = app.test_client()
+        with app.app_context():
+            professor = dados["professores"][indice % len(dados["professores"])]
+            cliente.set_cookie("auth_token", gerar_token(professor["cpf"], "p"))
+        for _ in range(repeticoes):
+            CENARIOS[nome](cliente, medidor, dados, rng)
+
+    with app.app_context():
+        event.listen(db.engine, "before_cursor_execute", medidor.contar_consulta)
+    try:
+        inicio = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=usuarios) as executor:
+            list(executor.map(usuario, range(usuarios)))
+        duracao = time.perf_counter() - inicio
+    finally:
+        with app.app_context():
+            event.remove(db.engine, "before_cursor_execute", medidor.contar_consulta)
+
+    total = sum(len(amostras) for amostras in medidor.amostras.values())
+    return {
+        "requisicoes_por_segundo": round(total / duracao, 1),
+        "requisicoes": {requisicao: resumir(amostras) for requisicao, amostras in medidor.amostras.items()},
+    }
+
+
+def percentil(valores: list, p: float) -> float:
+    """Retorna o percentil `p` (0 a 100) de uma lista ordenada, pelo método do vizinho mais próximo."""
+    return valores[min(len(valores) - 1, max(0, math.ceil(p / 100 * len(valores)) - 1))]
+
+
+def resumir(amostras: list) -> dict:
+    """Resume as amostras de uma requisição: latências em milissegundos, consultas e erros."""
+    latencias = sorted(1000 * duracao for duracao, _, _ in amostras)
+    consultas = [quantidade for _, quantidade, _ in amostras]
+    return {
+        "quantidade": len(amostras),
+        "erros": sum(1 for _, _, status in amostras if status >= 400),
+        "p50_ms": round(percentil(latencias, 50), 2),
+        "p95_ms": round(percentil(latencias, 95), 2),
+        "p99_ms": round(percentil(latencias, 99), 2),
+        "consultas_media": round(sum(consultas) / len(consultas), 2),
+        "consultas_maximo": max(consultas),
+    }
+
+
+def identificar_commit() -> str:
+    """Retorna o hash abreviado do commit atual (com o sufixo "-sujo" se houver alterações não commitadas)."""
+    try:
+        commit = subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+        alterado = subprocess.run(["git", "diff", "--quiet", "HEAD"]).returncode != 0
+        return commit + ("-sujo" if alterado else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "sem-commit"
+
+
+def comparar(anterior: dict, atual: dict):
+    """Mostra a variação do p95 e das consultas por requisição em relação a um resultado anterior.
+
+    Uma requisição regrediu se o p95 aumentou mais que `LIMITE_REGRESSAO` (20%) ou se passou a fazer, em média, pelo
+    menos uma consulta a mais. O script termina com erro se houver alguma regressão.
+    """
+    print(f"\nComparação com {anterior['commit']} ({anterior['data']}):")
+    regressoes = 0
+    for cenario, resultado in atual["cenarios"].items():
+        for requisicao, estatisticas in resultado["requisicoes"].items():
+            antes = anterior["cenarios"].get(cenario, {}).get("requisicoes", {}).get(requisicao)
+            if antes is None:
+                continue
+
+            variacao = estatisticas["p95_ms"] / antes["p95_ms"] - 1 if antes["p95_ms"] else 0.0
+            # a média de consultas varia um pouco com as aulas sorteadas; uma consulta a mais por requisição já é regressão
+            regrediu = variacao > LIMITE_REGRESSAO or estatisticas["consultas_media"] >= antes["consultas_media"] + 1
+            regressoes += regrediu
+            print(f"  {'REGRESSÃO ' if regrediu else '          '}{requisicao:34} p95 {antes['p95_ms']:>9.2f} -> {estatisticas['p95_ms']:>9.2f} ms "
+                  f"({variacao:+.0%})  consultas {antes['consultas_media']:>6.2f} -> {estatisticas['consultas_media']:>6.2f}")
+
+    if regressoes:
+        raise SystemExit(f"{regressoes} requisição(ões) com regressão.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede latência e consultas por requisição nos cenários de um dia letivo.")
+    parser.add_argument("--cenarios", nargs="+", choices=CENARIOS, default=list(CENARIOS))
+    parser.add_argument("--usuarios", type=int, default=8, help="número de usuários simultâneos (threads)")
+    parser.add_argument("--repeticoes", type=int, default=25, help="repetições do cenário por usuário")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--popular", action="store_true", help="apaga o banco e cria a escola sintética antes de medir")
+    parser.add_argument("--comparar", metavar="ARQUIVO", help="resultado anterior (JSON) a ser comparado com o atual")
+    argumentos = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if argumentos.popular:
+            db.drop_all()
+            db.create_all()
+            popular(alunos=20000, aulas=6000, alunos_por_turma=25, professores=120, disciplinas=10)
+
+        dados = carregar_dados()
+
+    resultado = {
+        "commit": identificar_commit(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "parametros": {"usuarios": argumentos.usuarios, "repeticoes": argumentos.repeticoes, "semente": argumentos.semente},
+        "cenarios": {},
+    }
+
+    for nome in argumentos.cenarios:
+        resultado["cenarios"][nome] = estatisticas = executar_cenario(app, nome, dados, argumentos.usuarios, argumentos.repeticoes, argumentos.semente)
+
+        print(f"{nome} ({estatisticas['requisicoes_por_segundo']} req/s)")
+        for requisicao, r in estatisticas["requisicoes"].items():
+            print(f"  {requisicao:34} n={r['quantidade']:<5} erros={r['erros']:<4} p50={r['p50_ms']:>8.2f} p95={r['p95_ms']:>8.2f} "
+                  f"p99={r['p99_ms']:>8.2f} ms  consultas={r['consultas_media']:.1f} (máx. {r['consultas_maximo']})")
+
+    os.makedirs(PASTA_RESULTADOS, exist_ok=True)
+    caminho = os.path.join(PASTA_RESULTADOS, f"{resultado['commit']}.json")
+    with open(caminho, "w", encoding="utf-8") as arquivo:
+        json.dump(resultado, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultado salvo em {caminho}")
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as arquivo:
+            comparar(json.load(arquivo), resultado)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Compara os planos das consultas mais frequentes com e sem os índices declarados nos modelos.
+
+Para cada consulta, o script executa `EXPLAIN ANALYZE` primeiro dentro de uma transação em que os índices dos modelos
+são removidos (e que depois é desfeita, então o banco não é alterado) e em seguida com os índices, mostrando o tipo
+de varredura escolhido e o tempo de execução de cada plano.
+
+Uso (a partir da pasta *server*, depois de `python -m benchmarks.seed --recriar` e `flask --app run db upgrade`):
+    python -m benchmarks.explain_indices
+    python -m benchmarks.explain_indices --planos
+"""
+
+import argparse
+import json
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+
+
+CONSULTAS = [
+    ("boletins de uma aula", "SELECT * FROM boletim WHERE aula_id = :aula_id"),
+    ("aulas de um professor", "SELECT * FROM aula WHERE usuario_id = :usuario_id"),
+    ("aula de uma disciplina na turma", "SELECT * FROM aula WHERE disciplina_codigo = :disciplina_codigo AND turma_id = :turma_id"),
+    ("turma na sala, ano e turno", "SELECT * FROM turma WHERE sala_numero = :sala_numero AND calendario_ano_letivo = :ano_letivo AND turno = :turno"),
+    ("alunos de uma turma", "SELECT * FROM aluno_turma WHERE turma_id = :turma_id"),
+]
+
+
+def escolher_parametros() -> dict:
+    """Escolhe os parâmetros das consultas a partir de uma aula qualquer do banco."""
+    linha = db.session.execute(text(
+        """SELECT a.id AS aula_id, a.usuario_id, a.disciplina_codigo, a.turma_id, t.sala_numero,
+                  t.calendario_ano_letivo AS ano_letivo, t.turno
+           FROM aula a JOIN turma t ON t.id = a.turma_id
+           ORDER BY a.id DESC LIMIT 1"""
+    )).first()
+    if linha is None:
+        raise SystemExit("O banco não possui aulas; execute antes `python -m benchmarks.seed --recriar`.")
+
+    return dict(linha._mapping)
+
+
+def resumir_plano(plano: dict) -> tuple:
+    """Retorna os tipos de varredura (com o índice usado, se houver) e o tempo de execução de um plano em JSON."""
+    varreduras = []
+
+    def percorrer(no):
+        if "Scan" in no["Node Type"]:
+            indice = no.get("Index Name")
+            varreduras.append(f"{no['Node Type']} ({indice})" if indice else no["Node Type"])
+        for filho in no.get("Plans", []):
+            percorrer(filho)
+
+    percorrer(plano["Plan"])
+    return ", ".join(varreduras), plano["Execution Time"]
+
+
+def explicar(sql: str, parametros: dict) -> tuple:
+    """Executa `EXPLAIN ANALYZE` de uma consulta, retornando o resumo e o plano completo em JSON."""
+    plano = db.session.execute(text(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}"), parametros).scalar()[0]
+    return resumir_plano(plano) + (plano,)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara os planos das consultas com e sem os índices dos modelos.")
+    parser.add_argument("--planos", action="store_true", help="mostra também os planos completos")
+    argumentos = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        parametros = escolher_parametros()
+        indices = [indice.name for tabela in db.metadata.sorted_tables for indice in tabela.indexes]
+
+        # sem os índices: removidos dentro de uma transação que é desfeita ao final
+        db.session.execute(text(f"DROP INDEX IF EXISTS {', '.join(indices)}"))
+        sem_indices = [explicar(sql, parametros) for _, sql in CONSULTAS]
+        db.session.rollback()
+
+        com_indices = [explicar(sql, parametros) for _, sql in CONSULTAS]
+        db.session.rollback()
+
+        for (nome, _), antes, depois in zip(CONSULTAS, sem_indices, com_indices):
+            print(f"{nome}:")
+            print(f"  sem índices: {antes[0]:<70} {antes[1]:>9.3f} ms")
+            print(f"  com índices: {depois[0]:<70} {depois[1]:>9.3f} ms")
+            if argumentos.planos:
+                print(json.dumps([antes[2], depois[2]], indent=2))
+
+
+if __name__ == "__main__":
+    main()
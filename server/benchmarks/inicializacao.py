@@ -0,0 +1,127 @@
+"""
+Mede o tempo de inicialização e a memória de cada worker do gunicorn, com e sem o `preload_app`.
+
+Para cada modo, o script inicia o gunicorn (gunicorn.conf.py) em um subprocesso, mede o tempo até a primeira resposta
+e até todos os workers responderem, faz algumas requisições para aquecer os workers e lê, em
+`/proc/<pid>/smaps_rollup`, a memória de cada um: RSS (inclui as páginas compartilhadas com o mestre), PSS (divide as
+páginas compartilhadas entre os processos que as usam) e USS (apenas as páginas exclusivas do worker).
+
+Uso (a partir da pasta *server*, no Linux, com um banco populado por `python -m benchmarks.seed --recriar`):
+    python -m benchmarks.inicializacao
+    python -m benchmarks.inicializacao --workers 8
+"""
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.utils.login_helpers import gerar_token
+
+
+def ler_memoria(pid: int) -> dict:
+    """Lê a memória de um processo, em MiB, a partir de `/proc/<pid>/smaps_rollup`."""
+    campos = {}
+    with open(f"/proc/{pid}/smaps_rollup") as arquivo:
+        for linha in arquivo:
+            partes = linha.split()
+            if len(partes) == 3 and partes[2] == "kB":
+                campos[partes[0].rstrip(":")] = int(partes[1]) / 1024
+
+    return {
+        "rss": campos["Rss"],
+        "pss": campos["Pss"],
+        "uss": campos["Private_Clean"] + campos["Private_Dirty"],
+    }
+
+
+def listar_workers(pid_mestre: int) -> list:
+    """Lista os PIDs dos processos filhos (workers) do mestre do gunicorn."""
+    with open(f"/proc/{pid_mestre}/task/{pid_mestre}/children") as arquivo:
+        return [int(pid) for pid in arquivo.read().split()]
+
+
+def requisitar(url: str, token: str) -> tuple:
+    """Faz uma requisição autenticada, retornando o status e o PID do worker que a atendeu (ou None se falhar)."""
+    requisicao = urllib.request.Request(url, headers={"Cookie": f"auth_token={token}"})
+    try:
+        with urllib.request.urlopen(requisicao, timeout=5) as resposta:
+            return resposta.status, json.loads(resposta.read())["padrao"]["pid"]
+    except (urllib.error.URLError, ConnectionError):
+        return None, None
+
+
+def medir(preload: bool, workers: int, porta: int, token: str) -> dict:
+    """Inicia o gunicorn com ou sem o `preload_app` e mede a inicialização e a memória dos workers."""
+    ambiente = dict(os.environ, GUNICORN_PRELOAD=str(preload).lower(), GUNICORN_WORKERS=str(workers), GUNICORN_BIND=f"127.0.0.1:{porta}")
+    url = f"http://127.0.0.1:{porta}/saude/pool"
+
+    inicio = time.perf_counter()
+    mestre = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"], env=ambiente, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        primeira_resposta = None
+        respondidos = set()
+        while len(respondidos) < workers:
+            if time.perf_counter() - inicio > 120:
+                raise SystemExit("Os workers não responderam em 120 segundos.")
+
+            status, pid = requisitar(url, token)
+            if status == 200:
+                primeira_resposta = primeira_resposta or time.perf_counter() - inicio
+                respondidos.add(pid)
+            else:
+                time.sleep(0.05)
+        todos_respondendo = time.perf_counter() - inicio
+
+        # aquece os workers (conexões com o banco, caches e imports feitos na primeira requisição)
+        for _ in range(20 * workers):
+            requisitar(url, token)
+
+        memoria = [ler_memoria(pid) for pid in listar_workers(mestre.pid)]
+        memoria_mestre = ler_memoria(mestre.pid)
+    finally:
+        mestre.send_signal(signal.SIGTERM)
+        mestre.wait(timeout=30)
+
+    return {
+        "preload": preload,
+        "primeira_resposta_s": primeira_resposta,
+        "todos_respondendo_s": todos_respondendo,
+        "mestre_rss_mib": memoria_mestre["rss"],
+        "worker_rss_mib": sum(m["rss"] for m in memoria) / len(memoria),
+        "worker_pss_mib": sum(m["pss"] for m in memoria) / len(memoria),
+        "worker_uss_mib": sum(m["uss"] for m in memoria) / len(memoria),
+        "total_pss_mib": memoria_mestre["pss"] + sum(m["pss"] for m in memoria),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mede a inicialização e a memória dos workers do gunicorn.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--porta", type=int, default=5060)
+    argumentos = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        cpf = db.session.execute(text("SELECT cpf FROM usuario ORDER BY id LIMIT 1")).scalar()
+        if cpf is None:
+            raise SystemExit("O banco não possui usuários; execute antes `python -m benchmarks.seed --recriar`.")
+        token = gerar_token(usuario_cpf=cpf, usuario_tipo="p")
+
+    print(f"{'preload':8} {'1ª resp. s':>10} {'todos s':>8} {'mestre RSS':>11} {'worker RSS':>11} {'worker PSS':>11} {'worker USS':>11} {'PSS total':>10}")
+    for preload in (False, True):
+        r = medir(preload, argumentos.workers, argumentos.porta, token)
+        print(f"{str(r['preload']):8} {r['primeira_resposta_s']:>10.2f} {r['todos_respondendo_s']:>8.2f} {r['mestre_rss_mib']:>11.1f} "
+              f"{r['worker_rss_mib']:>11.1f} {r['worker_pss_mib']:>11.1f} {r['worker_uss_mib']:>11.1f} {r['total_pss_mib']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
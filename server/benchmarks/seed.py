@@ -0,0 +1,124 @@
+"""
+Popula o banco configurado (variáveis DB_*) com um volume realista de dados para os benchmarks.
+
+Os dados são gerados pelo próprio PostgreSQL com `generate_series`, o que leva poucos segundos mesmo para dezenas de
+milhares de alunos. Por padrão são criados 50.000 alunos em turmas de 40, 2.000 aulas e os boletins dos alunos de
+cada aula.
+
+Uso (a partir da pasta *server*):
+    python -m benchmarks.seed --recriar
+    python -m benchmarks.seed --alunos 10000 --aulas 500 --recriar
+
+Atenção: `--recriar` apaga todas as tabelas do banco configurado antes de popular.
+"""
+
+import argparse
+import math
+import time
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.utils.usuario_helpers import gerar_hashing
+
+
+ANO_LETIVO = 2026
+TURNOS = ["M", "T", "N"]
+
+
+def popular(alunos: int, aulas: int, alunos_por_turma: int, professores: int, disciplinas: int) -> dict:
+    """Insere os dados do benchmark no banco.
+
+    Args:
+        alunos (int): Número de alunos.
+        aulas (int): Número de aulas, distribuídas entre as turmas.
+        alunos_por_turma (int): Número de alunos de cada turma.
+        professores (int): Número de professores, que se revezam entre as aulas.
+        disciplinas (int): Número de disciplinas.
+
+    Returns:
+        dict: O número de linhas de cada tabela após a inserção.
+    """
+    turmas = math.ceil(alunos / alunos_por_turma)
+    salas = math.ceil(turmas / len(TURNOS))
+    parametros = {
+        "ano": ANO_LETIVO, "alunos": alunos, "aulas": aulas, "por_turma": alunos_por_turma, "turmas": turmas,
+        "salas": salas, "professores": professores, "disciplinas": disciplinas, "senha": gerar_hashing("senha123")
+    }
+
+    comandos = [
+        "INSERT INTO calendario (ano_letivo, data_inicio, data_fim, dias_letivos) VALUES (:ano, make_date(:ano, 2, 17), make_date(:ano, 11, 27), 150)",
+        "INSERT INTO sala (numero, localizacao, capacidade) SELECT i, 'Bloco ' || (i % 10), :por_turma FROM generate_series(1, :salas) i",
+        """INSERT INTO disciplina (codigo, nome, carga_horaria)
+           SELECT 'BEN' || lpad(i::text, 3, '0'), 'Disciplina ' || i, 60 FROM generate_series(1, :disciplinas) i""",
+        """INSERT INTO usuario (cpf, nome, email, senha, telefone, endereco, horario_de_trabalho, data_de_nascimento, tipo, formacao)
+           SELECT '9' || lpad(i::text, 10, '0'), 'Professor ' || i, 'professor' || i || '@bench.local', :senha,
+                  '79 9 9999-0000', 'Rua A', 'Seg-Sex,7h-12h', make_date(1980, 1, 1), 'p', 'Licenciatura'
+           FROM generate_series(1, :professores) i""",
+        """INSERT INTO turma (ano, serie, nivel_de_ensino, turno, status, sala_numero, calendario_ano_letivo)
+           SELECT 1 + i % 9, chr(65 + i % 5), 'Ensino Fundamental', (ARRAY['M', 'T', 'N'])[1 + i / :salas], 'A', 1 + i % :salas, :ano
+           FROM generate_series(0, :turmas - 1) i""",
+        """INSERT INTO aluno (matricula, nome, email, telefone, endereco, data_de_nascimento)
+           SELECT :ano || lpad(i::text, 8, '0'), 'Aluno ' || i, 'aluno' || i || '@bench.local', '79 9 1234-5678', 'Rua B',
+                  make_date(2011, 1, 1) + i % 365
+           FROM generate_series(1, :alunos) i""",
+        """INSERT INTO aluno_turma (aluno_matricula, turma_id)
+           SELECT a.matricula, t.id
+           FROM (SELECT matricula, row_number() OVER (ORDER BY matricula) - 1 AS n FROM aluno) a
+           JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM turma WHERE calendario_ano_letivo = :ano) t
+             ON t.n = a.n / :por_turma""",
+        """INSERT INTO aula (hora_inicio, hora_fim, dias_da_semana, usuario_id, disciplina_codigo, turma_id)
+           SELECT make_time(7 + j % 4 * 2, 0, 0), make_time(9 + j % 4 * 2, 0, 0), ARRAY['Segunda', 'Quarta'],
+                  p.id, 'BEN' || lpad((1 + (j / :turmas) % :disciplinas)::text, 3, '0'), t.id
+           FROM generate_series(0, :aulas - 1) j
+           JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM turma WHERE calendario_ano_letivo = :ano) t
+             ON t.n = j % :turmas
+           JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS n FROM usuario WHERE tipo = 'p') p
+             ON p.n = j % :professores""",
+        """INSERT INTO boletim (aluno_matricula, aula_id, notas, ausencias, situacao)
+           SELECT at.aluno_matricula, a.id,
+                  ARRAY[round((random() * 10)::numeric, 1), round((random() * 10)::numeric, 1),
+                        round((random() * 10)::numeric, 1), round((random() * 10)::numeric, 1)]::float[],
+                  (random() * 20)::int, 'M'
+           FROM aula a JOIN aluno_turma at ON at.turma_id = a.turma_id""",
+    ]
+
+    for comando in comandos:
+        db.session.execute(text(comando), parametros)
+    db.session.commit()
+
+    db.session.execute(text("ANALYZE"))
+    db.session.commit()
+
+    tabelas = ["aluno", "turma", "aluno_turma", "aula", "boletim"]
+    return {tabela: db.session.execute(text(f"SELECT count(*) FROM {tabela}")).scalar() for tabela in tabelas}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Popula o banco com dados para os benchmarks.")
+    parser.add_argument("--alunos", type=int, default=50000)
+    parser.add_argument("--aulas", type=int, default=2000)
+    parser.add_argument("--alunos-por-turma", type=int, default=40)
+    parser.add_argument("--professores", type=int, default=100)
+    parser.add_argument("--disciplinas", type=int, default=10)
+    parser.add_argument("--recriar", action="store_true", help="apaga e recria todas as tabelas antes de popular")
+    argumentos = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        if argumentos.recriar:
+            db.drop_all()
+        db.create_all()
+
+        if db.session.execute(text("SELECT EXISTS (SELECT 1 FROM aluno)")).scalar():
+            parser.error("o banco já possui alunos; use --recriar para apagar os dados existentes")
+
+        inicio = time.perf_counter()
+        contagens = popular(argumentos.alunos, argumentos.aulas, argumentos.alunos_por_turma, argumentos.professores, argumentos.disciplinas)
+
+        for tabela, total in contagens.items():
+            print(f"{tabela:12} {total:>10}")
+        print(f"Banco populado em {time.perf_counter() - inicio:.1f}s.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Configuração do gunicorn, o servidor de produção: gunicorn -c gunicorn.conf.py
+
+A aplicação é carregada uma única vez no processo mestre (`preload_app`), antes da criação dos workers, que passam a
+compartilhar com ele, por copy-on-write, a memória dos módulos e da aplicação já importados. Cada worker recria as
+conexões com o banco e os pools de renderização de PDFs e de verificação de senhas, que não podem ser herdados.
+
+Como cada worker tem o seu próprio pool de conexões e os seus próprios pools de PDFs e de senhas, os valores padrão
+desses pools são divididos entre os workers, antes de a aplicação ler a configuração:
+    - as conexões com o banco: os workers abrem, juntos, no máximo `GUNICORN_CONEXOES_BANCO` conexões (padrão: 90,
+      abaixo do `max_connections` padrão do PostgreSQL, 100). Cada worker recebe `GUNICORN_CONEXOES_BANCO // workers`
+      conexões, das quais até uma por thread fica aberta (`DB_POOL_TAMANHO`) e o restante é overflow
+      (`DB_POOL_OVERFLOW`). Com 8 CPUs, são 17 workers com 2 + 3 conexões cada, 85 no total;
+    - os processos de renderização de PDFs (`PDF_RENDER_TRABALHADORES`) e as threads do Bcrypt
+      (`SENHA_HASH_TRABALHADORES`): as CPUs divididas pelo número de workers, com no mínimo 1 por worker.
+Valores definidos no ambiente ou no arquivo .env são mantidos, e o total de conexões passa a ser responsabilidade de
+quem os define: workers x (DB_POOL_TAMANHO + DB_POOL_OVERFLOW), e o mesmo número em cada réplica de DB_REPLICAS.
+
+Variáveis de ambiente (opcionais):
+    GUNICORN_BIND: Endereço do servidor (padrão: 0.0.0.0:5000).
+    GUNICORN_WORKERS: Número de workers (padrão: 2 x CPUs + 1).
+    GUNICORN_THREADS: Número de threads por worker (padrão: 2).
+    GUNICORN_PRELOAD: Se a aplicação é carregada no mestre (padrão: true).
+    GUNICORN_TIMEOUT: Tempo máximo, em segundos, de uma requisição antes de o worker ser reiniciado (padrão: 60).
+    GUNICORN_CONEXOES_BANCO: Número máximo de conexões com o banco somando todos os workers (padrão: 90).
+"""
+
+import gc
+import os
+from dotenv import load_dotenv
+
+wsgi_app = "wsgi:app"
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5000")
+
+workers = int(os.getenv("GUNICORN_WORKERS", 0)) or 2 * (os.cpu_count() or 1) + 1
+threads = int(os.getenv("GUNICORN_THREADS", 2))
+
+
+def dividir_recursos_entre_workers(workers: int, threads: int, conexoes: int, cpus: int) -> dict:
+    """Calcula os valores padrão, por worker, dos pools de conexões, de renderização de PDFs e de senhas.
+
+    Args:
+        workers (int): Número de workers.
+        threads (int): Número de threads por worker.
+        conexoes (int): Número máximo de conexões com o banco somando todos os workers.
+        cpus (int): Número de CPUs da máquina.
+
+    Returns:
+        dict: As variáveis de ambiente lidas pela configuração da aplicação, com os valores de cada worker.
+    """
+    conexoes_por_worker = max(1, conexoes // workers)
+    tamanho = min(threads, conexoes_por_worker)
+    trabalhadores = max(1, cpus // workers)
+    return {
+        "DB_POOL_TAMANHO": str(tamanho),
+        "DB_POOL_OVERFLOW": str(conexoes_por_worker - tamanho),
+        "PDF_RENDER_TRABALHADORES": str(trabalhadores),
+        "SENHA_HASH_TRABALHADORES": str(trabalhadores),
+    }
+
+
+# a configuração da aplicação é lida ao importá-la, então os valores padrão precisam estar no ambiente antes disso (o
+# .env é carregado primeiro para que os seus valores prevaleçam)
+load_dotenv()
+for variavel, valor in dividir_recursos_entre_workers(workers, threads, int(os.getenv("GUNICORN_CONEXOES_BANCO", 90)), os.cpu_count() or 1).items():
+    os.environ.setdefault(variavel, valor)
+
+from app.utils.pool_helpers import ler_booleano
+
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 60))
+keepalive = 5
+
+preload_app = ler_booleano(os.getenv("GUNICORN_PRELOAD"), True)
+
+# reinicia cada worker depois de algumas milhares de requisições, com um intervalo aleatório para que não
+# reiniciem todos ao mesmo tempo
+max_requests = 5000
+max_requests_jitter = 500
+
+
+def when_ready(server):
+    """Move os objetos já criados no mestre para fora da coleta de lixo, para que os workers não os copiem."""
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Descarta, no novo worker, as conexões com o banco e os pools de processos e threads herdados do mestre."""
+    if not server.cfg.preload_app:
+        return
+
+    from app.extensions import db, pdf_renderer
+    from app.utils.usuario_helpers import verificador_senhas
+
+    with server.app.wsgi().app_context():
+        # close=False: as conexões herdadas continuam do mestre e não podem ser fechadas pelo worker
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+    pdf_renderer.reiniciar()
+    verificador_senhas.reiniciar()
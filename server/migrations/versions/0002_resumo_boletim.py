@@ -0,0 +1,33 @@
+"""colunas calculadas de resumo do boletim
+
+Adiciona ao boletim a quantidade de notas e a média, calculadas pelo banco a partir de `notas`.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 03:05:12.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(
+        "ALTER TABLE boletim "
+        "ADD COLUMN IF NOT EXISTS quantidade_notas INTEGER GENERATED ALWAYS AS (cardinality(notas)) STORED, "
+        "ADD COLUMN IF NOT EXISTS media FLOAT GENERATED ALWAYS AS "
+        "(CASE WHEN cardinality(notas) >= 4 THEN (notas[1] + notas[2] + notas[3] + notas[4]) / 4 END) STORED"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('boletim', schema=None) as batch_op:
+        batch_op.drop_column('media')
+        batch_op.drop_column('quantidade_notas')
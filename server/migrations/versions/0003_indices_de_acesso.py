@@ -0,0 +1,40 @@
+"""índices dos caminhos de acesso de boletim, aula, turma e aluno_turma
+
+Os índices são criados com `CREATE INDEX CONCURRENTLY`, que não bloqueia as escritas enquanto o índice é montado.
+Como esse comando não pode rodar dentro de uma transação, ele é executado em um bloco `autocommit_block`.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 03:06:47.530981
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+INDICES = [
+    ('ix_boletim_aula_id', 'boletim', ['aula_id']),
+    ('ix_aula_usuario_id', 'aula', ['usuario_id']),
+    ('ix_aula_turma_id_disciplina_codigo', 'aula', ['turma_id', 'disciplina_codigo']),
+    ('ix_turma_sala_numero_calendario_ano_letivo_turno', 'turma', ['sala_numero', 'calendario_ano_letivo', 'turno']),
+    ('ix_aluno_turma_turma_id', 'aluno_turma', ['turma_id']),
+]
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas in INDICES:
+            op.create_index(nome, tabela, colunas, unique=False, if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for nome, tabela, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, if_exists=True, postgresql_concurrently=True)
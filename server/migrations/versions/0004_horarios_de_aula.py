@@ -0,0 +1,81 @@
+"""horários das aulas com restrições de exclusão
+
+Cria a tabela `horario_aula`, com o período de cada aula em cada dia da semana, e as restrições de exclusão que impedem
+a sobreposição de aulas da mesma turma ou do mesmo professor. Os horários das aulas existentes são preenchidos a partir
+de `aula` e `turma`; aulas que já se sobrepõem a outras (cadastradas quando só horários idênticos eram recusados) ficam
+sem horário, com a verificação feita apenas pela aplicação, e o seu número é informado ao final da migração.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 03:31:20.417356
+
+"""
+import logging
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+# um período por aula e dia da semana, na semana de referência (a primeira iniciada em uma segunda-feira) do ano letivo
+PREENCHER_HORARIOS = """
+INSERT INTO horario_aula (aula_id, dia_da_semana, turma_id, usuario_id, periodo)
+SELECT aula.id, dia.nome, aula.turma_id, aula.usuario_id,
+       tsrange(semana.inicio + (dia.posicao - 1)::int + aula.hora_inicio, semana.inicio + (dia.posicao - 1)::int + aula.hora_fim)
+FROM aula
+JOIN turma ON turma.id = aula.turma_id
+CROSS JOIN LATERAL (
+    SELECT make_date(turma.calendario_ano_letivo, 1, 1)
+           + (8 - extract(isodow FROM make_date(turma.calendario_ano_letivo, 1, 1))::int) % 7 AS inicio
+) AS semana
+CROSS JOIN LATERAL (
+    SELECT DISTINCT nome, array_position(ARRAY['Segunda', 'Terça', 'Quarta', 'Quinta', 'Sexta', 'Sábado']::varchar[], nome) AS posicao
+    FROM unnest(aula.dias_da_semana) AS nome
+) AS dia
+WHERE dia.posicao IS NOT NULL AND aula.hora_fim > aula.hora_inicio
+ORDER BY aula.id
+ON CONFLICT DO NOTHING
+"""
+
+
+def upgrade():
+    op.create_table('horario_aula',
+    sa.Column('aula_id', sa.Integer(), nullable=False),
+    sa.Column('dia_da_semana', sa.String(length=7), nullable=False),
+    sa.Column('turma_id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('periodo', postgresql.TSRANGE(), nullable=False),
+    sa.ForeignKeyConstraint(['aula_id'], ['aula.id'], onupdate='CASCADE', ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('aula_id', 'dia_da_semana'),
+    postgresql.ExcludeConstraint((sa.text("int4range(turma_id, turma_id, '[]')"), '&&'), ('periodo', '&&'), using='gist', name='ex_horario_aula_turma'),
+    postgresql.ExcludeConstraint((sa.text("int4range(usuario_id, usuario_id, '[]')"), '&&'), ('periodo', '&&'), using='gist', name='ex_horario_aula_professor')
+    )
+
+    op.execute(PREENCHER_HORARIOS)
+
+    # um dia recusado pelas restrições deixa a aula inteira sem horário, para que ela não fique verificada pela metade
+    op.execute(
+        "DELETE FROM horario_aula WHERE aula_id IN ("
+        "SELECT aula.id FROM aula CROSS JOIN LATERAL unnest(aula.dias_da_semana) AS dia "
+        "JOIN turma ON turma.id = aula.turma_id "
+        "WHERE aula.hora_fim > aula.hora_inicio "
+        "AND NOT EXISTS (SELECT 1 FROM horario_aula WHERE horario_aula.aula_id = aula.id AND horario_aula.dia_da_semana = dia))"
+    )
+
+    sem_horario = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM aula WHERE NOT EXISTS (SELECT 1 FROM horario_aula WHERE horario_aula.aula_id = aula.id)"
+    )).scalar()
+    if sem_horario:
+        logging.getLogger("alembic.runtime.migration").warning(
+            "%d aula(s) ficaram sem horário por se sobreporem a outras aulas; revise-as e altere-as pela aplicação.", sem_horario
+        )
+
+
+def downgrade():
+    op.drop_table('horario_aula')
@@ -0,0 +1,34 @@
+"""sequência dos números de matrícula dos alunos
+
+Cria a sequência `aluno_matricula_seq`, de onde os números das novas matrículas passam a ser reservados (antes, o número
+era o total de alunos mais um, o que repetia matrículas em cadastros simultâneos). A sequência começa depois do maior
+número entre as matrículas existentes, que têm o formato `<ano letivo>000<número com 5 dígitos>`, e termina em 99999,
+para que a reserva falhe em vez de gerar matrículas fora desse formato.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 05:12:40.218734
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute(sa.schema.CreateSequence(sa.Sequence('aluno_matricula_seq', maxvalue=99999)))
+    op.execute(
+        "SELECT setval('aluno_matricula_seq', numero) FROM ("
+        "SELECT max(substr(matricula, 8)::bigint) AS numero FROM aluno WHERE matricula ~ '^[0-9]{12,}$'"
+        ") AS matriculas WHERE numero IS NOT NULL"
+    )
+
+
+def downgrade():
+    op.execute(sa.schema.DropSequence(sa.Sequence('aluno_matricula_seq')))
@@ -0,0 +1,30 @@
+"""versão das notas de cada aula
+
+Adiciona à aula um contador de cadastros e alterações de notas, incrementado a cada escrita e comparado pelas
+estatísticas em cache de cada worker para perceber as notas alteradas em outro worker. As aulas existentes começam na
+versão 0.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 06:02:51.604417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('aula', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('versao_notas', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('aula', schema=None) as batch_op:
+        batch_op.drop_column('versao_notas')
@@ -3,8 +3,5 @@ from app import create_app
 app = create_app()
 
 if __name__ == '__main__':
-    with app.app_context():
-        from app.extensions import db
-        db.create_all()
-    
-    app.run(debug=True)
\ No newline at end of file
+    # o esquema do banco é criado e atualizado pelas migrações: flask --app run db upgrade
+    app.run(debug=True)
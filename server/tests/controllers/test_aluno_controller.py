@@ -5,10 +5,15 @@ Os testes verificam as operações básicas de CRUD (Create, Read, Update, Delet
 incluindo cadastro, listagem, busca, atualização e remoção de alunos no banco de dados.
 """
 
-from app.models import Aluno, Turma, Sala, Calendario
+import io
+import json
+from sqlalchemy import text
+from app.models import Aluno, Turma, Sala, Calendario, Usuario, Disciplina, Aula, Boletim
 from app.extensions import db
 from app.utils.date_helpers import string_para_data
+from app.utils.usuario_helpers import gerar_hashing
 from tests.user_event import usuario_entra_no_sistema
+from tests.sql_event import contar_consultas
 
 
 def criar_dependencias(app):
@@ -166,6 +171,160 @@ def test_cadastrar_aluno_dados_invalidos(client, app):
         assert len(response.json["erro"]) == 5, "Deve haver 5 erros de validação."
 
 
+def criar_aula_da_turma(app):
+    """ Garante que a turma 1 tenha uma aula, para que a criação dos boletins na importação de alunos possa ser testada.
+    """
+    with app.app_context():
+        disciplina = Disciplina(codigo="MAT001", nome="Matemática", carga_horaria=30, ementa="", bibliografia="")
+        professor = Usuario(cpf="12345678910", nome="Alan Ferreira dos Santos", email="alanferreira@email.com", senha=gerar_hashing("bocaAberta123"), telefone="79 9 9999-8888", endereco="Bairro X, Rua A", horario_de_trabalho="Seg-Sex,7h-12h", data_de_nascimento=string_para_data("1998-05-17"), tipo="p", formacao="Licenciatura em Matemática", disciplinas=[disciplina])
+        db.session.add(Aula(hora_inicio="07:00", hora_fim="08:00", dias_da_semana=["Segunda"], professor=professor, disciplina=disciplina, turma_id=1))
+        db.session.commit()
+
+
+def test_importar_alunos(client, app):
+    """Testa a importação de alunos em JSON.
+
+    Este teste verifica se as matrículas continuam a sequência das matrículas já reservadas, se cada aluno é matriculado
+    na sua turma com um boletim para cada aula dela e se a importação é feita com um número fixo de consultas.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        criar_dependencias(app)
+        criar_aula_da_turma(app)
+
+        aluno = {"nome": "João Pedro dos Santos", "email": "joaopedro@email.com", "telefone": "79 9 1234-5678", "endereco": "Bairro X, Rua A", "data_de_nascimento": "2011-09-10", "turma_id": 1}
+        assert client.post('/aluno/', json=aluno).json["data"]["matricula"] == "202600000001"
+
+        alunos = [{**aluno, "nome": f"Aluno {i}", "email": f"aluno{i}@email.com"} for i in range(1, 4)]
+        with contar_consultas() as consultas:
+            response = client.post('/aluno/importar', json=alunos)
+
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        assert [aluno["matricula"] for aluno in response.json["data"]["alunos"]] == ["202600000002", "202600000003", "202600000004"]
+        assert response.json["data"]["boletins"] == 3, "Deve ser criado um boletim para cada aula da turma de cada aluno."
+        # os e-mails, as turmas, as matrículas e o INSERT ... SELECT dos boletins (o usuário do token já está em cache, e
+        # os COPY não passam pelo SQLAlchemy)
+        assert len(consultas) == 4, "A importação não deve fazer consultas por linha."
+
+        importado = db.session.get(Aluno, "202600000003")
+        assert importado.email == "aluno2@email.com" and [turma.id for turma in importado.turmas] == [1]
+        assert db.session.query(Boletim).filter_by(aluno_matricula="202600000003").count() == 1
+        assert db.session.query(Boletim).filter_by(aluno_matricula="202600000001").count() == 1, "O cadastro individual também deve criar os boletins."
+
+
+def test_cadastrar_aluno_matricula_ja_existente(client, app):
+    """Testa se a colisão da matrícula reservada com a de um aluno cadastrado fora da sequência é informada como tal, e
+    não como um e-mail repetido.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        criar_dependencias(app)
+        db.session.add(Aluno(matricula="202600000001", nome="Aluno Antigo", email="antigo@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-09-10")))
+        db.session.commit()
+
+        aluno = {"nome": "João Pedro dos Santos", "email": "joaopedro@email.com", "telefone": "79 9 1234-5678", "endereco": "Bairro X, Rua A", "data_de_nascimento": "2011-09-10", "turma_id": 1}
+        response = client.post('/aluno/', json=aluno)
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["A matrícula reservada já pertence a outro aluno, tente novamente"]
+
+        response = client.post('/aluno/', json=aluno)
+        assert response.status_code == 201, "A próxima matrícula da sequência deve estar livre."
+        assert response.json["data"]["matricula"] == "202600000002"
+
+
+def test_cadastrar_aluno_sem_matriculas_disponiveis(client, app):
+    """Testa se o cadastro e a importação são recusados quando a sequência das matrículas chega ao maior número de 5
+    dígitos, em vez de gerar uma matrícula fora do formato.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        criar_dependencias(app)
+        db.session.execute(text("SELECT setval('aluno_matricula_seq', 99999)"))
+        db.session.commit()
+
+        aluno = {"nome": "João Pedro dos Santos", "email": "joaopedro@email.com", "telefone": "79 9 1234-5678", "endereco": "Bairro X, Rua A", "data_de_nascimento": "2011-09-10", "turma_id": 1}
+        response = client.post('/aluno/', json=aluno)
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Não há mais números de matrícula disponíveis"]
+
+        response = client.post('/aluno/importar', json=[aluno])
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Não há mais números de matrícula disponíveis"]
+
+        assert db.session.query(Aluno).count() == 0, "Nenhum aluno deve ser cadastrado."
+
+
+def test_importar_alunos_csv(client, app):
+    """Testa a importação de alunos em CSV, no corpo da requisição e como arquivo de um formulário.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        criar_dependencias(app)
+
+        csv = "nome;email;telefone;endereco;data_de_nascimento;turma_id\nMaria Clara Souza;mclara@email.com;79 9 1234-5678;Bairro X, Rua A;2011-01-01;1\n"
+        response = client.post('/aluno/importar', data=csv, content_type="text/csv")
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        assert db.session.get(Aluno, "202600000001").endereco == "Bairro X, Rua A", "Valores com vírgula devem ser lidos com o separador ';'."
+
+        csv = 'nome,email,telefone,endereco,data_de_nascimento,turma_id\nPaulo Silva da Cruz,psilva@email.com,79 9 1989-7841,"Bairro Y, Rua B",2011-05-01,1\n'
+        response = client.post('/aluno/importar', data={"arquivo": (io.BytesIO(csv.encode()), "alunos.csv")}, content_type="multipart/form-data")
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        assert response.json["data"]["alunos"] == [{"matricula": "202600000002", "email": "psilva@email.com"}]
+
+
+def test_importar_alunos_com_erros(client, app):
+    """Testa a importação de alunos com linhas recusadas.
+
+    Este teste verifica se os erros de todas as linhas são retornados em uma única resposta e se nenhum aluno é cadastrado.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        turma1, turma2 = criar_dependencias(app)
+
+        aluno = {"nome": "João Pedro dos Santos", "email": "joaopedro@email.com", "telefone": "79 9 1234-5678", "endereco": "Bairro X, Rua A", "data_de_nascimento": "2011-09-10", "turma_id": 1}
+        client.post('/aluno/', json=aluno)
+
+        response = client.post('/aluno/importar', json=[
+            {**aluno, "email": "novo@email.com"},
+            aluno,
+            {**aluno, "email": "novo@email.com"},
+            {**aluno, "email": "outro@email.com", "turma_id": 2},
+            {**aluno, "email": "mais@email.com", "turma_id": 99},
+            {**aluno, "email": "invalido", "turma_id": "um"},
+        ])
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == [
+            "Linha 2: E-mail já existe",
+            "Linha 3: E-mail repetido na linha 1",
+            "Linha 4: A turma está fechada, portanto, não é possível cadastrar mais alunos",
+            "Linha 5: Turma não existe",
+            "Linha 6: O atributo 'email' é obrigatório e deve ter no mínimo 3 caracteres e no máximo 100 caracteres, além de precisar ter o @",
+            "Linha 6: O campo 'turma_id' é obrigatório e deve ser um número inteiro positivo",
+        ], "Os erros devem vir na ordem das linhas."
+        assert db.session.query(Aluno).count() == 1, "Nenhum aluno deve ser cadastrado quando há linhas recusadas."
+
+
 def test_listar_alunos(client, app):
     """Testa a listagem de alunos cadastrados.
 
@@ -192,6 +351,93 @@ def test_listar_alunos(client, app):
         assert "matricula" in response.json[0], "A resposta deve conter o campo 'matricula'."
         
 
+def test_listar_alunos_paginacao(client, app):
+    """Testa a listagem de alunos paginada por cursor e com projeção de campos.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        turma1, turma2 = criar_dependencias(app)
+
+        # a turma 3 é de um ano letivo mais recente e passa a ser a turma atual de quem está nela
+        db.session.add(Calendario(ano_letivo=2027, data_inicio=string_para_data("2027-02-17"), data_fim=string_para_data("2027-11-27"), dias_letivos=150))
+        turma3 = Turma(ano=9, serie="B", nivel_de_ensino="Ensino Fundamental", turno="M", status="A", sala_numero=101, calendario_ano_letivo=2027)
+        db.session.add(turma3)
+
+        for i in range(1, 6):
+            turmas = [turma1, turma3] if i % 2 else [turma2]
+            db.session.add(Aluno(matricula=f"2026000{i:05d}", nome=f"Aluno {i}", email=f"aluno{i}@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-09-10"), turmas=turmas))
+        db.session.add(Aluno(matricula="202600000006", nome="Aluno 6", email="aluno6@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-09-10")))
+        db.session.commit()
+
+        with contar_consultas() as consultas:
+            response = client.get('/aluno/?limite=4&fields=matricula,turma_id')
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        # além da página, o middleware busca o usuário do token, que não existe e por isso não fica em cache
+        assert len(consultas) == 2, "A página deve ser montada com uma única consulta; a outra é a busca do usuário do token pelo middleware."
+        assert response.json == [
+            {"matricula": "202600000001", "turma_id": turma3.id},
+            {"matricula": "202600000002", "turma_id": turma2.id},
+            {"matricula": "202600000003", "turma_id": turma3.id},
+            {"matricula": "202600000004", "turma_id": turma2.id},
+        ]
+        assert response.headers["X-Proximo-Cursor"] == "202600000004"
+
+        response = client.get('/aluno/?limite=4&apos=202600000004&fields=nome')
+
+        assert response.json == [{"nome": "Aluno 5"}, {"nome": "Aluno 6"}]
+        assert "X-Proximo-Cursor" not in response.headers, "A última página não deve informar um cursor."
+
+        response = client.get('/aluno/?limite=1&apos=202600000005')
+
+        assert response.json[0]["turma_id"] is None, "Aluno sem turma deve ter 'turma_id' nulo."
+        assert response.json[0]["data_de_nascimento"] == "2011-09-10"
+
+
+def test_listar_alunos_ndjson(client, app):
+    """Testa a listagem de alunos transmitida em NDJSON, com projeção de campos.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        turma1, turma2 = criar_dependencias(app)
+
+        for i in range(1, 4):
+            db.session.add(Aluno(matricula=f"2026000{i:05d}", nome=f"Aluno {i}", email=f"aluno{i}@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-09-10"), turmas=[turma1]))
+        db.session.commit()
+
+        response = client.get('/aluno/?stream=1&fields=matricula,turma_id')
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.mimetype == "application/x-ndjson", "A resposta deve ser NDJSON."
+        assert [json.loads(linha) for linha in response.get_data(as_text=True).splitlines()] == [
+            {"matricula": f"2026000{i:05d}", "turma_id": turma1.id} for i in range(1, 4)
+        ]
+
+
+def test_listar_alunos_parametros_invalidos(client, app):
+    """Testa a listagem de alunos com limite e campos inválidos.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get('/aluno/?limite=0&fields=nome,senha')
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["O parâmetro 'limite' deve ser um número inteiro entre 1 e 500", "O campo 'senha' não pode ser listado"]
+
+
 def test_buscar_aluno(client, app):
     """Testa a busca de um aluno específico pela matrícula.
 
@@ -5,12 +5,15 @@ Os testes verificam as operações básicas de CRUD (Create, Read, Update, Delet
 incluindo cadastro, listagem, busca, atualização e remoção de aulas no banco de dados.
 """
 
-from app.models import Aula, Usuario, Disciplina, Turma, Calendario, Sala, Cargo
+import io
+import json
+from app.models import Aula, Usuario, Disciplina, Turma, Calendario, Sala, Cargo, HorarioAula, Aluno, Boletim
 from app.extensions import db
 from app.utils.date_helpers import string_para_data
 from app.utils.hour_helpers import string_para_hora
 from app.utils.usuario_helpers import gerar_hashing
 from tests.user_event import usuario_entra_no_sistema
+from tests.sql_event import contar_consultas
 
 
 def criar_dependencias(app):
@@ -370,6 +373,203 @@ def test_professor_de_outra_disciplina(client, app):
         assert "erro" in response.json, "O 'professor' não pode ensinar essa 'disciplina'"
 
 
+def test_cadastrar_aula_com_horario_sobreposto(client, app):
+    """Testa o cadastro de aulas cujo horário se sobrepõe, sem ser idêntico, ao de outras aulas da turma, do professor ou da sala.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        criar_dependencias_segunda_disciplina(app)
+        usuario_entra_no_sistema(client, app)
+
+        professor = db.session.get(Usuario, 1)
+        professor.disciplinas.append(db.session.get(Disciplina, "MAT002"))
+        # outra turma na mesma sala, no turno da tarde, e uma turma do ano letivo seguinte
+        db.session.add(Calendario(ano_letivo=2027, data_inicio=string_para_data("2027-02-17"), data_fim=string_para_data("2027-11-27"), dias_letivos=150))
+        turma_tarde = Turma(ano=8, serie="B", nivel_de_ensino="Ensino Fundamental", turno="V", status="A", sala_numero=101, calendario_ano_letivo=2026)
+        turma_seguinte = Turma(ano=9, serie="A", nivel_de_ensino="Ensino Fundamental", turno="M", status="A", sala_numero=101, calendario_ano_letivo=2027)
+        db.session.add_all([turma_tarde, turma_seguinte])
+        db.session.commit()
+
+        def cadastrar(disciplina_codigo, turma_id, dias_da_semana, hora_inicio, hora_fim):
+            return client.post('/aula/', json={"hora_inicio": hora_inicio, "hora_fim": hora_fim, "dias_da_semana": dias_da_semana, "usuario_cpf": "12345678910", "disciplina_codigo": disciplina_codigo, "turma_id": turma_id})
+
+        response = cadastrar("MAT001", 1, ["Segunda", "Quarta"], "08:00", "09:00")
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        assert db.session.query(HorarioAula).filter_by(aula_id=response.json["data"]["id"]).count() == 2, "Deve haver um horário por dia da semana."
+
+        response = cadastrar("MAT002", 1, ["Quarta", "Sexta"], "08:30", "09:30")
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == [
+            "Já existe uma aula no mesmo horário, na mesma turma",
+            "Já existe uma aula no mesmo horário, com o mesmo professor",
+            "Já existe uma aula no mesmo horário, na mesma sala",
+        ]
+
+        response = cadastrar("MAT002", turma_tarde.id, ["Segunda"], "08:45", "10:00")
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Já existe uma aula no mesmo horário, com o mesmo professor", "Já existe uma aula no mesmo horário, na mesma sala"]
+
+        response = cadastrar("MAT002", turma_tarde.id, ["Segunda"], "09:00", "10:00")
+        assert response.status_code == 201, "Uma aula que começa quando a outra termina não se sobrepõe a ela."
+
+        response = cadastrar("MAT001", turma_seguinte.id, ["Segunda", "Quarta"], "08:00", "09:00")
+        assert response.status_code == 201, "Aulas de anos letivos diferentes não se sobrepõem."
+
+        response = cadastrar("MAT002", 1, ["Sexta"], "10:00", "09:00")
+        assert response.json["erro"] == ["O atributo 'hora_fim' deve ser posterior ao atributo 'hora_inicio'"]
+
+
+def test_alterar_aula_com_horario_sobreposto(client, app):
+    """Testa a alteração de uma aula para um horário que se sobrepõe ao de outra aula da turma.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        criar_dependencias_segunda_disciplina(app)
+        usuario_entra_no_sistema(client, app)
+
+        professor = db.session.get(Usuario, 1)
+        professor.disciplinas.append(db.session.get(Disciplina, "MAT002"))
+        db.session.commit()
+
+        dados = {"hora_inicio": "08:00", "hora_fim": "09:00", "dias_da_semana": ["Segunda"], "usuario_cpf": "12345678910", "disciplina_codigo": "MAT001", "turma_id": 1}
+        primeira = client.post('/aula/', json=dados).json["data"]["id"]
+        segunda = client.post('/aula/', json={**dados, "disciplina_codigo": "MAT002", "hora_inicio": "09:00", "hora_fim": "10:00"}).json["data"]["id"]
+
+        response = client.put(f'/aula/{segunda}', json={**dados, "disciplina_codigo": "MAT002", "hora_inicio": "08:50", "hora_fim": "10:00"})
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert "Já existe uma aula no mesmo horário, na mesma turma" in response.json["erro"]
+
+        response = client.put(f'/aula/{primeira}', json={**dados, "hora_inicio": "07:00", "dias_da_semana": ["Segunda", "Terça"]})
+        assert response.status_code == 200, "A própria aula não deve ser considerada um conflito."
+
+        periodos = {horario.dia_da_semana: horario.periodo for horario in db.session.query(HorarioAula).filter_by(aula_id=primeira)}
+        assert sorted(periodos) == ["Segunda", "Terça"], "Os horários devem acompanhar os dias da aula."
+        assert periodos["Terça"].lower.hour == 7
+
+
+def criar_dependencias_importacao(app):
+    """ Garante que a turma 1 tenha dois alunos e que o professor possa ensinar as duas disciplinas, para que a importação
+    de aulas e a criação dos boletins possam ser testadas.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        criar_dependencias_segunda_disciplina(app)
+
+        professor = db.session.get(Usuario, 1)
+        professor.disciplinas.append(db.session.get(Disciplina, "MAT002"))
+        turma = db.session.get(Turma, 1)
+        for i in range(1, 3):
+            turma.alunos.append(Aluno(matricula=f"20260000000{i}", nome=f"Aluno {i}", email=f"aluno{i}@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-01-01")))
+        db.session.commit()
+
+
+def test_importar_aulas(client, app):
+    """Testa a importação de uma grade horária em JSON.
+
+    Este teste verifica se as aulas e os seus horários são cadastrados, se é criado um boletim para cada aluno da turma
+    de cada aula e se a importação é feita com um número fixo de consultas.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias_importacao(app)
+        usuario_entra_no_sistema(client, app)
+
+        aulas = [
+            {"hora_inicio": "07:00", "hora_fim": "08:00", "dias_da_semana": ["Segunda", "Quarta"], "usuario_cpf": "12345678910", "disciplina_codigo": "MAT001", "turma_id": 1},
+            {"hora_inicio": "08:00", "hora_fim": "09:00", "dias_da_semana": ["Segunda"], "usuario_cpf": "12345678910", "disciplina_codigo": "MAT002", "turma_id": 1},
+        ]
+
+        with contar_consultas() as consultas:
+            response = client.post('/aula/importar', json=aulas)
+
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        assert len(response.json["data"]["aulas"]) == 2, "A resposta deve conter os ids das aulas cadastradas."
+        assert response.json["data"]["boletins"] == 4, "Deve ser criado um boletim para cada aluno em cada aula."
+        # o token, quatro consultas de validação, a agenda do ano letivo e três inserções em lote
+        assert len(consultas) == 9, "A importação não deve fazer consultas por linha."
+
+        primeira, segunda = response.json["data"]["aulas"]
+        assert db.session.get(Aula, segunda).disciplina_codigo == "MAT002", "Os ids devem estar na ordem das linhas."
+        assert db.session.query(HorarioAula).filter_by(aula_id=primeira).count() == 2, "Deve haver um horário por dia da semana."
+        boletim = db.session.get(Boletim, ("202600000001", primeira))
+        assert boletim.notas == [] and boletim.ausencias == 0 and boletim.situacao == "M"
+
+
+def test_importar_aulas_csv(client, app):
+    """Testa a importação de uma grade horária em CSV, no corpo da requisição e como arquivo de um formulário.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias_importacao(app)
+        usuario_entra_no_sistema(client, app)
+
+        csv = "hora_inicio;hora_fim;dias_da_semana;usuario_cpf;disciplina_codigo;turma_id\n07:00;08:00;Segunda|Quarta;12345678910;MAT001;1\n"
+        response = client.post('/aula/importar', data=csv, content_type="text/csv")
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        aula = db.session.get(Aula, response.json["data"]["aulas"][0])
+        assert aula.dias_da_semana == ["Segunda", "Quarta"], "Os dias da semana devem ser separados por '|'."
+
+        csv = "hora_inicio,hora_fim,dias_da_semana,usuario_cpf,disciplina_codigo,turma_id\n08:00,09:00,Quarta,12345678910,MAT002,1\n"
+        response = client.post('/aula/importar', data={"arquivo": (io.BytesIO(csv.encode()), "grade.csv")}, content_type="multipart/form-data")
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        assert response.json["data"]["boletins"] == 2
+
+        response = client.post('/aula/importar', data="hora_inicio,hora_fim\n07:00,08:00\n", content_type="text/csv")
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["O CSV não possui as colunas: dias_da_semana, usuario_cpf, disciplina_codigo, turma_id"]
+
+
+def test_importar_aulas_com_erros(client, app):
+    """Testa a importação de uma grade horária com linhas inválidas.
+
+    Este teste verifica se os erros de todas as linhas são retornados em uma única resposta, incluindo os conflitos entre
+    as próprias linhas da importação, e se nenhuma aula é cadastrada.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias_importacao(app)
+        usuario_entra_no_sistema(client, app)
+
+        aula = {"hora_inicio": "07:00", "hora_fim": "08:00", "dias_da_semana": ["Segunda"], "usuario_cpf": "12345678910", "disciplina_codigo": "MAT001", "turma_id": 1}
+        response = client.post('/aula/importar', json=[
+            aula,
+            {**aula, "disciplina_codigo": "MAT002", "hora_inicio": "07:30", "hora_fim": "08:30"},
+            {**aula, "hora_inicio": "09:00", "hora_fim": "10:00"},
+            {**aula, "turma_id": 99},
+            {**aula, "hora_fim": "06:00"},
+            {"hora_inicio": "07:00"},
+        ])
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == [
+            "Linha 6: Campos ausentes: hora_fim, dias_da_semana, usuario_cpf, disciplina_codigo, turma_id",
+            "Linha 5: O atributo 'hora_fim' deve ser posterior ao atributo 'hora_inicio'",
+            "Linha 2: Já existe uma aula no mesmo horário, na mesma turma",
+            "Linha 2: Já existe uma aula no mesmo horário, com o mesmo professor",
+            "Linha 2: Já existe uma aula no mesmo horário, na mesma sala",
+            "Linha 3: Aula já existe",
+            "Linha 4: Turma não existe",
+        ]
+        assert db.session.query(Aula).count() == 0, "Nenhuma aula deve ser cadastrada quando há linhas inválidas."
+
+
 def test_listar_aulas(client, app):
     """Testa a listagem de aulas cadastradas.
 
@@ -396,6 +596,28 @@ def test_listar_aulas(client, app):
         assert "id" in response.json[0], "A resposta deve conter o campo 'id'."
         
 
+def test_listar_aulas_ndjson(client, app):
+    """Testa a listagem de aulas transmitida em NDJSON com o parâmetro `stream=1`.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        aula = Aula(hora_inicio=string_para_hora("08:00:00"), hora_fim=string_para_hora("09:00:00"), dias_da_semana=["Segunda"], usuario_id=1, disciplina_codigo="MAT001", turma_id=1)
+        db.session.add(aula)
+        db.session.commit()
+
+        response = client.get('/aula/?stream=1')
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.mimetype == "application/x-ndjson", "A resposta deve ser NDJSON."
+        assert [json.loads(linha) for linha in response.get_data(as_text=True).splitlines()] == client.get('/aula/').json
+
+
 def test_buscar_aula(client, app):
     """Testa a busca de uma aula específica pelo número.
 
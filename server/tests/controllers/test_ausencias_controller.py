@@ -9,6 +9,7 @@ from app.extensions import db
 from app.utils.date_helpers import string_para_data
 from app.utils.usuario_helpers import gerar_hashing
 from tests.user_event import usuario_entra_no_sistema
+from tests.sql_event import contar_consultas
 
 
 def criar_dependencias(app):
@@ -88,6 +89,98 @@ def test_registrar_ausencias(client, app):
         assert "Ausências cadastradas com sucesso!" in resposta, "Deve apresentar uma mensagem se sucesso."
 
 
+def test_registrar_ausencias_reprovados(client, app):
+    """Testa se o registro das ausências retorna apenas os alunos que acabaram de atingir o limite de ausências.
+
+    A disciplina tem 30 horas e a aula dura 2 horas, então o limite é de 15 ausências.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        criar_dependencias(app)
+
+        boletim2 = db.session.query(Boletim).filter_by(aluno_matricula="202600000002", aula_id=1).first()
+        boletim2.ausencias = 14
+        db.session.commit()
+
+        dados = {
+            "alunos": [{"matricula": "202600000001", "ausencia": True},
+                       {"matricula": "202600000002", "ausencia": True}]
+        }
+
+        response = client.put('/ausencias/1', json=dados)
+
+        assert response.status_code == 200, "O status code deve ser 200 (Ok)."
+        assert response.json["reprovados"] == ["202600000002"], "O aluno 2 deve ser reprovado por falta."
+
+        response = client.put('/ausencias/1', json=dados)
+
+        assert response.json["reprovados"] == [], "Um aluno já reprovado não deve ser informado novamente."
+
+        db.session.expire_all()
+        boletim1 = db.session.query(Boletim).filter_by(aluno_matricula="202600000001", aula_id=1).first()
+        boletim2 = db.session.query(Boletim).filter_by(aluno_matricula="202600000002", aula_id=1).first()
+
+        assert (boletim1.ausencias, boletim1.situacao) == (2, "M")
+        assert (boletim2.ausencias, boletim2.situacao) == (16, "R")
+
+
+def test_registrar_ausencias_em_lote(client, app):
+    """Testa se o número de consultas do registro das ausências não depende do número de alunos da turma.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        criar_dependencias(app)
+
+        for i in range(3, 43):
+            matricula = f"2026000{i:05d}"
+            db.session.add(Aluno(matricula=matricula, nome=f"Aluno {i}", email=f"aluno{i}@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-01-01")))
+            db.session.add(Boletim(aluno_matricula=matricula, aula_id=1, notas=[], ausencias=0))
+        db.session.commit()
+
+        with contar_consultas() as consultas_dois_alunos:
+            response = client.put('/ausencias/1', json={"alunos": [{"matricula": "202600000001", "ausencia": True}, {"matricula": "202600000002", "ausencia": False}]})
+        assert response.status_code == 200, "O status code deve ser 200 (Ok)."
+
+        alunos = [{"matricula": f"2026000{i:05d}", "ausencia": i % 2 == 1} for i in range(1, 43)]
+        with contar_consultas() as consultas_turma:
+            response = client.put('/ausencias/1', json={"alunos": alunos})
+
+        assert response.status_code == 200, "O status code deve ser 200 (Ok)."
+        assert len(consultas_turma) == len(consultas_dois_alunos), "O número de consultas não deve depender do número de alunos."
+        assert db.session.query(db.func.sum(Boletim.ausencias)).scalar() == 10 + 1 + 21
+
+
+def test_registrar_ausencias_aluno_inexistente(client, app):
+    """Testa o registro das ausências de um aluno que não existe.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        criar_dependencias(app)
+
+        dados = {
+            "alunos": [{"matricula": "202600000001", "ausencia": True},
+                       {"matricula": "202600000099", "ausencia": True}]
+        }
+
+        response = client.put('/ausencias/1', json=dados)
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Algum aluno não foi encontrado"]
+        assert db.session.query(Boletim).filter_by(aluno_matricula="202600000001", aula_id=1).first().ausencias == 0
+
+
 def test_buscar_ausencias_aula(client, app):
     """Testa a busca dos alunos por aula com dados válidos.
 
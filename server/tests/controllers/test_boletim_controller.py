@@ -0,0 +1,222 @@
+"""
+Este módulo contém testes para as rotas e as operações relacionadas a classe de controle `boletim_controller`.
+
+Os testes verificam a geração de boletins, incluindo a geração em lote dos boletins de todos os alunos de uma turma.
+"""
+
+import io
+import zipfile
+from app.models import Aula, Usuario, Disciplina, Turma, Calendario, Sala, Cargo, Aluno, Boletim
+from app.extensions import db, pdf_cache, pdf_renderer
+from app.utils.executor_helpers import FilaCheiaError
+from app.utils.date_helpers import string_para_data
+from app.utils.usuario_helpers import gerar_hashing
+from tests.user_event import usuario_entra_no_sistema
+
+from tests.sql_event import contar_consultas
+
+
+def criar_dependencias(app):
+    with app.app_context():
+        with db.session.no_autoflush:
+            #Garante que a disciplina existe
+            disciplina = Disciplina(codigo="MAT001", nome="Matemática", carga_horaria=30, ementa="Aritmética, Álgebra, Geometria, Estatística e Probabilidade, com foco na compreensão das relações entre esses conceitos.", bibliografia="STEWART, Ian. Aventuras matemáticas: vacas no labirinto e outros enigmas lógicos. 1. Ed. Rio de Janeiro:Zahar, 2014.")
+            db.session.add(disciplina)
+
+            # Garante que o usuário existe
+            cargo = Cargo(nome="Professor", salario=2060.0, data_contrato="2027-12-31")
+            usuario = Usuario(cpf="12345678912", nome="Alan Ferreira dos Santos", email="alanferreira@email.com", senha=gerar_hashing("bocaAberta123"), telefone="79 9 9999-8888", endereco="Bairro X, Rua A", horario_de_trabalho="Seg-Sex,7h-12h", data_de_nascimento=string_para_data("1998-05-17"), tipo="p", formacao="Licenciatura em Matemática", escolaridade= None, habilidades= None, disciplinas=[disciplina], cargos=[cargo])
+            db.session.add(usuario)
+
+            # Garante que a turma existe
+            calendario = Calendario(ano_letivo = 2026, data_inicio=string_para_data("2026-02-17"), data_fim=string_para_data("2026-11-27"), dias_letivos=150)
+            db.session.add(calendario)
+            sala = Sala(numero=101, capacidade=50, localizacao="Bloco A, 1° andar")
+            db.session.add(sala)
+            turma = Turma(ano=9, serie="A", nivel_de_ensino="Ensino Fundamental", turno="M", status="A", sala_numero= 101, calendario_ano_letivo= 2026)
+            db.session.add(turma)
+
+            aluno1 = Aluno(matricula="202600000001", nome="João Pedro dos Santos", email="joaopedro@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-09-10"))
+            aluno2 = Aluno(matricula="202600000002", nome="Paulo Silva da Cruz", email="psilva@email.com", telefone="79 9 1989-7841", endereco="Bairro Y, Rua B", data_de_nascimento=string_para_data("2011-05-01"))
+            db.session.add_all([aluno1, aluno2])
+            aluno1.turmas.append(turma)
+            aluno2.turmas.append(turma)
+
+            aula = Aula(hora_inicio="13:00:00", hora_fim="15:00:00", dias_da_semana=["Terça", "Quinta"], usuario_id=1, disciplina_codigo="MAT001", turma_id=1)
+            db.session.add(aula)
+
+            boletim1 = Boletim(aluno_matricula="202600000001", aula_id=1, notas=[7.5, 8.0, 6.5, 9.0], ausencias=2)
+            boletim2 = Boletim(aluno_matricula="202600000002", aula_id=1, notas=[5.0], ausencias=0)
+            db.session.add_all([boletim1, boletim2])
+
+            db.session.commit()
+
+
+def test_listar_aulas_professor_consultas_constantes(client, app):
+    """Testa se a listagem das aulas do professor usa o mesmo número de consultas independentemente do número de aulas.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        # usuário do token de teste, dono das aulas listadas
+        usuario = Usuario(cpf="12345678910", nome="Maria Souza", email="mariasouza@email.com", senha=gerar_hashing("senha123"), telefone="79 9 9999-7777", endereco="Bairro X, Rua B", horario_de_trabalho="Seg-Sex,7h-12h", data_de_nascimento=string_para_data("1990-01-01"), tipo="f")
+        db.session.add(usuario)
+        db.session.commit()
+
+        db.session.add(Aula(hora_inicio="07:00:00", hora_fim="09:00:00", dias_da_semana=["Segunda"], usuario_id=usuario.id, disciplina_codigo="MAT001", turma_id=1))
+        db.session.commit()
+
+        # a primeira requisição guarda o usuário autenticado em cache
+        client.get("/boletim/")
+
+        with contar_consultas() as consultas_uma_aula:
+            response = client.get("/boletim/")
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert len(response.json["disciplinas"]) == 1
+        assert len(consultas_uma_aula) == 1, "As aulas devem ser listadas com uma única consulta."
+
+        # mais aulas, em outra turma e outra disciplina, além de uma turma já consolidada
+        db.session.add(Disciplina(codigo="POR001", nome="Português", carga_horaria=30))
+        db.session.add(Turma(ano=8, serie="B", nivel_de_ensino="Ensino Fundamental", turno="T", status="A", sala_numero=101, calendario_ano_letivo=2026))
+        db.session.add(Turma(ano=7, serie="C", nivel_de_ensino="Ensino Fundamental", turno="T", status="C", sala_numero=101, calendario_ano_letivo=2026))
+        db.session.commit()
+        for turma_id, disciplina_codigo in [(1, "POR001"), (2, "MAT001"), (2, "POR001"), (3, "MAT001")]:
+            db.session.add(Aula(hora_inicio="09:00:00", hora_fim="11:00:00", dias_da_semana=["Quarta"], usuario_id=usuario.id, disciplina_codigo=disciplina_codigo, turma_id=turma_id))
+        db.session.commit()
+
+        with contar_consultas() as consultas_varias_aulas:
+            response = client.get("/boletim/")
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert len(consultas_varias_aulas) == len(consultas_uma_aula), "O número de consultas não deve depender do número de aulas."
+        assert [turma["id"] for turma in response.json["turmas"]] == [1, 2], "Cada turma ativa deve aparecer uma única vez."
+        assert len(response.json["disciplinas"]) == 4, "As aulas de turmas consolidadas não devem ser listadas."
+
+
+def test_gerar_boletim(client, app):
+    """Testa a geração do boletim de um aluno em PDF.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get("/boletim/202600000001")
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.mimetype == "application/pdf", "A resposta deve ser um PDF."
+        assert response.data.startswith(b"%PDF"), "O conteúdo deve ser um PDF válido."
+
+
+def test_gerar_boletim_cache(client, app):
+    """Testa se o boletim baixado novamente vem do cache e se a alteração das notas descarta o documento em cache.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+        pdf_cache.memoria.limpar()
+
+        primeira = client.get("/boletim/202600000001")
+        acertos = pdf_cache.memoria.acertos
+        segunda = client.get("/boletim/202600000001")
+
+        assert segunda.data == primeira.data, "O mesmo boletim deve ser retornado."
+        assert pdf_cache.memoria.acertos == acertos + 1, "O segundo download deve vir do cache."
+
+        response = client.put("/notas/202600000001/1", json={"notas": [7.5, 8.0, 6.5, 10.0]})
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert len(pdf_cache.memoria) == 0, "A alteração das notas deve descartar o boletim em cache."
+
+
+def test_gerar_boletins_turma_pdf(client, app):
+    """Testa a geração dos boletins de uma turma em um único PDF.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get("/boletim/turma/1/pdf")
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.mimetype == "application/pdf", "A resposta deve ser um PDF."
+        assert response.data.startswith(b"%PDF"), "O conteúdo deve ser um PDF válido."
+        assert "X-Alunos-Por-Segundo" in response.headers, "A resposta deve informar a vazão da geração."
+
+
+def test_gerar_boletins_turma_zip(client, app):
+    """Testa a geração dos boletins de uma turma em um arquivo .zip com um PDF por aluno.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get("/boletim/turma/1/pdf?formato=zip")
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.mimetype == "application/zip", "A resposta deve ser um arquivo .zip."
+
+        with zipfile.ZipFile(io.BytesIO(response.data)) as arquivo:
+            assert sorted(arquivo.namelist()) == ["boletim_202600000001.pdf", "boletim_202600000002.pdf"]
+            assert arquivo.read("boletim_202600000001.pdf").startswith(b"%PDF")
+
+
+def test_gerar_boletins_turma_zip_executor_ocupado(client, app, monkeypatch):
+    """Testa se o .zip dos boletins é recusado com 503, antes do início da transmissão, quando o executor dos PDFs está
+    ocupado.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+        monkeypatch (MonkeyPatch): Fixture do pytest para simular o executor sem vagas.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        def sem_vagas(funcao, *args):
+            raise FilaCheiaError("O executor atingiu o limite de tarefas pendentes")
+
+        monkeypatch.setattr(pdf_renderer, "trabalhadores", 1)
+        monkeypatch.setattr(pdf_renderer, "submeter", sem_vagas)
+        response = client.get("/boletim/turma/1/pdf?formato=zip")
+
+        assert response.status_code == 503, "O status code deve ser 503 (Service Unavailable)."
+        assert response.json["erro"] == ["O servidor está ocupado, tente novamente em instantes"]
+
+
+def test_gerar_boletins_turma_inexistente(client, app):
+    """Testa a geração dos boletins de uma turma que não existe.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get("/boletim/turma/99/pdf")
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Turma não existe"]
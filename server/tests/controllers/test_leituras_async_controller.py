@@ -0,0 +1,79 @@
+"""
+Este módulo contém testes para as rotas assíncronas do modo ASGI e a classe de controle `leituras_async_controller`.
+
+Os testes verificam se as leituras assíncronas respondem exatamente como as rotas síncronas equivalentes do Flask e se
+as demais rotas continuam sendo atendidas pela aplicação Flask.
+"""
+
+from starlette.testclient import TestClient
+from app.asgi import create_asgi_app
+from app.config import TestConfig
+from app.extensions import banco_assincrono
+from app.utils.login_helpers import gerar_token
+from tests.user_event import usuario_entra_no_sistema
+from tests.controllers.test_notas_controller import criar_dependencias
+
+
+def test_leituras_assincronas_iguais_ao_flask(client, app):
+    """Testa se as rotas assíncronas de boletins, notas e ausências retornam as mesmas respostas das rotas do Flask.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+        token = gerar_token(usuario_cpf="12345678910", usuario_tipo="f")
+
+        caminhos = [
+            "/boletim/",
+            "/notas/1", "/notas/999",
+            "/notas/202600000001/1", "/notas/000000000000/1",
+            "/ausencias/1", "/ausencias/999",
+            "/ausencias/1/202600000002", "/ausencias/1/000000000000",
+        ]
+
+        with TestClient(create_asgi_app(TestConfig)) as asgi_client:
+            asgi_client.cookies.set("auth_token", token)
+
+            for caminho in caminhos:
+                esperado = client.get(caminho)
+                resposta = asgi_client.get(caminho)
+
+                assert resposta.status_code == esperado.status_code, caminho
+                assert resposta.content == esperado.data, caminho
+
+            # os checkouts do pool assíncrono confirmam que as leituras não passaram pelo Flask
+            assert banco_assincrono.engine.pool.checkedin() >= 1
+
+            asgi_client.cookies.clear()
+            assert asgi_client.get("/notas/1").status_code == 401
+
+
+def test_demais_rotas_no_flask(app):
+    """Testa se as rotas sem versão assíncrona, inclusive as escritas nos mesmos caminhos, são atendidas pelo Flask.
+
+    Args:
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        token = gerar_token(usuario_cpf="12345678910", usuario_tipo="f")
+
+    with TestClient(create_asgi_app(TestConfig)) as asgi_client:
+        asgi_client.cookies.set("auth_token", token)
+
+        response = asgi_client.put("/ausencias/1/202600000001", json={"ausencias": 3})
+        assert response.status_code == 200, response.text
+
+        response = asgi_client.get("/ausencias/1/202600000001")
+        assert response.json()["ausencias"] == 3
+
+        response = asgi_client.get("/disciplina/")
+        assert response.status_code == 200
+        assert response.json()[0]["codigo"] == "MAT001"
+
+        response = asgi_client.options("/notas/1", headers={"Origin": "http://localhost:5173", "Access-Control-Request-Method": "GET"})
+        assert response.headers["access-control-allow-origin"] == "http://localhost:5173"
+        assert response.headers["access-control-allow-credentials"] == "true"
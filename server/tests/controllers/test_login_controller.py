@@ -0,0 +1,104 @@
+"""
+Este módulo contém testes para o controlador de login.
+
+Os testes verificam a troca do custo do hash da senha no login e a recusa de logins e de cadastros de usuários quando
+o pool de verificação de senhas está ocupado.
+"""
+
+import threading
+from app.models import Usuario
+from app.extensions import db
+from app.utils.usuario_helpers import bcrypt, verificador_senhas
+from app.utils.date_helpers import string_para_data
+from tests.user_event import usuario_entra_no_sistema
+
+
+def criar_usuario(senha_hash: str) -> Usuario:
+    usuario = Usuario(cpf="12345678910", nome="Maria Souza", email="mariasouza@email.com", senha=senha_hash, telefone="79 9 9999-7777", endereco="Bairro X, Rua B", horario_de_trabalho="Seg-Sex,7h-12h", data_de_nascimento=string_para_data("1990-01-01"), tipo="f")
+    db.session.add(usuario)
+    db.session.commit()
+    return usuario
+
+
+def test_login_refaz_hash_com_novo_custo(client, app):
+    """Testa se o login refaz o hash de uma senha gerada com um custo diferente do configurado.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario = criar_usuario(bcrypt.generate_password_hash("senha123", rounds=5).decode("utf-8"))
+
+        response = client.post("/auth/login", json={"email": "mariasouza@email.com", "senha": "senha123"})
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+        db.session.refresh(usuario)
+        assert usuario.senha.startswith("$2b$04$"), "O hash deve ser refeito com o custo configurado."
+        assert bcrypt.check_password_hash(usuario.senha, "senha123")
+        assert verificador_senhas.metricas()["tarefas"] == 2, "A verificação e o novo hash devem passar pelo pool."
+
+        metricas = client.get("/metrics").text
+        assert "edumanager_senhas_tarefas_total 2" in metricas, "As operações do pool devem ser exportadas em /metrics."
+        assert "edumanager_senhas_espera_media_segundos " in metricas
+        assert "edumanager_senhas_espera_maxima_segundos " in metricas
+
+        response = client.post("/auth/login", json={"email": "mariasouza@email.com", "senha": "errada"})
+        assert response.status_code == 401, "O status code deve ser 401 (Unauthorized)."
+
+
+def test_login_pool_de_senhas_ocupado(client, app):
+    """Testa se o login é recusado com 503 quando todas as vagas do pool de verificação de senhas estão ocupadas.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_usuario(bcrypt.generate_password_hash("senha123").decode("utf-8"))
+        verificador_senhas.configurar(trabalhadores=1, fila_maxima=0, timeout=5)
+
+        liberar = threading.Event()
+        vaga_liberada = threading.Event()
+        ocupada = verificador_senhas.submeter(liberar.wait)
+        # os callbacks rodam na ordem em que foram adicionados, depois do que devolve a vaga
+        ocupada.add_done_callback(lambda _: vaga_liberada.set())
+        try:
+            response = client.post("/auth/login", json={"email": "mariasouza@email.com", "senha": "senha123"})
+        finally:
+            liberar.set()
+            vaga_liberada.wait(5)
+
+        assert response.status_code == 503, "O status code deve ser 503 (Service Unavailable)."
+        assert response.headers["Retry-After"] == "1"
+
+        response = client.post("/auth/login", json={"email": "mariasouza@email.com", "senha": "senha123"})
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+
+def test_cadastro_de_usuario_com_pool_de_senhas_ocupado(client, app):
+    """Testa se o cadastro de um usuário, que gera o hash da senha no mesmo pool do login, é recusado com 503 (e não 500)
+    quando todas as vagas do pool estão ocupadas.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        verificador_senhas.configurar(trabalhadores=1, fila_maxima=0, timeout=5)
+
+        liberar = threading.Event()
+        vaga_liberada = threading.Event()
+        ocupada = verificador_senhas.submeter(liberar.wait)
+        ocupada.add_done_callback(lambda _: vaga_liberada.set())
+
+        try:
+            response = client.post("/usuario/", json={"cpf": "98765432108", "nome": "Randy Orton", "email": "rnorton@hotmail.com", "senha": "bocaAberta123", "telefone": "16 9 9944-5533", "endereco": "Rua das Nuvens, N° 99, Bairro Industrial, Araraquara-São Paulo", "horario_de_trabalho": "Seg-Sex,07h-12h", "data_de_nascimento": "1995-08-17", "tipo": "f", "formacao": None, "escolaridade": "Ensino Médio Completo", "habilidades": "Ferramentas do pacote office (Word, Excel...)", "disciplinas": None, "cargos": [{"nome": "Funcionário", "salario": 2030.0, "data_contrato": "2027-12-31"}]})
+        finally:
+            liberar.set()
+            vaga_liberada.wait(5)
+
+        assert response.status_code == 503, "O status code deve ser 503 (Service Unavailable)."
+        assert response.headers["Retry-After"] == "1"
+        assert db.session.query(Usuario).count() == 0, "O usuário não deve ser cadastrado."
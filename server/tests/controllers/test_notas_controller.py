@@ -6,10 +6,11 @@ incluindo cadastro, alteração e busca de notas do boletim de um aluno no banco
 """
 
 from app.models import Aula, Usuario, Disciplina, Turma, Calendario, Sala, Cargo, Aluno, Boletim
-from app.extensions import db
+from app.extensions import db, estatisticas_cache
 from app.utils.date_helpers import string_para_data
 from app.utils.usuario_helpers import gerar_hashing
 from tests.user_event import usuario_entra_no_sistema
+from tests.sql_event import contar_consultas
 
 def criar_dependencias(app):
     with app.app_context():
@@ -66,6 +67,58 @@ def test_cadastrar_notas(client, app):
         assert response.status_code == 201, "O status code deve ser 201 (Created)."
         assert "mensagem" in response.json, "A resposta deve conter uma mensagem."
 
+def test_cadastrar_notas_em_lote(client, app):
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        # uma turma maior, com 40 alunos além dos dois iniciais
+        for i in range(3, 43):
+            matricula = f"2026000{i:05d}"
+            aluno = Aluno(matricula=matricula, nome=f"Aluno {i}", email=f"aluno{i}@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-01-01"))
+            db.session.add(aluno)
+            db.session.add(Boletim(aluno_matricula=matricula, aula_id=1, notas=[], ausencias=0))
+        db.session.commit()
+
+        with contar_consultas() as consultas_dois_alunos:
+            response = client.post("/notas/", json={"aula_id": 1, "alunos": [{"matricula": "202600000001", "nota": 8}, {"matricula": "202600000002", "nota": 5.5}]})
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+
+        alunos = [{"matricula": f"2026000{i:05d}", "nota": 7.0} for i in range(1, 43)]
+        with contar_consultas() as consultas_turma:
+            response = client.post("/notas/", json={"aula_id": 1, "alunos": alunos})
+
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+        assert len(consultas_turma) == len(consultas_dois_alunos), "O número de consultas não deve depender do número de alunos."
+        assert db.session.get(Boletim, ("202600000001", 1)).notas == [8.0, 7.0]
+        assert db.session.get(Boletim, ("202600000042", 1)).notas == [7.0]
+
+
+def test_cadastrar_notas_em_lote_erros(client, app):
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        # aluno inexistente
+        response = client.post("/notas/", json={"aula_id": 1, "alunos": [{"matricula": "202600000001", "nota": 8}, {"matricula": "202600000099", "nota": 5}]})
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Algum aluno não foi encontrado"]
+
+        # aluno sem boletim na aula
+        aluno = Aluno(matricula="202600000003", nome="Maria Clara Souza", email="mclara@email.com", telefone="79 9 1234-5678", endereco="Bairro X, Rua A", data_de_nascimento=string_para_data("2011-01-01"))
+        db.session.add(aluno)
+        db.session.commit()
+        response = client.post("/notas/", json={"aula_id": 1, "alunos": [{"matricula": "202600000003", "nota": 8}]})
+        assert response.json["erro"] == ["Algum aluno não possui boletim para essa aula"]
+
+        # a quinta nota de um mesmo aluno no lote ultrapassa o limite
+        response = client.post("/notas/", json={"aula_id": 1, "alunos": [{"matricula": "202600000001", "nota": 8}] * 5})
+        assert response.json["erro"] == ["Todas as notas já foram cadastradas para essa aula"]
+
+        # nenhuma nota deve ter sido gravada pelas requisições com erro
+        assert db.session.get(Boletim, ("202600000001", 1)).notas == []
+
+
 def test_cadastrar_notas_dados_invalidos(client, app):
     with app.app_context():
         criar_dependencias(app)
@@ -129,4 +182,140 @@ def test_alterar_notas(client, app):
 
         assert response.status_code == 200, "O status code deve ser 200 (OK)."
         assert response.json["mensagem"] == "Notas alteradas com sucesso!"
-        assert response.json["notas"] == [7.8, 5.6]
\ No newline at end of file
+        assert response.json["notas"] == [7.8, 5.6]
+
+def test_buscar_estatisticas_aula(client, app):
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        boletim1 = db.session.get(Boletim, ("202600000001", 1))
+        boletim2 = db.session.get(Boletim, ("202600000002", 1))
+        boletim1.notas = [8.0, 7.0, 9.0, 6.0]
+        boletim2.notas = [4.0, 5.0]
+        db.session.commit()
+
+        response = client.get("/notas/1/estatisticas")
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        estatisticas = response.json["estatisticas"]
+        assert response.json["quantidade_alunos"] == 2
+        assert estatisticas["u1"]["quantidade"] == 2
+        assert estatisticas["u1"]["media"] == 6.0
+        assert estatisticas["u1"]["mediana"] == 6.0
+        assert estatisticas["u1"]["desvio_padrao"] == 2.0
+        assert estatisticas["u1"]["taxa_aprovacao"] == 0.5
+        assert estatisticas["u1"]["histograma"] == [0, 0, 0, 0, 1, 0, 0, 0, 1, 0]
+        assert estatisticas["u3"]["quantidade"] == 1
+        assert estatisticas["media_final"]["quantidade"] == 1, "Apenas o aluno com as quatro notas deve ter média final."
+        assert estatisticas["media_final"]["media"] == 7.5
+
+        # o cadastro de notas descarta as estatísticas em cache da aula
+        response = client.post("/notas/", json={"aula_id": 1, "alunos": [{"matricula": "202600000002", "nota": 10.0}]})
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+
+        response = client.get("/notas/1/estatisticas")
+
+        assert response.json["estatisticas"]["u3"]["quantidade"] == 2
+        assert response.json["estatisticas"]["u3"]["media"] == 9.5
+
+
+def test_estatisticas_alteradas_em_outro_worker(client, app, monkeypatch):
+    """Testa se as estatísticas em cache são refeitas quando as notas são alteradas por outro worker, que só consegue
+    descartar o próprio cache.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+        monkeypatch (MonkeyPatch): Desativa o descarte local do cache, como se a escrita fosse atendida por outro worker.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        assert client.get("/notas/1/estatisticas").json["estatisticas"]["u1"]["quantidade"] == 0
+        assert client.get("/notas/calendario/2026/estatisticas").json["estatisticas"]["u1"]["quantidade"] == 0
+
+        monkeypatch.setattr(estatisticas_cache, "invalidar", lambda *etiquetas: set())
+        response = client.post("/notas/", json={"aula_id": 1, "alunos": [{"matricula": "202600000001", "nota": 8.0}]})
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+
+        assert client.get("/notas/1/estatisticas").json["estatisticas"]["u1"]["quantidade"] == 1
+        assert client.get("/notas/calendario/2026/estatisticas").json["estatisticas"]["u1"]["quantidade"] == 1
+
+        response = client.put("/notas/202600000001/1", json={"notas": [3.0]})
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+        assert client.get("/notas/1/estatisticas").json["estatisticas"]["u1"]["media"] == 3.0
+        assert client.get("/notas/calendario/2026/estatisticas").json["estatisticas"]["u1"]["media"] == 3.0
+
+
+def test_estatisticas_calendario_alteradas_em_aula_com_versao_menor(client, app, monkeypatch):
+    """Testa se as estatísticas do ano letivo são refeitas quando outro worker altera as notas de uma aula com versão
+    menor que a de outra aula do mesmo ano (a maior versão do ano não muda, mas a versão do ano letivo, sim).
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+        monkeypatch (MonkeyPatch): Desativa o descarte local do cache, como se a escrita fosse atendida por outro worker.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        # uma segunda aula no mesmo ano letivo, com as notas já alteradas várias vezes
+        db.session.add(Aula(hora_inicio="07:00:00", hora_fim="09:00:00", dias_da_semana=["Segunda"], usuario_id=1, disciplina_codigo="MAT001", turma_id=1, versao_notas=5))
+        db.session.commit()
+
+        assert client.get("/notas/calendario/2026/estatisticas").json["estatisticas"]["u1"]["quantidade"] == 0
+
+        monkeypatch.setattr(estatisticas_cache, "invalidar", lambda *etiquetas: set())
+        response = client.post("/notas/", json={"aula_id": 1, "alunos": [{"matricula": "202600000001", "nota": 8.0}]})
+        assert response.status_code == 201, "O status code deve ser 201 (Created)."
+
+        assert db.session.get(Aula, 1).versao_notas == 1
+        assert client.get("/notas/calendario/2026/estatisticas").json["estatisticas"]["u1"]["quantidade"] == 1
+
+
+def test_buscar_estatisticas_aula_inexistente(client, app):
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get("/notas/99/estatisticas")
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["O 'id_aula' não corresponde a nenhuma aula"]
+
+
+def test_buscar_estatisticas_calendario(client, app):
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        # uma segunda aula no mesmo ano letivo
+        db.session.add(Aula(hora_inicio="07:00:00", hora_fim="09:00:00", dias_da_semana=["Segunda"], usuario_id=1, disciplina_codigo="MAT001", turma_id=1))
+        db.session.commit()
+        db.session.add(Boletim(aluno_matricula="202600000001", aula_id=2, notas=[5.0, 5.0, 5.0, 5.0], ausencias=0))
+        db.session.get(Boletim, ("202600000001", 1)).notas = [8.0, 8.0, 8.0, 8.0]
+        db.session.get(Boletim, ("202600000002", 1)).notas = [6.0, 6.0, 6.0, 6.0]
+        db.session.commit()
+
+        response = client.get("/notas/calendario/2026/estatisticas")
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.json["quantidade_boletins"] == 3
+        assert response.json["estatisticas"]["media_final"]["media"] == 6.33
+        assert [(aula["aula_id"], aula["quantidade"], aula["media"], aula["taxa_aprovacao"]) for aula in response.json["aulas"]] == [(1, 2, 7.0, 1.0), (2, 1, 5.0, 0.0)]
+
+        # a alteração de notas de uma aula descarta as estatísticas do ano letivo
+        response = client.put("/notas/202600000001/2", json={"notas": [9.0, 9.0, 9.0, 9.0]})
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+        response = client.get("/notas/calendario/2026/estatisticas")
+
+        assert response.json["aulas"][1]["media"] == 9.0
+
+        response = client.get("/notas/calendario/1999/estatisticas")
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Calendário não existe"]
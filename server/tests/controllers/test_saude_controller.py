@@ -0,0 +1,126 @@
+"""
+Este módulo contém testes para o controlador de saúde do servidor.
+
+Os testes verificam a rota que informa o estado do pool de conexões do worker, o comando `estado-pool` e as métricas
+das consultas SQL de cada requisição (`Server-Timing`, `/metrics` e o log de requisições lentas).
+"""
+
+import os
+import re
+import logging
+from app import create_app
+from app.config import TestConfig
+from app.extensions import db, metricas
+from tests.user_event import usuario_entra_no_sistema
+
+
+def test_estado_pool(client, app):
+    """Testa se a rota `/saude/pool` informa o estado do pool de conexões do worker que atendeu a requisição.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get("/saude/pool")
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+        estado = response.json["padrao"]
+        assert estado["pid"] == os.getpid()
+        assert estado["tamanho"] == app.config["SQLALCHEMY_ENGINE_OPTIONS"]["pool_size"]
+        assert estado["checkouts"] >= 1, "As conexões entregues pelo pool devem ser contadas."
+        assert estado["em_uso"] >= 1, "A conexão da própria requisição deve estar em uso."
+        assert estado["timeouts"] == 0
+
+
+def test_comando_estado_pool(app, runner):
+    """Testa se o comando `estado-pool` lista as conexões abertas pelo processo atual.
+
+    Args:
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+        runner (FlaskCliRunner): Executor dos comandos de linha de comando da aplicação.
+    """
+    with app.app_context():
+        # mantém uma segunda conexão do pool aberta, além da usada pelo comando
+        with db.engine.connect() as conexao:
+            conexao.exec_driver_sql("SELECT 1")
+            resultado = runner.invoke(args=["estado-pool"])
+
+        assert resultado.exit_code == 0, resultado.output
+        assert "Pool por worker: tamanho" in resultado.output
+        assert any(linha.split()[0] == str(os.getpid()) for linha in resultado.output.splitlines()[2:])
+
+
+def test_server_timing_e_metricas(client, app):
+    """Testa se cada resposta informa as consultas e o tempo no banco no `Server-Timing` e se a rota `/metrics` os acumula por rota.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    metricas.zerar()
+
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+
+        response = client.get("/disciplina/")
+        assert response.status_code == 200
+
+        componentes = dict(item.strip().split(";", 1) for item in response.headers["Server-Timing"].split(","))
+        assert re.fullmatch(r'dur=[\d.]+;desc="2 consultas"', componentes["db"]), "A busca do usuário e a listagem devem ser contadas."
+        assert re.fullmatch(r"dur=[\d.]+", componentes["total"])
+
+        client.get("/disciplina/")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.mimetype == "text/plain"
+
+        rotulos = f'metodo="GET",rota="/disciplina/",pid="{os.getpid()}"'
+        assert f'edumanager_requisicoes_total{{{rotulos},status="200"}} 2' in response.text
+        assert f"edumanager_sql_consultas_por_requisicao_sum{{{rotulos}}} 4.0" in response.text
+        assert f'edumanager_requisicao_duracao_segundos_bucket{{{rotulos},le="+Inf"}} 2' in response.text
+        assert 'edumanager_pool_em_uso{bind="padrao"}' in response.text
+        # o mesmo cookie é enviado nas duas listagens, então o token foi encontrado no cache ao menos uma vez
+        acertos = re.search(r'^edumanager_cache_acertos_total\{cache="tokens"\} (\d+)$', response.text, re.MULTILINE)
+        assert acertos and int(acertos.group(1)) >= 1, "Os acertos do cache dos tokens devem ser exportados."
+        assert re.search(r'^edumanager_cache_falhas_total\{cache="tokens"\} \d+$', response.text, re.MULTILINE)
+        assert re.search(r'^edumanager_cache_taxa_acerto\{cache="tokens"\} [\d.]+$', response.text, re.MULTILINE)
+
+        response = client.get("/saude/consultas")
+        rota = next(rota for rota in response.json if rota["rota"] == "/disciplina/")
+        assert rota["requisicoes"] == 2
+        assert rota["consultas_media"] == 2.0
+        assert any("FROM disciplina" in comando["comando"] for comando in rota["comandos_lentos"])
+
+
+def test_log_requisicoes_lentas(client, app, caplog):
+    """Testa se, com `LOG_REQUISICOES_LENTAS_MS`, as requisições lentas são registradas com os comandos e os parâmetros.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+        caplog (LogCaptureFixture): Captura das mensagens de log.
+    """
+    app_log = create_app(type("LogConfig", (TestConfig,), {"LOG_REQUISICOES_LENTAS_MS": 0.001}))
+    client_log = app_log.test_client()
+
+    with app_log.app_context():
+        usuario_entra_no_sistema(client_log, app_log)
+
+        with caplog.at_level(logging.WARNING):
+            client_log.get("/notas/999")
+
+    mensagem = next(registro.getMessage() for registro in caplog.records if "Requisição lenta" in registro.getMessage())
+    assert "GET /notas/999" in mensagem
+    assert "{'pk_1': 999}" in mensagem, "Os parâmetros dos comandos devem ser registrados."
+
+    caplog.clear()
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        with caplog.at_level(logging.WARNING):
+            client.get("/notas/999")
+
+    assert not any("Requisição lenta" in registro.getMessage() for registro in caplog.records), "O log é desativado por padrão."
@@ -5,7 +5,10 @@ Os testes verificam as operações básicas de CRUD (Create, Read, Update, Delet
 incluindo cadastro, listagem, busca, atualização e remoção de turmas no banco de dados.
 """
 
-from app.models import Turma, Sala, Calendario
+import json
+from app.models import Turma, Sala, Calendario, Aula, Usuario, Disciplina, HorarioAula
+from app.utils.agenda_helpers import montar_horarios
+from app.utils import stream_helpers
 from app.extensions import db
 from app.utils.date_helpers import string_para_data
 from tests.user_event import usuario_entra_no_sistema
@@ -226,6 +229,35 @@ def test_cadastrar_turma_com_horario_invalido(client, app):
         assert "Já existe uma turma no mesmo horário" in response.json["erro"], "Deve retornar uma mensagem de erro no horário"
 
 
+def test_listar_turmas_ndjson(client, app, monkeypatch):
+    """Testa a listagem de turmas transmitida em NDJSON, lendo o banco em vários lotes.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+        monkeypatch (MonkeyPatch): Fixture do pytest para reduzir o tamanho do lote.
+    """
+    monkeypatch.setattr(stream_helpers, "TAMANHO_LOTE", 2)
+
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        for serie in "ABCDE":
+            db.session.add(Turma(ano=9, serie=serie, nivel_de_ensino="Ensino Fundamental", turno="M", status="A", sala_numero=101, calendario_ano_letivo=2026))
+        db.session.commit()
+
+        response = client.get('/turma/', headers={"Accept": "application/x-ndjson"})
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.mimetype == "application/x-ndjson", "A resposta deve ser NDJSON."
+
+        linhas = response.get_data(as_text=True).splitlines()
+        assert [json.loads(linha)["serie"] for linha in linhas] == list("ABCDE"), "Deve haver uma turma por linha."
+        assert sorted(linhas, key=lambda linha: json.loads(linha)["id"]) == linhas
+        assert [json.loads(linha) for linha in linhas] == sorted(client.get('/turma/').json, key=lambda turma: turma["id"]), "Os dados devem ser os mesmos da listagem em JSON."
+
+
 def test_listar_turmas(client, app):
     """Testa a listagem de turmas cadastradas.
 
@@ -326,6 +358,46 @@ def test_alterar_turma(client, app):
         assert dados["sala_numero"] == 101, "O numero da sala da turma deve ser 101."
         assert dados["calendario_ano_letivo"] == 2026, "O calendario do ano letivo deve ser 2026."
 
+def test_alterar_ano_letivo_da_turma_com_aulas(client, app):
+    """Testa se a alteração do ano letivo de uma turma move os horários das suas aulas e recusa a sobreposição com
+    as aulas do professor no novo ano letivo.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        usuario_entra_no_sistema(client, app)
+
+        for ano_letivo in (2027, 2028):
+            db.session.add(Calendario(ano_letivo=ano_letivo, data_inicio=string_para_data(f"{ano_letivo}-02-17"), data_fim=string_para_data(f"{ano_letivo}-11-27"), dias_letivos=150))
+        disciplina = Disciplina(codigo="MAT001", nome="Matemática", carga_horaria=30, ementa=None, bibliografia=None)
+        professor = Usuario(cpf="12345678901", nome="John Cena", email="jcena@hotmail.com", senha="bocaAberta123", telefone="79 9 9988-7766", endereco="Rua das Flores", horario_de_trabalho="Seg-Sex,13h-17h", data_de_nascimento=string_para_data("1990-04-02"), tipo="p", disciplinas=[disciplina])
+        turma = Turma(ano=9, serie="A", nivel_de_ensino="Ensino Fundamental", turno="M", status="A", sala_numero=101, calendario_ano_letivo=2026)
+        outra_turma = Turma(ano=8, serie="A", nivel_de_ensino="Ensino Fundamental", turno="M", status="A", sala_numero=101, calendario_ano_letivo=2027)
+        db.session.add_all([disciplina, professor, turma, outra_turma])
+        db.session.commit()
+
+        for turma_da_aula in (turma, outra_turma):
+            aula = Aula(hora_inicio="08:00", hora_fim="09:00", dias_da_semana=["Segunda"], usuario_id=professor.id, disciplina_codigo="MAT001", turma_id=turma_da_aula.id)
+            aula.horarios = montar_horarios(["Segunda"], "08:00", "09:00", turma_da_aula.calendario_ano_letivo, turma_da_aula.id, professor.id)
+            db.session.add(aula)
+        db.session.commit()
+
+        dados = {"ano": 9, "serie": "A", "nivel_de_ensino": "Ensino Fundamental", "turno": "N", "status": "A", "sala_numero": 101, "calendario_ano_letivo": 2027}
+
+        response = client.put(f'/turma/{turma.id}', json=dados)
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["Os professores da turma já têm aulas no mesmo horário no novo ano letivo"]
+
+        response = client.put(f'/turma/{turma.id}', json={**dados, "calendario_ano_letivo": 2028})
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+        horario = db.session.query(HorarioAula).filter_by(turma_id=turma.id).one()
+        assert horario.periodo.lower.year == 2028, "Os horários devem ser movidos para a semana de referência do novo ano letivo."
+
+
 def test_alterar_turma_com_horario_invalido(client, app):
     """Testa a alteração de uma turma em uma horário que já existe outra turma.
 
@@ -10,6 +10,7 @@ from app.utils.usuario_helpers import checar_senha
 from app.extensions import db
 from app.utils.date_helpers import string_para_data
 from tests.user_event import usuario_entra_no_sistema
+from tests.sql_event import contar_consultas
 
 
 def test_cadastrar_usuario_valido_do_tipo_professor(client, app):
@@ -633,4 +634,166 @@ def test_deletar_usuario_do_tipo_funcionario(client, app):
 
         response = client.delete(f'/usuario/{usuario.id}')
         assert response.status_code == 200, "O status code deve ser 200 (OK)."
-        assert response.json["mensagem"] == "Usuário deletado com sucesso!"
\ No newline at end of file
+        assert response.json["mensagem"] == "Usuário deletado com sucesso!"
+
+
+def criar_usuarios(quantidade: int) -> list:
+    """Cadastra professores com duas disciplinas e dois cargos cada, retornando os seus ids."""
+    disciplina1 = Disciplina(codigo="MAT123", nome="Matemática", carga_horaria=60, ementa=None, bibliografia=None)
+    disciplina2 = Disciplina(codigo="FIS789", nome="Física", carga_horaria=60, ementa=None, bibliografia=None)
+
+    usuarios = [
+        Usuario(cpf=f"1000000000{i}", nome=f"Professor {i}", email=f"professor{i}@email.com", senha="bocaAberta123", telefone="79 9 9988-7766", endereco="Rua das Flores, N° 124, Centro, Carira-Sergipe", horario_de_trabalho="Seg-Sex,13h-17h", data_de_nascimento="1990-04-02", tipo="p", formacao="Licenciatura em Matemática", escolaridade=None, habilidades=None, disciplinas=[disciplina1, disciplina2], cargos=[Cargo(nome="Professor", salario=3060.0, data_contrato="2027-12-31"), Cargo(nome="Coordenador", salario=1040.0, data_contrato="2027-12-31")])
+        for i in range(quantidade)
+    ]
+
+    db.session.add_all(usuarios)
+    db.session.commit()
+
+    return [usuario.id for usuario in usuarios]
+
+
+def test_listar_usuarios(client, app):
+    """Testa se a listagem de usuários carrega as disciplinas e os cargos sem uma consulta por usuário.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        ids = criar_usuarios(5)
+
+        with contar_consultas() as consultas:
+            response = client.get('/usuario/')
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        # o middleware busca o usuário do token; os usuários, as disciplinas e os cargos são uma consulta cada
+        assert len(consultas) == 4, "A listagem deve usar uma consulta para cada relacionamento, e não uma por usuário."
+        assert [usuario["id"] for usuario in response.json] == ids
+        assert sorted(response.json[0]["disciplinas"], key=lambda disciplina: disciplina["codigo"]) == [{"codigo": "FIS789", "nome": "Física"}, {"codigo": "MAT123", "nome": "Matemática"}]
+        assert {cargo["nome"] for cargo in response.json[0]["cargos"]} == {"Professor", "Coordenador"}
+        assert all("senha" not in usuario for usuario in response.json), "A listagem nunca deve conter o hash da senha."
+
+        with contar_consultas() as consultas:
+            response = client.get('/usuario/?fields=id,nome,tipo&limite=3')
+
+        assert len(consultas) == 2, "Sem disciplinas e cargos nos campos, apenas os usuários devem ser consultados."
+        assert response.json == [{"id": id, "nome": f"Professor {i}", "tipo": "p"} for i, id in enumerate(ids[:3])]
+        assert response.headers["X-Proximo-Cursor"] == str(ids[2])
+
+        response = client.get(f'/usuario/?fields=nome&limite=3&apos={ids[2]}')
+
+        assert response.json == [{"nome": "Professor 3"}, {"nome": "Professor 4"}]
+        assert "X-Proximo-Cursor" not in response.headers, "A última página não deve informar um cursor."
+
+        response = client.get('/usuario/?apos=abc&fields=nome,salario')
+
+        assert response.status_code == 400, "O status code deve ser 400 (Bad Request)."
+        assert response.json["erro"] == ["O campo 'salario' não pode ser listado", "O parâmetro 'apos' deve ser um número inteiro"]
+
+        response = client.get('/usuario/?fields=id,senha')
+
+        assert response.status_code == 400, "O hash da senha não pode ser pedido nos campos."
+        assert response.json["erro"] == ["O campo 'senha' não pode ser listado"]
+
+
+def test_buscar_usuario(client, app):
+    """Testa a busca de um usuário pelo id e pelo cpf, com as disciplinas e os cargos.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        usuario_entra_no_sistema(client, app)
+        id = criar_usuarios(1)[0]
+
+        with contar_consultas() as consultas:
+            response = client.get(f'/usuario/{id}')
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert len(consultas) == 4
+        assert response.json["cpf"] == "10000000000"
+        assert len(response.json["disciplinas"]) == 2
+        assert all("id" in cargo for cargo in response.json["cargos"]), "Os cargos devem informar o id."
+        assert "senha" not in response.json, "A busca não deve retornar o hash da senha."
+
+        response = client.get('/usuario/cpf/10000000000')
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.json == client.get(f'/usuario/{id}').json
+
+        response = client.get('/usuario/cpf/99999999999')
+
+        assert response.status_code == 404, "O status code deve ser 404 (Not Found)."
+        assert response.json["erro"] == ["Usuário não encontrado"]
+
+
+def test_usuario_autenticado_em_cache(client, app):
+    """Testa se o usuário autenticado é consultado uma única vez e se o cache é descartado ao alterar e remover o usuário.
+
+    Args:
+        client (FlaskClient): Cliente de teste do Flask para simular requisições HTTP.
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+
+        usuario_entra_no_sistema(client, app)
+
+        # usuário do token de teste
+        usuario = Usuario(
+                            cpf="12345678910",
+                            nome="Randy Orton",
+                            email="rnorton@hotmail.com",
+                            senha="bocaAberta123",
+                            telefone="16 9 9944-5533",
+                            endereco="Rua das Flores, N° 124, Centro, Carira-Sergipe",
+                            horario_de_trabalho="Seg-Sex,13h-17h",
+                            data_de_nascimento="1990-04-02",
+                            tipo="f",
+                            formacao=None,
+                            escolaridade="Ensino Médio Completo",
+                            habilidades="Ferramentas do pacote office (Word, Excel...)",
+                            disciplinas=[],
+                            cargos=[]
+                        )
+        db.session.add(usuario)
+        db.session.commit()
+
+        response = client.get('/auth/validate')
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert response.json["usuario"]["nome"] == "Randy Orton"
+
+        with contar_consultas() as consultas:
+            response = client.get('/auth/validate')
+
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+        assert consultas == [], "O usuário autenticado deve vir do cache."
+
+        dados_atualizacao = {
+            "cpf": "12345678910",
+            "nome": "Randy Keith Orton",
+            "email": "rnorton@hotmail.com",
+            "telefone": "16 9 9944-5533",
+            "endereco": "Rua das Flores, N° 124, Centro, Carira-Sergipe",
+            "horario_de_trabalho": "Seg-Sex,13h-17h",
+            "data_de_nascimento": "1990-04-02",
+            "tipo": "f",
+            "formacao": None,
+            "escolaridade": "Ensino Médio Completo",
+            "habilidades": "Ferramentas do pacote office (Word, Excel...)",
+            "disciplinas": [],
+            "cargos": []
+        }
+        response = client.put(f'/usuario/{usuario.id}', json=dados_atualizacao)
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+        response = client.get('/auth/validate')
+        assert response.json["usuario"]["nome"] == "Randy Keith Orton", "A alteração do usuário deve descartar o cache."
+
+        response = client.delete(f'/usuario/{usuario.id}')
+        assert response.status_code == 200, "O status code deve ser 200 (OK)."
+
+        response = client.get('/auth/validate')
+        assert response.status_code == 401, "A remoção do usuário deve descartar o cache."
@@ -5,8 +5,11 @@ Os testes verificam as operações básicas de CRUD (Create, Read, Update, Delet
 incluindo cadastro, listagem, busca, atualização e remoção de aulas no banco de dados.
 """
 
-from app.models import Aula, Usuario, Cargo, Disciplina, Turma, Calendario, Sala
+import pytest
+from sqlalchemy.exc import IntegrityError
+from app.models import Aula, Usuario, Cargo, Disciplina, Turma, Calendario, Sala, HorarioAula
 from app.extensions import db
+from app.utils.agenda_helpers import montar_horarios, eh_conflito_de_horario
 from app.utils.date_helpers import string_para_data
 from app.utils.hour_helpers import string_para_hora
 from app.utils.usuario_helpers import gerar_hashing
@@ -180,4 +183,48 @@ def test_remover_aula(app):
         db.session.commit()
 
         aula_deletada = db.session.get(Aula, aula.id)
-        assert aula_deletada is None
\ No newline at end of file
+        assert aula_deletada is None
+
+def test_horarios_sobrepostos_recusados_pelo_banco(app):
+    """Testa se as restrições de exclusão de `HorarioAula` recusam aulas sobrepostas da mesma turma ou do mesmo professor.
+
+    Args:
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+
+        aula = Aula(hora_inicio=string_para_hora("08:00:00"), hora_fim=string_para_hora("09:00:00"), dias_da_semana=["Segunda"], usuario_id=1, disciplina_codigo="MAT001", turma_id=1)
+        aula.horarios = montar_horarios(["Segunda"], "08:00", "09:00", 2026, 1, 1)
+        db.session.add(aula)
+        db.session.commit()
+
+        # termina quando a primeira começa, então não se sobrepõe
+        anterior = Aula(hora_inicio=string_para_hora("07:00:00"), hora_fim=string_para_hora("08:00:00"), dias_da_semana=["Segunda"], usuario_id=1, disciplina_codigo="MAT001", turma_id=1)
+        anterior.horarios = montar_horarios(["Segunda"], "07:00", "08:00", 2026, 1, 1)
+        db.session.add(anterior)
+        db.session.commit()
+
+        sobreposta = Aula(hora_inicio=string_para_hora("08:30:00"), hora_fim=string_para_hora("09:30:00"), dias_da_semana=["Segunda"], usuario_id=1, disciplina_codigo="MAT001", turma_id=1)
+        sobreposta.horarios = montar_horarios(["Segunda"], "08:30", "09:30", 2026, 1, 1)
+        db.session.add(sobreposta)
+
+        with pytest.raises(IntegrityError) as erro:
+            db.session.commit()
+        db.session.rollback()
+        assert eh_conflito_de_horario(erro.value), "A sobreposição deve violar a restrição de exclusão."
+
+        # o mesmo horário em outro ano letivo fica em outra semana de referência
+        db.session.add(Calendario(ano_letivo=2027, data_inicio=string_para_data("2027-02-17"), data_fim=string_para_data("2027-11-27"), dias_letivos=150))
+        turma = Turma(ano=9, serie="A", nivel_de_ensino="Ensino Fundamental", turno="M", status="A", sala_numero=101, calendario_ano_letivo=2027)
+        db.session.add(turma)
+        db.session.commit()
+
+        proximo_ano = Aula(hora_inicio=string_para_hora("08:00:00"), hora_fim=string_para_hora("09:00:00"), dias_da_semana=["Segunda"], usuario_id=1, disciplina_codigo="MAT001", turma_id=turma.id)
+        proximo_ano.horarios = montar_horarios(["Segunda"], "08:00", "09:00", 2027, turma.id, 1)
+        db.session.add(proximo_ano)
+        db.session.commit()
+
+        db.session.delete(db.session.get(Aula, aula.id))
+        db.session.commit()
+        assert db.session.query(HorarioAula).filter_by(aula_id=aula.id).count() == 0, "Os horários devem ser removidos com a aula."
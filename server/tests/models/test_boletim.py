@@ -1,3 +1,4 @@
+from sqlalchemy import text
 from app.models import Aula, Usuario, Cargo, Disciplina, Turma, Calendario, Sala, Aluno, Boletim
 from app.extensions import db
 from app.utils.usuario_helpers import gerar_hashing
@@ -85,3 +86,38 @@ def test_alterar_notas_aula(app):
         
 
 
+
+def test_resumo_notas_boletim(app):
+    """Testa se a quantidade de notas e a média do boletim são mantidas pelo banco a cada alteração das notas.
+
+    Args:
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        criar_dependencias(app)
+        boletim = Boletim(aluno_matricula="202600000001", aula_id=1, notas=[7.5, 8.0, 6.5], ausencias=0)
+        db.session.add(boletim)
+        db.session.commit()
+
+        assert boletim.quantidade_notas == 3
+        assert boletim.media is None, "A média só deve existir quando as quatro notas forem cadastradas."
+
+        boletim.notas = [7.5, 8.0, 6.5, 9.0]
+        db.session.commit()
+
+        assert boletim.quantidade_notas == 4
+        assert boletim.media == (7.5 + 8.0 + 6.5 + 9.0) / 4
+
+def test_boletins_de_uma_aula_usam_indice(app):
+    """Testa se os boletins de uma aula são buscados pelo índice `ix_boletim_aula_id`.
+
+    Args:
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.app_context():
+        # sem varredura sequencial, os boletins de uma aula são buscados pelo índice
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+        plano = "\n".join(db.session.execute(text("EXPLAIN SELECT * FROM boletim WHERE aula_id = 1")).scalars())
+        db.session.rollback()
+
+        assert "ix_boletim_aula_id" in plano
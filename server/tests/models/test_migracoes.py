@@ -0,0 +1,43 @@
+"""
+Este módulo contém testes para as migrações do esquema do banco de dados.
+
+Os testes verificam se as migrações, aplicadas a um banco vazio, criam exatamente o esquema declarado nos modelos, e se o
+comando `migracoes-pendentes` lista as migrações ainda não aplicadas.
+"""
+
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import text
+from app.extensions import db
+
+
+def test_migracoes_criam_esquema_dos_modelos(app, runner):
+    """Testa a aplicação de todas as migrações em um banco vazio e o comando `migracoes-pendentes`.
+
+    Args:
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+        runner (FlaskCliRunner): Executor dos comandos de linha de comando da aplicação.
+    """
+    with app.app_context():
+        db.drop_all()
+
+        resultado = runner.invoke(args=["migracoes-pendentes"])
+        assert resultado.exit_code == 1, "Com o banco vazio, todas as migrações devem estar pendentes."
+        assert [linha.split()[0] for linha in resultado.output.splitlines()] == ["0001", "0002", "0003", "0004", "0005", "0006"]
+
+        try:
+            resultado = runner.invoke(args=["db", "upgrade"])
+            assert resultado.exit_code == 0, resultado.output
+
+            with db.engine.connect() as conexao:
+                diferencas = compare_metadata(MigrationContext.configure(conexao), db.metadata)
+            assert diferencas == [], "As migrações devem criar o mesmo esquema declarado nos modelos."
+
+            resultado = runner.invoke(args=["migracoes-pendentes"])
+            assert resultado.exit_code == 0, resultado.output
+            assert resultado.output.strip() == "Nenhuma migração pendente."
+        finally:
+            runner.invoke(args=["db", "downgrade", "base"])
+            db.session.execute(text("DROP TABLE IF EXISTS alembic_version"))
+            db.session.commit()
+            db.create_all()
@@ -0,0 +1,17 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+from app.extensions import db
+
+@contextmanager
+def contar_consultas():
+    """Registra os comandos SQL enviados ao banco dentro do bloco `with`, retornando a lista de comandos."""
+    consultas = []
+
+    def registrar(conn, cursor, statement, parameters, context, executemany):
+        consultas.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", registrar)
+    try:
+        yield consultas
+    finally:
+        event.remove(db.engine, "before_cursor_execute", registrar)
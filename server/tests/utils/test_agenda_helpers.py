@@ -0,0 +1,47 @@
+"""
+Este módulo contém testes para o módulo `agenda_helpers`.
+
+Os testes verificam a busca por sobreposição nos índices de intervalos e a semana de referência dos horários.
+"""
+
+from datetime import date, datetime
+from app.utils.agenda_helpers import IndiceDeIntervalos, AgendaDeAulas, ler_hora, semana_de_referencia, montar_horarios, CONFLITOS
+
+
+def test_indice_de_intervalos():
+    """Testa a sobreposição com intervalos adjacentes, contidos e com um intervalo longo no início do dia."""
+    indice = IndiceDeIntervalos()
+    for inicio, fim, aula_id in [("10:00", "11:00", 2), ("07:00", "12:00", 1), ("13:00", "14:00", 3)]:
+        indice.adicionar(ler_hora(inicio), ler_hora(fim), aula_id)
+
+    assert not indice.sobrepoe(ler_hora("12:00"), ler_hora("13:00")), "Intervalos adjacentes não se sobrepõem."
+    assert not indice.sobrepoe(ler_hora("06:00"), ler_hora("07:00"))
+    assert not indice.sobrepoe(ler_hora("14:00"), ler_hora("15:00"))
+    # a aula das 10h termina antes, mas a das 7h, que começa antes dela, termina às 12h
+    assert indice.sobrepoe(ler_hora("11:30"), ler_hora("12:30"))
+    assert indice.sobrepoe(ler_hora("13:30"), ler_hora("13:45"))
+    assert indice.sobrepoe(ler_hora("06:00"), ler_hora("18:00"))
+
+
+def test_agenda_de_aulas():
+    """Testa se a agenda informa um conflito por turma, professor e sala, e apenas nos dias em que há sobreposição."""
+    agenda = AgendaDeAulas()
+    agenda.adicionar(1, ["Segunda", "Quarta"], "08:00", "09:00", turma_id=1, usuario_id=1, sala_numero=101)
+
+    assert agenda.conflitos(["Terça"], "08:00", "09:00", turma_id=1, usuario_id=1, sala_numero=101) == []
+    assert agenda.conflitos(["Terça", "Quarta"], "08:30", "10:00", turma_id=1, usuario_id=1, sala_numero=101) == [CONFLITOS["turma"], CONFLITOS["professor"], CONFLITOS["sala"]]
+    assert agenda.conflitos(["Segunda"], "08:30", "10:00", turma_id=2, usuario_id=1, sala_numero=102) == [CONFLITOS["professor"]]
+    assert agenda.conflitos(["Segunda"], "08:30", "10:00", turma_id=2, usuario_id=2, sala_numero=101) == [CONFLITOS["sala"]]
+    assert agenda.conflitos(["Segunda"], "08:30", "10:00", turma_id=2, usuario_id=2, sala_numero=None) == []
+
+
+def test_semana_de_referencia():
+    """Testa se os horários ficam na primeira semana iniciada em uma segunda-feira do ano letivo."""
+    assert semana_de_referencia(2026) == date(2026, 1, 5)
+    assert semana_de_referencia(2024) == date(2024, 1, 1)
+
+    horarios = montar_horarios(["Quarta", "Segunda"], "08:00", "09:30", 2026, turma_id=1, usuario_id=2)
+
+    assert [horario.dia_da_semana for horario in horarios] == ["Quarta", "Segunda"]
+    assert horarios[0].periodo.lower == datetime(2026, 1, 7, 8, 0)
+    assert horarios[0].periodo.upper == datetime(2026, 1, 7, 9, 30)
@@ -0,0 +1,149 @@
+"""
+Este módulo contém testes para o cache em memória do módulo `cache_helpers` e para o cache de PDFs do módulo `pdf_helpers`.
+
+Os testes verificam o descarte dos itens menos usados, a expiração, a invalidação por etiquetas e o nível em disco do cache de PDFs.
+"""
+
+import os
+import time
+from contextlib import nullcontext
+from app.utils.boletim_helpers import gerar_pdf_boletim
+from app.utils.cache_helpers import CacheLRU
+from app.utils.pdf_helpers import RenderizadorPDF, CachePDF
+
+
+ALUNO = {"nome": "João Pedro dos Santos", "matricula": "202600000001"}
+TURMA = {"ano": 9, "serie": "A", "nivel_de_ensino": "Ensino Fundamental", "ano_letivo": 2026}
+DADOS = [["Matemática", "7.5", "8.0", "6.5", "9.0", "7.8", "2", "Cursando"]]
+
+
+class RenderizadorContador(RenderizadorPDF):
+    """Renderizador que conta quantos documentos foram realmente gerados."""
+
+    def __init__(self):
+        super().__init__()
+        self.renderizados = 0
+
+    def renderizar(self, funcao, *args):
+        self.renderizados += 1
+        return super().renderizar(funcao, *args)
+
+
+def test_cache_lru_descarta_menos_usado():
+    """Testa se o item usado há mais tempo é descartado ao exceder a capacidade."""
+    cache = CacheLRU(capacidade=2)
+    cache.definir("a", 1)
+    cache.definir("b", 2)
+    cache.obter("a")
+    cache.definir("c", 3)
+
+    assert cache.obter("a") == 1
+    assert cache.obter("b") is None
+    assert cache.obter("c") == 3
+    assert len(cache) == 2
+
+
+def test_cache_lru_expiracao():
+    """Testa se os itens expirados deixam de ser retornados."""
+    cache = CacheLRU(ttl=0.01)
+    cache.definir("a", 1)
+    time.sleep(0.02)
+
+    assert cache.obter("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_lru_invalidar_etiquetas():
+    """Testa a invalidação de todos os itens associados a uma etiqueta."""
+    cache = CacheLRU()
+    cache.definir("boletim", 1, etiquetas=["202600000001"])
+    cache.definir("turma", 2, etiquetas=["202600000001", "202600000002"])
+    cache.definir("outro", 3, etiquetas=["202600000002"])
+
+    removidas = cache.invalidar("202600000001")
+
+    assert removidas == {"boletim", "turma"}
+    assert cache.obter("outro") == 3
+    assert cache.acertos == 1
+
+
+def test_cache_pdf_reutiliza_documento(app):
+    """Testa se um documento com os mesmos dados é gerado apenas uma vez e se dados diferentes geram outro documento."""
+    renderizador = RenderizadorContador()
+    cache = CachePDF(renderizador, app)
+
+    primeiro = cache.obter_ou_renderizar(gerar_pdf_boletim, ALUNO, TURMA, DADOS, matriculas=[ALUNO["matricula"]])
+    segundo = cache.obter_ou_renderizar(gerar_pdf_boletim, ALUNO, TURMA, DADOS, matriculas=[ALUNO["matricula"]])
+
+    assert primeiro.getvalue() == segundo.getvalue()
+    assert renderizador.renderizados == 1
+
+    dados_alterados = [["Matemática", "7.5", "8.0", "6.5", "9.0", "7.8", "3", "Cursando"]]
+    cache.obter_ou_renderizar(gerar_pdf_boletim, ALUNO, TURMA, dados_alterados, matriculas=[ALUNO["matricula"]])
+
+    assert renderizador.renderizados == 2
+
+
+def test_cache_pdf_em_disco(app, tmp_path):
+    """Testa o nível em disco: reaproveitamento entre instâncias, invalidação e limite de arquivos."""
+    app.config.update({"PDF_CACHE_DIR": str(tmp_path), "PDF_CACHE_DISCO_MAX_ITENS": 1})
+
+    renderizador = RenderizadorContador()
+    cache = CachePDF(renderizador, app)
+    cache.obter_ou_renderizar(gerar_pdf_boletim, ALUNO, TURMA, DADOS, matriculas=[ALUNO["matricula"]])
+
+    # outro processo (nova instância, memória vazia) lê o documento do disco
+    outro_cache = CachePDF(renderizador, app)
+    pdf_buffer = outro_cache.obter_ou_renderizar(gerar_pdf_boletim, ALUNO, TURMA, DADOS, matriculas=[ALUNO["matricula"]])
+
+    assert pdf_buffer.read(4) == b"%PDF"
+    assert renderizador.renderizados == 1
+
+    # o limite de arquivos descarta o documento mais antigo
+    outro_aluno = {"nome": "Maria Clara Souza", "matricula": "202600000002"}
+    cache.obter_ou_renderizar(gerar_pdf_boletim, outro_aluno, TURMA, DADOS, matriculas=[outro_aluno["matricula"]])
+
+    assert len(os.listdir(tmp_path)) == 1
+
+    cache.invalidar(outro_aluno["matricula"])
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_cache_pdf_em_disco_limpeza_periodica(app, tmp_path):
+    """Testa se o excedente do disco só é descartado a cada `PDF_CACHE_DISCO_MAX_ITENS // 10` gravações."""
+    app.config.update({"PDF_CACHE_DIR": str(tmp_path), "PDF_CACHE_DISCO_MAX_ITENS": 20})
+
+    cache = CachePDF(RenderizadorContador(), app)
+    for i in range(1, 22):
+        aluno = {"nome": f"Aluno {i}", "matricula": f"2026000{i:05d}"}
+        cache.obter_ou_renderizar(gerar_pdf_boletim, aluno, TURMA, DADOS, matriculas=[aluno["matricula"]])
+
+    assert len(os.listdir(tmp_path)) == 21, "A gravação que não completa o intervalo não deve percorrer o diretório."
+
+    aluno = {"nome": "Aluno 22", "matricula": "202600000022"}
+    cache.obter_ou_renderizar(gerar_pdf_boletim, aluno, TURMA, DADOS, matriculas=[aluno["matricula"]])
+
+    assert len(os.listdir(tmp_path)) == 20
+
+
+def test_cache_pdf_em_disco_arquivo_removido_por_outro_processo(app, tmp_path, monkeypatch):
+    """Testa se um arquivo descartado por outro worker durante a limpeza é tratado como já removido."""
+    app.config.update({"PDF_CACHE_DIR": str(tmp_path), "PDF_CACHE_DISCO_MAX_ITENS": 1})
+    cache = CachePDF(RenderizadorContador(), app)
+
+    for nome, instante in (("antigo", 1), ("recente", 2)):
+        (tmp_path / f"{nome}.pdf").write_bytes(b"%PDF")
+        os.utime(tmp_path / f"{nome}.pdf", (instante, instante))
+
+    class EntradaRemovida:
+        name = "removido.pdf"
+
+        def stat(self):
+            raise FileNotFoundError(self.name)
+
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda caminho: nullcontext([*scandir(caminho), EntradaRemovida()]))
+    cache._limitar_disco()
+
+    assert os.listdir(tmp_path) == ["recente.pdf"]
@@ -0,0 +1,57 @@
+"""
+Este módulo contém testes para as funções do módulo `estatisticas_helpers`.
+
+Os testes verificam a montagem da matriz de notas e o cálculo das estatísticas, inclusive para colunas sem notas e agrupamentos.
+"""
+
+import numpy as np
+from app.utils.estatisticas_helpers import montar_matriz_notas, calcular_estatisticas, calcular_resumo_por_grupo
+
+
+def com_medias(lista_de_notas: list) -> list:
+    """Monta os pares (notas, media) dos boletins, com a média calculada como a coluna `Boletim.media`."""
+    return [(notas, sum(notas[:4]) / 4 if len(notas) >= 4 else None) for notas in lista_de_notas]
+
+
+def test_montar_matriz_notas():
+    """Testa se as notas ausentes e a média final de quem não tem as quatro notas ficam como NaN."""
+    matriz = montar_matriz_notas([([7.5, 8.0, 6.5, 9.0], 7.75), ([5.0], None), ([10.0, 10.0, 10.0, 10.0, 3.0], 10.0)])
+
+    assert matriz.shape == (3, 5)
+    assert matriz[0, 4] == 7.75, "A média final deve ser a média calculada pelo banco."
+    assert np.isnan(matriz[1, 1:]).all()
+    assert matriz[2, 3] == 10.0, "Notas além da quarta unidade devem ser ignoradas."
+
+
+def test_calcular_estatisticas_sem_notas():
+    """Testa se colunas sem nenhuma nota retornam valores nulos em vez de NaN."""
+    estatisticas = calcular_estatisticas(montar_matriz_notas([]), nota_minima=6.0)
+
+    assert estatisticas["u1"]["quantidade"] == 0
+    assert estatisticas["u1"]["media"] is None
+    assert estatisticas["u1"]["percentis"]["p90"] is None
+    assert estatisticas["u1"]["histograma"] == [0] * 10
+
+
+def test_calcular_estatisticas():
+    """Testa os percentis, a taxa de aprovação e o histograma, incluindo a nota 10 na última faixa."""
+    matriz = montar_matriz_notas(com_medias([[2.0], [6.0], [7.0], [10.0]]))
+    estatisticas = calcular_estatisticas(matriz, nota_minima=6.0)["u1"]
+
+    assert estatisticas["media"] == 6.25
+    assert estatisticas["mediana"] == 6.5
+    assert estatisticas["percentis"]["p25"] == 5.0
+    assert estatisticas["taxa_aprovacao"] == 0.75
+    assert estatisticas["histograma"] == [0, 0, 1, 0, 0, 0, 1, 1, 0, 1]
+
+
+def test_calcular_resumo_por_grupo():
+    """Testa o resumo da média final por grupo, inclusive para grupos sem médias finais."""
+    matriz = montar_matriz_notas(com_medias([[8.0] * 4, [4.0] * 4, [5.0], [9.0] * 4]))
+    resumos = calcular_resumo_por_grupo(matriz, np.array([0, 0, 1, 2]), 3, nota_minima=6.0)
+
+    assert resumos == [
+        {"quantidade": 2, "media": 6.0, "taxa_aprovacao": 0.5},
+        {"quantidade": 0, "media": None, "taxa_aprovacao": None},
+        {"quantidade": 1, "media": 9.0, "taxa_aprovacao": 1.0},
+    ]
@@ -0,0 +1,89 @@
+"""
+Este módulo contém testes para a configuração do gunicorn (`gunicorn.conf.py`).
+
+Os testes verificam se os valores padrão são lidos do ambiente, se os pools de cada worker são divididos entre os
+workers e se, depois do fork, cada worker descarta as conexões e os pools herdados do processo mestre.
+"""
+
+import os
+import runpy
+import pytest
+from types import SimpleNamespace
+from app.extensions import db, pdf_renderer
+from app.utils.usuario_helpers import verificador_senhas
+
+
+CAMINHO_CONFIGURACAO = os.path.join(os.path.dirname(__file__), "..", "..", "gunicorn.conf.py")
+
+
+@pytest.fixture(autouse=True)
+def ambiente_isolado(monkeypatch):
+    """Isola as variáveis de ambiente definidas pela configuração do gunicorn, para que não cheguem aos outros testes."""
+    monkeypatch.setattr(os, "environ", os.environ.copy())
+
+
+def test_configuracao_padrao(monkeypatch):
+    """Testa o número de workers e threads e o `preload_app` lidos da configuração."""
+    monkeypatch.setenv("GUNICORN_THREADS", "4")
+    monkeypatch.delenv("GUNICORN_WORKERS", raising=False)
+    monkeypatch.delenv("GUNICORN_PRELOAD", raising=False)
+
+    configuracao = runpy.run_path(CAMINHO_CONFIGURACAO)
+
+    assert configuracao["workers"] == 2 * (os.cpu_count() or 1) + 1
+    assert configuracao["threads"] == 4
+    assert configuracao["worker_class"] == "gthread"
+    assert configuracao["preload_app"] is True
+
+    monkeypatch.setenv("GUNICORN_PRELOAD", "false")
+    assert runpy.run_path(CAMINHO_CONFIGURACAO)["preload_app"] is False
+
+
+def test_recursos_divididos_entre_workers(monkeypatch):
+    """Testa se as conexões com o banco e os pools de PDFs e de senhas são divididos entre os workers, mantendo os
+    valores já definidos no ambiente."""
+    configuracao = runpy.run_path(CAMINHO_CONFIGURACAO)
+    dividir = configuracao["dividir_recursos_entre_workers"]
+
+    # 8 CPUs: 17 workers com 5 conexões cada (2 abertas e 3 de overflow), 85 no total
+    assert dividir(workers=17, threads=2, conexoes=90, cpus=8) == {
+        "DB_POOL_TAMANHO": "2", "DB_POOL_OVERFLOW": "3", "PDF_RENDER_TRABALHADORES": "1", "SENHA_HASH_TRABALHADORES": "1",
+    }
+    assert dividir(workers=2, threads=4, conexoes=90, cpus=8) == {
+        "DB_POOL_TAMANHO": "4", "DB_POOL_OVERFLOW": "41", "PDF_RENDER_TRABALHADORES": "4", "SENHA_HASH_TRABALHADORES": "4",
+    }
+
+    for variavel in ("DB_POOL_TAMANHO", "DB_POOL_OVERFLOW", "PDF_RENDER_TRABALHADORES", "SENHA_HASH_TRABALHADORES"):
+        monkeypatch.delenv(variavel, raising=False)
+    monkeypatch.setenv("GUNICORN_WORKERS", "9")
+    monkeypatch.setenv("GUNICORN_THREADS", "2")
+    monkeypatch.setenv("GUNICORN_CONEXOES_BANCO", "90")
+    monkeypatch.setenv("DB_POOL_OVERFLOW", "0")
+    runpy.run_path(CAMINHO_CONFIGURACAO)
+
+    assert os.environ["DB_POOL_TAMANHO"] == "2"
+    assert os.environ["DB_POOL_OVERFLOW"] == "0", "Os valores definidos no ambiente devem ser mantidos."
+    assert int(os.environ["PDF_RENDER_TRABALHADORES"]) == max(1, (os.cpu_count() or 1) // 9)
+
+
+def test_post_fork_descarta_conexoes_herdadas(app):
+    """Testa se o `post_fork` cria um novo pool de conexões e descarta os executores herdados do mestre."""
+    configuracao = runpy.run_path(CAMINHO_CONFIGURACAO)
+
+    with app.app_context():
+        pool_do_mestre = db.engine.pool
+        db.session.execute(db.select(1))
+        db.session.commit()
+
+    executor_do_mestre = verificador_senhas._obter_executor()
+
+    servidor = SimpleNamespace(cfg=SimpleNamespace(preload_app=True), app=SimpleNamespace(wsgi=lambda: app))
+    configuracao["post_fork"](servidor, worker=None)
+
+    with app.app_context():
+        assert db.engine.pool is not pool_do_mestre, "O worker deve abrir as suas próprias conexões."
+        assert pool_do_mestre.checkedin() == 1, "As conexões do mestre não devem ser fechadas pelo worker."
+
+    assert verificador_senhas._executor is None, "O pool de threads do mestre deve ser descartado."
+    assert verificador_senhas._obter_executor() is not executor_do_mestre
+    assert pdf_renderer._executor is None
@@ -4,7 +4,11 @@ Este módulo contém testes para as funções de autenticação JWT implementada
 Os testes verificam a geração e validação de tokens JWT para autenticação de usuários.
 """
 
+import time
+import jwt
+from datetime import datetime, timedelta, timezone
 from app.utils.login_helpers import gerar_token, validar_token
+from app.extensions import tokens_cache
 from app import create_app
 
 
@@ -49,4 +53,43 @@ def test_login_helpers():
         cpf = payload["usuario_cpf"]
 
         # Testando o validar_token
-        assert cpf == cpf_original
\ No newline at end of file
+        assert cpf == cpf_original
+
+
+def test_validar_token_em_cache(monkeypatch):
+    """Testa se um token já verificado é retornado do cache e se tokens alterados continuam sendo rejeitados."""
+    app = create_app()
+
+    with app.app_context():
+        token = gerar_token("000.000.000-00", "f")
+
+        decodificacoes = []
+        decode = jwt.decode
+        monkeypatch.setattr(jwt, "decode", lambda *args, **kwargs: decodificacoes.append(1) or decode(*args, **kwargs))
+
+        assert validar_token(token)["usuario_cpf"] == "000.000.000-00"
+        assert validar_token(token)["usuario_cpf"] == "000.000.000-00"
+        assert len(decodificacoes) == 1, "A assinatura do mesmo token deve ser verificada uma única vez."
+        assert tokens_cache.taxa_acerto == 0.5
+
+        # um token com outra assinatura não é encontrado no cache e é rejeitado
+        cabecalho, corpo, assinatura = token.split(".")
+        adulterado = f"{cabecalho}.{corpo}.{assinatura[::-1]}"
+
+        assert validar_token(adulterado) is None
+        assert validar_token(adulterado) is None
+        assert len(decodificacoes) == 3, "Tokens inválidos não devem ser guardados no cache."
+
+
+def test_validar_token_em_cache_expirado():
+    """Testa se um token deixa de ser aceito pelo cache quando expira."""
+    app = create_app()
+
+    with app.app_context():
+        payload = {"usuario_cpf": "000.000.000-00", "role": "f", "exp": datetime.now(timezone.utc) + timedelta(seconds=1)}
+        token = jwt.encode(payload, app.config['SECRET_KEY'], algorithm='HS256')
+
+        assert validar_token(token) is not None
+        time.sleep(1.1)
+
+        assert validar_token(token) is None
@@ -0,0 +1,36 @@
+"""
+Este módulo contém testes para a instrumentação das consultas SQL do módulo `metricas_helpers`.
+
+Os testes verificam se, sem o log das requisições lentas, cada requisição guarda apenas os seus comandos mais lentos.
+"""
+
+from flask import g
+from sqlalchemy import text
+from app.extensions import db
+from app.utils.metricas_helpers import COMANDOS_LENTOS_POR_ROTA, guardar_mais_lentos
+
+
+def test_guardar_mais_lentos():
+    """Testa se o heap guarda apenas os comandos mais lentos, descartando os mais rápidos."""
+    comandos_lentos = []
+    for duracao in [0.3, 0.1, 0.5, 0.2, 0.4]:
+        guardar_mais_lentos(comandos_lentos, (duracao, f"SELECT {duracao}", None), 3)
+
+    assert sorted(comandos_lentos, reverse=True) == [(0.5, "SELECT 0.5", None), (0.4, "SELECT 0.4", None), (0.3, "SELECT 0.3", None)]
+
+
+def test_requisicao_guarda_apenas_os_comandos_mais_lentos(app):
+    """Testa se, sem `LOG_REQUISICOES_LENTAS_MS`, a requisição conta todos os comandos, mas guarda apenas os mais lentos
+    e sem os parâmetros.
+
+    Args:
+        app (Flask): Aplicação Flask para acessar o contexto da aplicação.
+    """
+    with app.test_request_context("/"):
+        app.preprocess_request()
+        for i in range(3 * COMANDOS_LENTOS_POR_ROTA):
+            db.session.execute(text("SELECT :i"), {"i": i})
+
+        assert g.consultas_sql == 3 * COMANDOS_LENTOS_POR_ROTA, "Todos os comandos devem ser contados."
+        assert len(g.comandos_sql) == COMANDOS_LENTOS_POR_ROTA, "Apenas os comandos mais lentos devem ser guardados."
+        assert all(parametros is None for _, _, parametros in g.comandos_sql)
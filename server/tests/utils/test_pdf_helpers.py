@@ -0,0 +1,57 @@
+"""
+Este módulo contém testes para o renderizador de PDFs do módulo `pdf_helpers` e para o executor do módulo `executor_helpers`.
+
+Os testes verificam a renderização de boletins em um pool de processos e os limites de tarefas pendentes e de tempo do executor.
+"""
+
+import threading
+import time
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from app.utils.boletim_helpers import gerar_pdf_boletim
+from app.utils.executor_helpers import ExecutorLimitado, FilaCheiaError, TempoEsgotadoError
+from app.utils.pdf_helpers import RenderizadorPDF
+
+
+def test_renderizar_boletim_em_pool_de_processos(app):
+    """Testa a renderização de um boletim em um processo do pool."""
+    app.config.update({"PDF_RENDER_TRABALHADORES": 1, "PDF_RENDER_FILA_MAXIMA": 1, "PDF_RENDER_TIMEOUT": 60})
+    renderizador = RenderizadorPDF(app)
+
+    try:
+        aluno = {"nome": "João Pedro dos Santos", "matricula": "202600000001"}
+        turma = {"ano": 9, "serie": "A", "nivel_de_ensino": "Ensino Fundamental", "ano_letivo": 2026}
+        dados = [["Matemática", "7.5", "8.0", "6.5", "9.0", "7.8", "2", "Cursando"]]
+
+        pdf_buffer = renderizador.renderizar(gerar_pdf_boletim, aluno, turma, dados)
+
+        assert pdf_buffer.read(4) == b"%PDF"
+    finally:
+        renderizador.reiniciar()
+
+
+def test_executor_limitado_fila_cheia():
+    """Testa se o executor recusa tarefas quando todas as vagas estão ocupadas."""
+    liberar = threading.Event()
+    executor = ExecutorLimitado(lambda trabalhadores: ThreadPoolExecutor(max_workers=trabalhadores), trabalhadores=1, fila_maxima=1, timeout=5)
+
+    try:
+        executor.submeter(liberar.wait)
+        executor.submeter(liberar.wait)
+
+        with pytest.raises(FilaCheiaError):
+            executor.submeter(liberar.wait)
+    finally:
+        liberar.set()
+        executor.reiniciar()
+
+
+def test_executor_limitado_tempo_esgotado():
+    """Testa se o executor desiste de esperar por tarefas que ultrapassam o tempo limite."""
+    executor = ExecutorLimitado(lambda trabalhadores: ThreadPoolExecutor(max_workers=trabalhadores), trabalhadores=1, fila_maxima=0, timeout=0.05)
+
+    try:
+        with pytest.raises(TempoEsgotadoError):
+            executor.executar(time.sleep, 1)
+    finally:
+        executor.reiniciar()
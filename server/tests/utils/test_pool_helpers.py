@@ -0,0 +1,46 @@
+"""
+Este módulo contém testes para o pool de conexões instrumentado do módulo `pool_helpers`.
+
+Os testes verificam a contagem de checkouts, de tempos de espera e de checkouts que excederam o tempo limite.
+"""
+
+import pytest
+from sqlalchemy import create_engine, exc
+from app.utils.pool_helpers import PoolInstrumentado, montar_opcoes_engine, ler_booleano
+
+
+def test_pool_instrumentado_timeout(app):
+    """Testa as métricas do pool quando todas as conexões estão em uso e um novo pedido excede o tempo limite."""
+    opcoes = montar_opcoes_engine(tamanho=1, overflow=0, timeout=0.1, reciclagem=-1, pre_ping=True, statement_timeout=500)
+    engine = create_engine(app.config["SQLALCHEMY_DATABASE_URI"], **opcoes)
+
+    try:
+        assert isinstance(engine.pool, PoolInstrumentado)
+
+        with engine.connect() as conexao:
+            assert conexao.exec_driver_sql("SHOW statement_timeout").scalar() == "500ms"
+
+            with pytest.raises(exc.TimeoutError):
+                engine.connect()
+
+            estado = engine.pool.estado()
+            assert estado["em_uso"] == 1
+            assert estado["checkouts"] == 1
+            assert estado["timeouts"] == 1
+            assert estado["pico_em_uso"] == 1
+
+        # depois de `dispose`, o pool recriado continua instrumentado e identificando as conexões
+        engine.dispose()
+        with engine.connect() as conexao:
+            assert conexao.exec_driver_sql("SHOW application_name").scalar().startswith("edumanager:")
+        assert engine.pool.estado()["checkouts"] == 1
+    finally:
+        engine.dispose()
+
+
+def test_ler_booleano():
+    """Testa a conversão das variáveis de ambiente booleanas."""
+    assert ler_booleano(None, True) is True
+    assert ler_booleano("", False) is False
+    assert ler_booleano("Sim", False) is True
+    assert ler_booleano("0", True) is False
@@ -0,0 +1,136 @@
+"""
+Este módulo contém testes para o roteamento das leituras para réplicas do módulo `replica_helpers`.
+
+Os testes usam como réplica um segundo engine apontando para o próprio banco de testes e verificam, contando os
+comandos de cada engine, que as requisições GET leem da réplica (sempre a mesma durante a requisição) e que, depois de
+uma escrita, leem do primário.
+"""
+
+import pytest
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app
+from app.config import TestConfig
+from app.extensions import db
+from app.utils.replica_helpers import COOKIE_PRIMARIO
+from tests.user_event import usuario_entra_no_sistema
+
+
+class ReplicaConfig(TestConfig):
+    SQLALCHEMY_BINDS = {"replica_0": TestConfig.SQLALCHEMY_DATABASE_URI}
+    REPLICA_JANELA_CONSISTENCIA = 5
+
+
+class DuasReplicasConfig(ReplicaConfig):
+    SQLALCHEMY_BINDS = {"replica_0": TestConfig.SQLALCHEMY_DATABASE_URI, "replica_1": TestConfig.SQLALCHEMY_DATABASE_URI}
+
+
+def criar_app_com_replicas(config):
+    app = create_app(config)
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        yield app
+        # a sessão mantém aberta a transação da última leitura na réplica, que bloquearia o DROP TABLE
+        db.session.remove()
+        db.drop_all(bind_key=None)
+
+    # o Flask-SQLAlchemy registra um metadata para cada bind, que os demais testes (sem as réplicas) não conhecem
+    for nome in config.SQLALCHEMY_BINDS:
+        db.metadatas.pop(nome, None)
+
+
+@pytest.fixture()
+def app_replica():
+    yield from criar_app_com_replicas(ReplicaConfig)
+
+
+@pytest.fixture()
+def app_duas_replicas():
+    yield from criar_app_com_replicas(DuasReplicasConfig)
+
+
+@contextmanager
+def contar_por_engine(replicas: dict | None = None):
+    """Registra os comandos SQL enviados ao primário e às réplicas (pelo nome do bind) dentro do bloco `with`."""
+    replicas = replicas or {"replica": "replica_0"}
+    engines = {"primario": db.engine, **{nome: db.engines[bind] for nome, bind in replicas.items()}}
+    consultas = {nome: [] for nome in engines}
+    registros = {}
+
+    for nome, engine in engines.items():
+        registros[nome] = lambda conn, cursor, statement, *args, nome=nome: consultas[nome].append(statement)
+        event.listen(engine, "before_cursor_execute", registros[nome])
+    try:
+        yield consultas
+    finally:
+        for nome, engine in engines.items():
+            event.remove(engine, "before_cursor_execute", registros[nome])
+
+
+def test_leitura_na_replica(app_replica):
+    """Testa se as leituras das requisições GET vão para a réplica e as escritas, para o primário."""
+    client = app_replica.test_client()
+    usuario_entra_no_sistema(client, app_replica)
+
+    with contar_por_engine() as consultas:
+        response = client.get("/disciplina/")
+        assert response.status_code == 200
+
+    assert consultas["replica"], "As leituras do GET devem ir para a réplica."
+    assert consultas["primario"] == [], "O GET não deve consultar o primário."
+
+    dados = {"codigo": "MAT001", "nome": "Matemática", "carga_horaria": 30, "ementa": "Álgebra", "bibliografia": ""}
+    with contar_por_engine() as consultas:
+        response = client.post("/disciplina/", json=dados)
+        assert response.status_code == 201
+
+    assert any(consulta.startswith("INSERT") for consulta in consultas["primario"])
+    assert consultas["replica"] == [], "As requisições de escrita não devem usar a réplica."
+
+
+def test_leitura_apos_escrita_no_primario(app_replica):
+    """Testa se, na janela de consistência seguinte a uma escrita, as leituras do mesmo cliente vão para o primário."""
+    client = app_replica.test_client()
+    usuario_entra_no_sistema(client, app_replica)
+
+    dados = {"codigo": "MAT001", "nome": "Matemática", "carga_horaria": 30, "ementa": "Álgebra", "bibliografia": ""}
+    response = client.post("/disciplina/", json=dados)
+    assert response.status_code == 201
+
+    cookie = client.get_cookie(COOKIE_PRIMARIO, domain="localhost")
+    assert cookie is not None, "A escrita deve fixar as leituras do cliente no primário."
+    assert cookie.max_age == 5
+
+    with contar_por_engine() as consultas:
+        response = client.get("/disciplina/")
+        assert response.status_code == 200
+        assert response.json[0]["codigo"] == "MAT001"
+
+    assert consultas["primario"], "Depois da escrita, as leituras devem ir para o primário."
+    assert consultas["replica"] == []
+
+    # os demais clientes continuam lendo da réplica
+    outro_client = app_replica.test_client()
+    usuario_entra_no_sistema(outro_client, app_replica)
+    with contar_por_engine() as consultas:
+        outro_client.get("/disciplina/")
+
+    assert consultas["replica"] and consultas["primario"] == []
+
+
+def test_uma_replica_por_requisicao(app_duas_replicas):
+    """Testa se, com mais de uma réplica, todas as consultas de uma requisição vão para a mesma réplica."""
+    client = app_duas_replicas.test_client()
+    usuario_entra_no_sistema(client, app_duas_replicas)
+
+    for _ in range(10):
+        with contar_por_engine({"replica_0": "replica_0", "replica_1": "replica_1"}) as consultas:
+            # a listagem de usuários busca os usuários, as disciplinas e os cargos em consultas separadas
+            response = client.get("/usuario/")
+            assert response.status_code == 200
+
+        usadas = [nome for nome in ("replica_0", "replica_1") if consultas[nome]]
+        assert len(usadas) == 1, "As consultas de uma requisição não devem ser divididas entre réplicas."
+        assert consultas["primario"] == []
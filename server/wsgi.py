@@ -0,0 +1,4 @@
+from app import create_app
+
+# Ponto de entrada de produção: gunicorn -c gunicorn.conf.py (o módulo "wsgi:app" é carregado pelo gunicorn)
+app = create_app()